@@ -0,0 +1,222 @@
+"""Read-only HTTP API over the computed player intelligence.
+
+    python wlax_api.py --port 8765
+
+Endpoints (all GET):
+  /roster                     one row per player: bio, tier, overall score
+  /players/<name>             full entry: stats, metrics, scores, flags, tier, notes, recs
+  /scores                     sub-scores per player
+  /flags                      development flags per player
+  /percentiles                roster percentile (0-100) of every metric and score
+  /compare?a=<name>&b=<name>  two players' scores side by side with deltas
+
+Tabular endpoints also answer ``?format=arrow`` with an Arrow IPC stream
+(needs pyarrow). Every response carries an ETag derived from the data digest,
+honours If-None-Match with 304, and is gzip-compressed when the client
+accepts it. Rendered bodies are cached per data version, so repeated polling
+costs a dict lookup.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import wlax_engine as engine
+import wlax_shots as shotmap
+import wlax_store as store
+import wlax_xg as xg
+
+SCORE_KEYS = ["overall", "offensive", "defensive", "possession", "efficiency", "discipline"]
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+MAX_CACHED_RESPONSES = 2048
+MODEL_RECHECK_SECONDS = 30   # full digest re-check even when no input file's mtime moved
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def _input_stamp():
+    """mtimes of the files the model is built from (shot events, xG model); a stat each, no reads."""
+    return tuple(os.path.getmtime(f) if f and os.path.exists(f) else 0 for f in (shotmap.SHOTS_PATH, xg.MODEL_PATH))
+
+
+def _fresh(model, stamp):
+    return model is not None and model["stamp"] == stamp and time.monotonic() - model["checked"] < MODEL_RECHECK_SECONDS
+
+
+def load_model():
+    """Shared in-memory model, rebuilt only when the underlying data digest changes.
+
+    Called on every request: while the input files are untouched (and the
+    last full check is recent) it costs two stats; otherwise the data is
+    reloaded and re-hashed, and the model rebuilt if the digest moved.
+    """
+    global _model
+    stamp = _input_stamp()
+    model = _model
+    if _fresh(model, stamp):
+        return model
+    with _model_lock:
+        model = _model
+        if _fresh(model, stamp):
+            return model
+        players, games, game_results, _, _ = engine.load_clean_data()
+        finishing, _ = xg.season_finishing(shotmap.load_shots())
+        digest = store.content_hash(players, games, game_results, finishing)
+        if model is None or model["digest"] != digest:
+            team_avg, table = store.load_or_build(digest, players, games, game_results, finishing=finishing)
+            model = {"digest": digest, "team_avg": team_avg, "table": table, "all_data": table.entries,
+                     "games": games, "game_results": game_results, "responses": {}}
+        _model = {**model, "stamp": stamp, "checked": time.monotonic()}
+    return _model
+
+
+# ═══════════════════════════════════════════════
+# TABLES
+# ═══════════════════════════════════════════════
+
+def _decoded(t, k):
+    """A dictionary-coded string column (pos, yr) as its values."""
+    return np.asarray(t.vocab[k], dtype=object)[t.stats[k]]
+
+
+def roster_table(t):
+    return pd.DataFrame({"name": t.names, "num": t.stats["num"], "pos": _decoded(t, "pos"), "yr": _decoded(t, "yr"),
+                         "gp": t.stats["gp"], "tier_num": t.tier,
+                         "tier_label": [engine.TIER_LABELS[k] for k in t.tier.tolist()],
+                         "overall": t.scores["overall"]})
+
+
+def scores_table(t):
+    return pd.DataFrame({"name": t.names, **{k: t.scores[k] for k in SCORE_KEYS}})
+
+
+def flags_table(t):
+    return pd.DataFrame([{"name": t.names[i], "flag": f, "type": kind}
+                         for i in np.flatnonzero(t.flags) for f, kind in t.flag_list(i)],
+                        columns=["name", "flag", "type"])
+
+
+def percentiles_table(t):
+    metrics = pd.DataFrame(t.metrics, index=t.names).astype(float)
+    scores = pd.DataFrame(t.scores, index=t.names)
+    pct = pd.concat([metrics, scores], axis=1).rank(pct=True) * 100
+    return pct.round(1).rename_axis("name").reset_index()
+
+
+def compare(all_data, a, b):
+    if a not in all_data or b not in all_data:
+        return None
+    sa, sb = all_data[a]["scores"], all_data[b]["scores"]
+    return {"a": a, "b": b, "scores": {k: {"a": sa[k], "b": sb[k], "delta": sa[k] - sb[k]} for k in SCORE_KEYS},
+            "tiers": {"a": all_data[a]["tier_num"], "b": all_data[b]["tier_num"]}}
+
+
+TABLES = {"/roster": roster_table, "/scores": scores_table, "/flags": flags_table, "/percentiles": percentiles_table}
+
+
+# ═══════════════════════════════════════════════
+# RESPONSES
+# ═══════════════════════════════════════════════
+
+def to_arrow(df):
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def render(model, path, query):
+    """Build (status, content_type, body) for a request."""
+    all_data = model["all_data"]
+    fmt = query.get("format", ["json"])[0]
+    if path in TABLES:
+        df = TABLES[path](model["table"])
+        if fmt == "arrow":
+            return 200, ARROW_MIME, to_arrow(df)
+        return 200, "application/json", df.to_json(orient="records").encode()
+    if path.startswith("/players/"):
+        entry = all_data.get(unquote(path[len("/players/"):]))
+        if entry is None:
+            return 404, "application/json", b'{"error": "unknown player"}'
+        return 200, "application/json", json.dumps(entry.to_dict()).encode()
+    if path == "/compare":
+        result = compare(all_data, query.get("a", [""])[0], query.get("b", [""])[0])
+        if result is None:
+            return 404, "application/json", b'{"error": "unknown player"}'
+        return 200, "application/json", json.dumps(result, default=float).encode()
+    return 404, "application/json", b'{"error": "unknown endpoint"}'
+
+
+def cached_response(model, path, query_string):
+    """Render once per (data version, path, query); later polls reuse the bytes, ETag and gzip body."""
+    key = (path, query_string)
+    resp = model["responses"].get(key)
+    if resp is None:
+        status, ctype, body = render(model, path, parse_qs(query_string))
+        etag = '"%s-%s"' % (model["digest"], hashlib.sha1(body).hexdigest()[:12])
+        resp = {"status": status, "ctype": ctype, "body": body, "etag": etag,
+                "gzip": gzip.compress(body, compresslevel=6)}
+        if len(model["responses"]) >= MAX_CACHED_RESPONSES:
+            model["responses"].clear()
+        model["responses"][key] = resp
+    return resp
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    server_version = "WLAXIntel/1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            resp = cached_response(load_model(), url.path.rstrip("/") or "/", url.query)
+        except ImportError:
+            self.send_error(406, "Arrow output needs pyarrow")
+            return
+        if resp["status"] == 200 and resp["etag"] in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", resp["etag"])
+            self.end_headers()
+            return
+        body = resp["body"]
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        self.send_response(resp["status"])
+        self.send_header("Content-Type", resp["ctype"])
+        self.send_header("ETag", resp["etag"])
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            body = resp["gzip"]
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve computed player intelligence as JSON/Arrow.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    load_model()
+    server = ThreadingHTTPServer((args.host, args.port), APIHandler)
+    print(f"Serving on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Bootstrap confidence intervals and tier probabilities for every player's scores.
+
+    python wlax_bootstrap.py [--resamples 10000] [--workers 4]
+
+Point scores look surer than they are on small samples (a 1-GP player
+shooting 2/2 gets full efficiency credit). Each resample rebuilds a
+player's season and re-scores it:
+
+  - games are drawn with replacement from the player's game log, so the
+    logged counts (g, a, pts, sh, to) and consistency move with the games
+    drawn; like the timeline, a logged stat is the season total × the
+    resampled share of its log;
+  - shots on goal and goals are then drawn shot by shot from the resampled
+    shots (beta-binomial, with the team's rates as a prior worth
+    PRIOR_SHOTS shots), so a perfect 2/2 isn't perfect in every resample;
+  - counts with no per-game log that feed the scores (gb, dc, ct, cards)
+    are drawn Poisson around the season total;
+  - goalie save stats, xG finishing and the team normalizers stay fixed.
+
+As in compute_timeline, every (player, resample) pair is one row of a
+virtual float-valued PlayerTable, so the engine's own vectorized metric and
+score passes score a whole batch of resamples in one call. Batches are
+seeded from one SeedSequence, so a process pool gives the same numbers as a
+single process.
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import wlax_engine as engine
+import wlax_perf as perf
+
+N_RESAMPLES = 10_000
+BATCH = 2_500        # resamples per batch; bounds memory at ~players × BATCH rows
+LEVEL = 0.80         # central interval, matching the projections' 80% ranges
+PRIOR_SHOTS = 4.0
+POISSON_STATS = ["gb", "dc", "ct", "yc", "gc"]
+
+
+def _beta_binomial(rng, trials, hits, n, rate, shape):
+    """Hits out of `trials` with the per-player rate drawn from its beta posterior under the team rate."""
+    a = hits + PRIOR_SHOTS * rate
+    b = np.maximum(n - hits, 0) + PRIOR_SHOTS * (1 - rate)
+    p = rng.beta(np.maximum(a, 1e-3)[:, None], np.maximum(b, 1e-3)[:, None], size=shape)
+    return rng.binomial(trials, p)
+
+
+def _batch(job):
+    """(P, B) scores and tiers for one batch of resamples."""
+    t, team_avg, profile, seed, B = job
+    rng = np.random.default_rng(seed)
+    P, F, G = t.logs.shape
+    n = t.n_games.astype(np.int64)
+    c = t.col
+
+    # Games drawn with replacement; slots past a player's games stay zero padding
+    draw = (rng.random((P, 1, B, G)) * np.maximum(n, 1)[:, None, None, None]).astype(np.int64)
+    logs = np.take_along_axis(t.logs[:, :, None, :], draw, axis=3)              # (P, F, B, G)
+    logs *= (np.arange(G) < n[:, None])[:, None, None, :]
+    drawn, actual = logs.sum(axis=3), t.logs.sum(axis=2)                         # (P, F, B), (P, F)
+    share = np.where(actual[:, :, None] > 0, drawn / np.where(actual > 0, actual, 1)[:, :, None], 1.0)
+
+    vt = engine.PlayerTable()
+    vt.names, vt.vocab = t.names, t.vocab
+    vt.stats = np.repeat(t.stats, B)
+    for k, log in engine.LOGGED_TOTALS.items():
+        vt.stats[k] = (c(k)[:, None] * share[:, engine.LOG_FIELDS.index(log)]).ravel()
+    for k in POISSON_STATS:
+        vt.stats[k] = rng.poisson(c(k)[:, None], size=(P, B)).ravel()
+
+    sh = np.rint(vt.stats["sh"].reshape(P, B)).astype(np.int64)
+    sog_rate = c("sog").sum() / max(c("sh").sum(), 1)
+    conv_rate = c("g").sum() / max(c("sog").sum(), 1)
+    sog = _beta_binomial(rng, sh, c("sog"), c("sh"), sog_rate, (P, B))
+    g = _beta_binomial(rng, sog, c("g"), c("sog"), conv_rate, (P, B))
+    a = vt.stats["a"].reshape(P, B)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vt.stats["sh_pct"] = np.where(sh > 0, g / sh * 100, 0.0).ravel()
+        vt.stats["sog_pct"] = np.where(sh > 0, sog / sh * 100, 0.0).ravel()
+    vt.stats["sh"], vt.stats["sog"], vt.stats["g"] = sh.ravel(), sog.ravel(), g.ravel()
+    vt.stats["pts"] = (g + a).ravel()
+
+    vt.logs = np.moveaxis(logs, 2, 1).reshape(P * B, F, G)
+    vt.n_games = np.repeat(n, B)
+    vt.finishing = np.repeat(t.finishing, B)
+    m = engine.compute_metrics_table(vt, dtype=engine.METRICS_FLOAT_DTYPE)
+    s = engine.compute_scores_table(vt, m, team_avg, profile=profile)
+    return s.reshape(P, B), engine.compute_tiers_table(s, profile).reshape(P, B)
+
+
+@perf.timed("bootstrap")
+def bootstrap(t, team_avg, n_resamples=N_RESAMPLES, level=LEVEL, profile=None, seed=0, workers=1, batch=BATCH):
+    """Intervals and tier probabilities for every player.
+
+    Returns {"lo", "hi": SCORES_DTYPE arrays (the central `level` interval of
+    every score), "tier_prob": (players × 4) P(tier 1..4), "n", "level"}.
+    """
+    slim = t.as_float()
+    # The flag evaluator is a closure (not picklable) and scoring doesn't need it
+    scoring = {k: v for k, v in (profile or engine.DEFAULT_COMPILED).items() if k != "flag_rules"}
+    sizes = [min(batch, n_resamples - i) for i in range(0, n_resamples, batch)]
+    jobs = [(slim, team_avg, scoring, s, b) for s, b in zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes)]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_batch, jobs))
+    else:
+        parts = [_batch(job) for job in jobs]
+    scores = np.concatenate([p[0] for p in parts], axis=1)
+    tiers = np.concatenate([p[1] for p in parts], axis=1)
+    lo, hi = np.zeros(len(t), engine.SCORES_DTYPE), np.zeros(len(t), engine.SCORES_DTYPE)
+    for k in engine.SCORES_DTYPE.names:
+        lo[k], hi[k] = np.percentile(scores[k], [(1 - level) / 2 * 100, (1 + level) / 2 * 100], axis=1)
+    tier_prob = np.stack([np.count_nonzero(tiers == k, axis=1) for k in (1, 2, 3, 4)], axis=1) / tiers.shape[1]
+    return {"lo": lo, "hi": hi, "tier_prob": tier_prob, "n": n_resamples, "level": level}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap score intervals and tier probabilities for the roster.")
+    parser.add_argument("--resamples", type=int, default=N_RESAMPLES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    players = engine.load_clean_data()[0]
+    team_avg, t = engine.build_analysis(players)
+    t0 = time.perf_counter()
+    ci = bootstrap(t, team_avg, args.resamples, seed=args.seed, workers=args.workers)
+    print(f"{args.resamples} resamples × {len(t)} players in {time.perf_counter() - t0:.2f}s")
+    for i in np.argsort(-t.scores["overall"]):
+        probs = " ".join(f"T{k + 1} {p:4.0%}" for k, p in enumerate(ci["tier_prob"][i]))
+        print(f"{t.names[i]:22s} {t.scores['overall'][i]:5.1f}  [{ci['lo']['overall'][i]:5.1f}, "
+              f"{ci['hi']['overall'][i]:5.1f}]  {probs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Change feed between two versions of the analysis: tier moves, flags gained or cleared, score swings.
+
+    python wlax_changes.py list                              # logged versions, oldest first
+    python wlax_changes.py diff [OLD [NEW]] [--csv feed.csv]  # default: the two latest of a profile
+
+Versions are the snapshots in the store's version log (see wlax_store). A
+diff reads only the names, scores, tier and flag-bitmask columns of the two
+snapshots (memory-mapped), aligns players by name with one hash join and
+compares whole columns at once: tier moves from one inequality, flag changes
+from two bitwise ops on the bitmasks (new & ~old, old & ~new) and score
+deltas from one subtraction. Python only touches the rows that changed, so
+the cost is a few milliseconds even for league-wide snapshots and the feed
+can be rebuilt on every ingest.
+
+The feed is ranked tier moves first, then flag changes (new red flags and
+lost green ones ahead of good news), then the biggest overall score swings,
+with the size of the player's overall swing breaking ties.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import wlax_engine as engine
+import wlax_perf as perf
+import wlax_store as store
+
+MIN_SCORE_DELTA = 5.0   # overall points; smaller swings stay out of the feed
+FEED_COLUMNS = ["player", "change", "detail", "old", "new", "overall_delta"]
+# Feed order by kind of change (lower first)
+RANK = {"Tier ↓": 0, "Tier ↑": 1, "Flag +": 2, "Flag −": 2, "Score": 3, "New": 4, "Gone": 4}
+
+
+# ═══════════════════════════════════════════════
+# VERSION COLUMNS
+# ═══════════════════════════════════════════════
+
+def table_columns(table):
+    """The columns a diff reads, from a PlayerTable."""
+    return {"names": list(table.names), "scores": table.scores, "tier": table.tier, "flags": table.flags}
+
+
+def snapshot_columns(digest, root=store.SNAPSHOT_DIR):
+    """The columns a diff reads, straight from a snapshot's mapped arrays; None if it's gone."""
+    snap = store.open_snapshot(digest, root)
+    if snap is None:
+        return None
+    a = snap["arrays"]
+    return {"names": store._decode_str(a["names"]["data"], a["names"]["offsets"]), "scores": a["scores"][""],
+            "tier": a["tier"][""], "flags": a["flags"][""]}
+
+
+# ═══════════════════════════════════════════════
+# DIFF
+# ═══════════════════════════════════════════════
+
+def _rows(names, change, detail, old, new, delta):
+    return pd.DataFrame({"player": names, "change": change, "detail": detail, "old": old, "new": new,
+                         "overall_delta": delta})
+
+
+@perf.timed("changes_diff")
+def diff(old, new, min_delta=MIN_SCORE_DELTA):
+    """Ranked change feed (DataFrame of FEED_COLUMNS) from version `old` to `new` (see table_columns).
+
+    "old"/"new" hold the tier, the flag (0/1) or the overall score, by kind of change.
+    """
+    names = np.asarray(new["names"], dtype=object)
+    if old["names"] == new["names"]:   # same roster in the same order: no join needed
+        pos = np.arange(len(names))
+    else:
+        pos = pd.Index(old["names"]).get_indexer(new["names"])
+    both = pos >= 0
+    j = pos[both]
+    who = names[both]
+    o_over, n_over = np.asarray(old["scores"]["overall"])[j], np.asarray(new["scores"]["overall"])[both]
+    delta = n_over - o_over
+    parts = []
+
+    o_tier, n_tier = np.asarray(old["tier"])[j].astype(np.int64), np.asarray(new["tier"])[both].astype(np.int64)
+    moved = np.flatnonzero(o_tier != n_tier)
+    if len(moved):
+        labels = np.array([""] + [f"Tier {t} · {engine.TIER_LABELS[t]}" for t in (1, 2, 3, 4)], dtype=object)
+        parts.append(_rows(who[moved], np.where(n_tier[moved] > o_tier[moved], "Tier ↓", "Tier ↑"),
+                           labels[o_tier[moved]] + " → " + labels[n_tier[moved]],
+                           o_tier[moved], n_tier[moved], delta[moved]))
+
+    o_flags, n_flags = np.asarray(old["flags"])[j], np.asarray(new["flags"])[both]
+    gained, cleared = n_flags & ~o_flags, o_flags & ~n_flags
+    for bit, (fname, kind) in enumerate(engine.FLAG_DEFS):
+        for change, mask, bad in (("Flag +", gained, kind == "negative"), ("Flag −", cleared, kind == "positive")):
+            hit = np.flatnonzero((mask >> bit) & 1)
+            if len(hit):
+                rows = _rows(who[hit], change, fname, int(change == "Flag −"), int(change == "Flag +"), delta[hit])
+                rows["bad"] = bad
+                parts.append(rows)
+
+    swing = np.flatnonzero(np.abs(delta) >= min_delta)
+    if len(swing):
+        parts.append(_rows(who[swing], "Score", "Overall", o_over[swing].round(1), n_over[swing].round(1),
+                           delta[swing]))
+
+    added = np.flatnonzero(~both)
+    if len(added):
+        parts.append(_rows(names[added], "New", "Not in the older version", np.nan,
+                           np.asarray(new["scores"]["overall"])[added].round(1), np.nan))
+    kept = np.zeros(len(old["names"]), dtype=bool)
+    kept[j] = True
+    gone = np.flatnonzero(~kept)
+    if len(gone):
+        parts.append(_rows(np.asarray(old["names"], dtype=object)[gone], "Gone", "Not in the newer version",
+                           np.asarray(old["scores"]["overall"])[gone].round(1), np.nan, np.nan))
+
+    if not parts:
+        return pd.DataFrame(columns=FEED_COLUMNS)
+    feed = pd.concat(parts, ignore_index=True)
+    bad = feed["bad"].fillna(False) if "bad" in feed else False
+    feed["_rank"] = feed["change"].map(RANK) * 2 + np.where(bad, 0, 1)
+    feed["_size"] = -feed["overall_delta"].abs().fillna(0)
+    feed = feed.sort_values(["_rank", "_size", "player"], kind="stable")
+    return feed[FEED_COLUMNS].reset_index(drop=True)
+
+
+def summary(feed):
+    """Counts per kind of change, for headline metrics."""
+    counts = feed["change"].value_counts()
+    return {"tier_moves": int(counts.get("Tier ↑", 0) + counts.get("Tier ↓", 0)),
+            "flags_gained": int(counts.get("Flag +", 0)), "flags_cleared": int(counts.get("Flag −", 0)),
+            "score_swings": int(counts.get("Score", 0))}
+
+
+def latest_pair(profile=None, root=store.SNAPSHOT_DIR):
+    """(previous, latest) version records for a profile, or None with fewer than two versions."""
+    versions = store.list_versions(root, profile)
+    return (versions[-2], versions[-1]) if len(versions) >= 2 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List analysis versions or diff two of them into a change feed.")
+    parser.add_argument("command", choices=["list", "diff"])
+    parser.add_argument("old", nargs="?", help="older version digest (default: second latest)")
+    parser.add_argument("new", nargs="?", help="newer version digest (default: latest)")
+    parser.add_argument("--profile", default="default")
+    parser.add_argument("--min-delta", type=float, default=MIN_SCORE_DELTA)
+    parser.add_argument("--csv", help="write the feed to this CSV file")
+    parser.add_argument("--root", default=store.SNAPSHOT_DIR)
+    args = parser.parse_args()
+    if args.command == "list":
+        for v in store.list_versions(args.root):
+            print(f"{v['digest']}  {v['created']}  {v['profile']:16s} {v['games']} games  {v['last_game'] or ''}")
+        return
+    if args.old is None:
+        pair = latest_pair(args.profile, args.root)
+        if pair is None:
+            parser.error(f"need two logged versions of profile {args.profile!r}; see `list`")
+        args.old, args.new = pair[0]["digest"], pair[1]["digest"]
+    elif args.new is None:
+        versions = store.list_versions(args.root, args.profile)
+        if not versions:
+            parser.error(f"no logged versions of profile {args.profile!r}")
+        args.new = versions[-1]["digest"]
+    cols = [snapshot_columns(d, args.root) for d in (args.old, args.new)]
+    for d, c in zip((args.old, args.new), cols):
+        if c is None:
+            parser.error(f"no snapshot {d} under {args.root}")
+    feed = diff(*cols, min_delta=args.min_delta)
+    print(f"{args.old} → {args.new}: {summary(feed)}")
+    print(feed.round(1).to_string(index=False))
+    if args.csv:
+        feed.to_csv(args.csv, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,881 @@
+"""Data layer and metrics engine shared by the Streamlit app and offline tools.
+
+Nothing here imports Streamlit, so other processes (API server, snapshot
+pre-warm, batch jobs) can import it without starting an app session.
+"""
+import argparse
+import hashlib
+import json
+from collections.abc import Mapping
+
+import numpy as np
+import wlax_perf as perf
+import wlax_validate
+
+# ═══════════════════════════════════════════════
+# DATA LAYER
+# ═══════════════════════════════════════════════
+
+# Player headshot URLs from virginiasports.com (manually mapped)
+HEADSHOT_URLS = {
+    "Madison Alaimo": "https://virginiasports.com/imgproxy/pYMb3-v9_Iw05OEJEvS-VLV-PkXLxFnbK2dnVLNGX2o/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvYm9JU25aRzgycFVLbFVqTjc3c3daUkRwV0JOWkdpVDQ2UG0zSUVCQy5qcGc.jpg",
+    "Jenna Dinardo": "https://virginiasports.com/imgproxy/M-EqJX8pcAsMqHLqjB7zcRq0P-nR7bKVTQ8i_D86R_4/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvaUpmMjVsZWtZazlNZzRRYWxoTWlCZmhSNldUZjBxZnBTdW1kbENRYi5qcGc.jpg",
+    "Addi Foster": "https://virginiasports.com/imgproxy/a-B08gK1VEOXrp9J_Bq82N_9xdFa-xpzxKphIiuuPcg/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvRGdrQ1czdnJKTnRJcGRvZjJuOWRjSHBZMGJnbjRTeWZ3amFWRlFOOS5qcGc.jpg",
+    "Kate Galica": "https://virginiasports.com/imgproxy/Z4W8fnWOqaA8_rvVBt7EqYIeGP5hJuEhM3yBq62nGYU/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvdmFpYXp5MlVkMXBRMThGVFJxemZ3V2hyb3ZkUjl4MEIzbTN5UHdaYi5qcGc.jpg",
+    "Cady Flaherty": "https://virginiasports.com/imgproxy/K-T-B3xpQl-aDjFqBq_Y80c5ZE8x4l5H8MbR7AqGnOE/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvN2xzcFN0THhFbnMwZFBPNk1mTUt2V1M5VUt3S01VVlZPdkVzNWltdi5qcGc.jpg",
+    "Gabby Laverghetta": "https://virginiasports.com/imgproxy/F_sxh_p1KSKW5FxzFKp3vQ0A-0k4Y5uyhd-yVCTBm2Y/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvWFdGa3VmcGdIbk9OT3FZaUlnVDQ5Uld3UXBZdWFSWENDcTdIT0RMMS5qcGc.jpg",
+    "Livy Laverghetta": "https://virginiasports.com/imgproxy/b9RWFgqGBkgGFIjgOK2CzY-VKfyX8o_0dNxA-KbFVIE/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvbGRYSUxQeTRLN2dGN2dXbFlhcUtIaXExbzFLcDlGWFNMamdaMTVOeS5qcGc.jpg",
+    "Elyse Finnelle": "https://virginiasports.com/imgproxy/0R3SdJ2qx08ccevzYjFN9e1z3SJEdN1jJ8kAMuBbZrQ/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcveDVla1RCZnluRnJIUWRjQzdGbWNLZGdFVXhGa25jWkh4amVJcG5Ybi5qcGc.jpg",
+    "Kate Demark": "https://virginiasports.com/imgproxy/hqJLp2fJTW5ZPt0Zp8_GV7yOlAIOcBrwCOOJKBt5YZU/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvN3dWb0xoWXV3a0htamdHYjFJb2tVcXdEYnV0c0NZcHRkNWZJWWdYdi5qcGc.jpg",
+    "Alexandra Schneider": "https://virginiasports.com/imgproxy/s9CLFpBGzTNyXL3r9hC6sSeLTsHXYSiNNGxkdDR7EoE/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvMk5uMGVGOXpSS3F2aHlSU0hHU1hGNmVPcjEweTYyNWxQQVZIVDhWWi5qcGc.jpg",
+    "Sophia Conti": "https://virginiasports.com/imgproxy/5z2L5PGXqj8_YJRy8H8-tXxjj3pIH3CjRXzE97dG-eA/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvQmRzQU1yNkZjME1MSjd5OVFqOXVmRHdLdndlcUh5WjBvaTdYSWVRSi5qcGc.jpg",
+    "Lara Kology": "https://virginiasports.com/imgproxy/gk2T0i4LG_ik2E-fL7oaS8nlJPhBl9aPWS-NHB2XpNM/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZkdZYlhiZFdHT1d2bXRuUXFndUxyWW5ERWh3R3lqR2lLYjgzbm1JMC5qcGc.jpg",
+    "Alex Reilly": "https://virginiasports.com/imgproxy/v5qLaFiVpJJ6AQBdz1V2PEiNWxJnS1vVPKN3Nde4wDk/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvUXRYTDUyOFJyODlUWm5wek1hOHRscXZXd2pjQnExNWdjY0VmQXZVbS5qcGc.jpg",
+    "Payton Sfreddo": "https://virginiasports.com/imgproxy/TXIbMgQ6cnYINW5h0zcOSjHGNcNbptNMhT4HwIFi7FI/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvQjI3eG1zcXZVd3BmVENpNjRkMjZ2NXJ3SjNIR0xCOFdVT09tTkFnUy5qcGc.jpg",
+    "Mel Josephson": "https://virginiasports.com/imgproxy/0l2LW0rXiVmhIAi7dFFqPjC_8iNmCIoNXHPj80L64io/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZXRKSk55RXF5Nnl3YUV2Y3FUVDRHR1RVclNYazlXdGJGTGd3ekVQYy5qcGc.jpg",
+    "Raleigh Foster": "https://virginiasports.com/imgproxy/Ke-zN1_Bc0bQF5BRmfL_y8JtajBT9e0Z3Y7WjMIyg6o/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvQjB4aWI5MlRFTXpPeFBzaW1Gc0VZc2drUEt5c0MyQ2JUZzVwM0Jqdy5qcGc.jpg",
+    "Carly Kennedy": "https://virginiasports.com/imgproxy/jP9nvB-_HjIFZ23hA5A_eMpRn7gU5XBmNXhxW1AKK5A/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvSE5SSHBxZWF4Mk5jQXQ0ZXRWVEFYTHhiUnJ2VTlMbUZPU3BYUDdiOC5qcGc.jpg",
+    "Megan Rocklein": "https://virginiasports.com/imgproxy/k7wIW43g42bHERYl-kL_FVPJ3-JqPxfjz4fwdZJBfbo/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvSk5yRDlpNldlSTBHbGpPUVFaYUVtNTBFWFhyVzFoRnBZcno0VmU1Yi5qcGc.jpg",
+    "Fiona Allen": "https://virginiasports.com/imgproxy/Z_e6g3SVzfXz9VffJLWQWJP0KdKdGH7BKxj1xEm3eiU/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvTEV5d0daUEE5RTczTlQ3TGdJUjh0S2RMeTFjRlJiTjB4dHlwQ0p3Sy5qcGc.jpg",
+    "Abby Musser": "https://virginiasports.com/imgproxy/2ZI8pSVJOr2J7oWmHI1Q-OWVeVj-6JFIm0fQRx8l5kM/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvU21NckJ6SEF3clZMZjdDNHlFMHQ0VjhxRmxVSmtLNWN4bVdwclRIVi5qcGc.jpg",
+    "Jayden Piraino": "https://virginiasports.com/imgproxy/5i_Fqg7Lxf8Wge2MfLXp5LYdKJgSqS6K8l3iqGS77RY/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZk5pZDFYYnhGR1UxTmkxSWdtSlI3aUQxZjM1MnBKSjN2VTlVUUoyYy5qcGc.jpg",
+    "Corey White": "https://virginiasports.com/imgproxy/P7CbNjrQg_YxRiGiPMeMLxIJMC9FW4OPqyuKw-3cpyw/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZTFTQUVHRE5mWWRLYkNOc21QQk12VlRONXI3Ymo5bkI2MHdGOEptOS5qcGc.jpg",
+}
+
+def load_data():
+    """Build all player data from the uploaded Virginia season stats."""
+    players = {
+        "Madison Alaimo": {"num": 16, "pos": "A", "yr": "Jr", "gp": 5, "gs": 5,
+            "g": 10, "a": 15, "pts": 25, "sh": 18, "sh_pct": 55.6, "sog": 16, "sog_pct": 88.9,
+            "gb": 4, "dc": 0, "to": 11, "ct": 1, "fpg": 3, "fps": 4, "yc": 0, "gc": 2,
+            "game_g": [0,5,3,4,2], "game_a": [4,1,2,3,3], "game_pts": [4,6,5,7,5],
+            "game_sh": [3,5,5,4,3], "game_to": [4,2,0,1,4]},
+        "Jenna Dinardo": {"num": 4, "pos": "A", "yr": "Jr", "gp": 5, "gs": 5,
+            "g": 9, "a": 2, "pts": 11, "sh": 29, "sh_pct": 31.0, "sog": 26, "sog_pct": 89.7,
+            "gb": 3, "dc": 8, "to": 10, "ct": 2, "fpg": 3, "fps": 9, "yc": 1, "gc": 3,
+            "game_g": [1,3,3,1,1], "game_a": [0,1,1,0,0], "game_pts": [1,4,4,1,1],
+            "game_sh": [4,10,8,6,5], "game_to": [3,2,2,1,4]},
+        "Addi Foster": {"num": 15, "pos": "A", "yr": "Jr", "gp": 5, "gs": 5,
+            "g": 10, "a": 2, "pts": 12, "sh": 24, "sh_pct": 41.7, "sog": 20, "sog_pct": 83.3,
+            "gb": 2, "dc": 0, "to": 3, "ct": 0, "fpg": 2, "fps": 2, "yc": 1, "gc": 1,
+            "game_g": [0,4,2,3,1], "game_a": [0,1,0,0,1], "game_pts": [0,5,2,3,2],
+            "game_sh": [1,5,3,6,6], "game_to": [1,1,0,1,0]},
+        "Kate Galica": {"num": 5, "pos": "M", "yr": "Jr", "gp": 5, "gs": 5,
+            "g": 6, "a": 5, "pts": 11, "sh": 24, "sh_pct": 25.0, "sog": 17, "sog_pct": 70.8,
+            "gb": 13, "dc": 35, "to": 13, "ct": 10, "fpg": 1, "fps": 4, "yc": 0, "gc": 3,
+            "game_g": [2,1,0,1,3], "game_a": [0,1,0,2,2], "game_pts": [2,2,0,3,5],
+            "game_sh": [3,5,5,6,7], "game_to": [1,4,4,4,2]},
+        "Cady Flaherty": {"num": 6, "pos": "M", "yr": "Fr", "gp": 5, "gs": 2,
+            "g": 4, "a": 1, "pts": 5, "sh": 7, "sh_pct": 57.1, "sog": 6, "sog_pct": 85.7,
+            "gb": 3, "dc": 1, "to": 1, "ct": 2, "fpg": 3, "fps": 3, "yc": 0, "gc": 3,
+            "game_g": [2,0,1,1,0], "game_a": [0,1,1,0,0], "game_pts": [2,1,2,1,0],
+            "game_sh": [2,1,2,2,1], "game_to": [0,0,0,1,0]},
+        "Gabby Laverghetta": {"num": 43, "pos": "A", "yr": "So", "gp": 5, "gs": 3,
+            "g": 5, "a": 2, "pts": 7, "sh": 8, "sh_pct": 62.5, "sog": 6, "sog_pct": 75.0,
+            "gb": 3, "dc": 0, "to": 3, "ct": 0, "fpg": 0, "fps": 0, "yc": 1, "gc": 3,
+            "game_g": [2,1,0,1,0], "game_a": [1,1,0,0,0], "game_pts": [3,2,0,1,0],
+            "game_sh": [3,1,0,2,0], "game_to": [0,0,0,2,0]},
+        "Livy Laverghetta": {"num": 42, "pos": "M", "yr": "So", "gp": 5, "gs": 0,
+            "g": 3, "a": 1, "pts": 4, "sh": 4, "sh_pct": 75.0, "sog": 4, "sog_pct": 100.0,
+            "gb": 2, "dc": 1, "to": 2, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
+            "game_g": [1,1,1,1,0], "game_a": [0,1,0,1,0], "game_pts": [1,2,1,2,0],
+            "game_sh": [1,1,1,1,0], "game_to": [0,0,0,0,0]},
+        "Raleigh Foster": {"num": 10, "pos": "A", "yr": "Fr", "gp": 2, "gs": 0,
+            "g": 3, "a": 0, "pts": 3, "sh": 7, "sh_pct": 42.9, "sog": 6, "sog_pct": 85.7,
+            "gb": 0, "dc": 0, "to": 0, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
+            "game_g": [1,2], "game_a": [0,0], "game_pts": [1,2],
+            "game_sh": [4,3], "game_to": [0,0]},
+        "Alex Reilly": {"num": 23, "pos": "M", "yr": "So", "gp": 5, "gs": 5,
+            "g": 1, "a": 0, "pts": 1, "sh": 5, "sh_pct": 20.0, "sog": 3, "sog_pct": 60.0,
+            "gb": 2, "dc": 6, "to": 3, "ct": 2, "fpg": 0, "fps": 0, "yc": 2, "gc": 1,
+            "game_g": [1,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [1,0,0,0,0],
+            "game_sh": [3,0,0,0,0], "game_to": [0,0,0,0,1]},
+        "Payton Sfreddo": {"num": 7, "pos": "M", "yr": "So", "gp": 5, "gs": 0,
+            "g": 1, "a": 0, "pts": 1, "sh": 1, "sh_pct": 100.0, "sog": 1, "sog_pct": 100.0,
+            "gb": 3, "dc": 1, "to": 1, "ct": 1, "fpg": 0, "fps": 0, "yc": 0, "gc": 1,
+            "game_g": [1,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [1,0,0,0,0],
+            "game_sh": [1,0,0,0,0], "game_to": [0,0,0,0,0]},
+        "Kate Demark": {"num": 3, "pos": "D", "yr": "Jr", "gp": 5, "gs": 5,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 3, "dc": 0, "to": 0, "ct": 10, "fpg": 0, "fps": 0, "yc": 0, "gc": 2,
+            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
+            "game_sh": [0,0,0,0,0], "game_to": [0,0,0,0,0]},
+        "Alexandra Schneider": {"num": 8, "pos": "D", "yr": "Jr", "gp": 5, "gs": 5,
+            "g": 0, "a": 0, "pts": 0, "sh": 1, "sh_pct": 0, "sog": 1, "sog_pct": 100.0,
+            "gb": 2, "dc": 0, "to": 0, "ct": 6, "fpg": 0, "fps": 0, "yc": 1, "gc": 0,
+            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
+            "game_sh": [0,0,1,0,0], "game_to": [0,0,0,0,0]},
+        "Sophia Conti": {"num": 9, "pos": "M", "yr": "So", "gp": 5, "gs": 5,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 9, "dc": 0, "to": 2, "ct": 4, "fpg": 0, "fps": 0, "yc": 0, "gc": 1,
+            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
+            "game_sh": [0,0,0,0,0], "game_to": [1,0,1,0,1]},
+        "Lara Kology": {"num": 36, "pos": "D", "yr": "Sr", "gp": 5, "gs": 5,
+            "g": 0, "a": 0, "pts": 0, "sh": 1, "sh_pct": 0, "sog": 1, "sog_pct": 100.0,
+            "gb": 7, "dc": 1, "to": 1, "ct": 1, "fpg": 0, "fps": 0, "yc": 1, "gc": 2,
+            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
+            "game_sh": [0,1,0,1,0], "game_to": [1,0,0,0,0]},
+        "Elyse Finnelle": {"num": 34, "pos": "GK", "yr": "Sr", "gp": 5, "gs": 3,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 10, "dc": 0, "to": 0, "ct": 1, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
+            "gk_min": 230.82, "gk_ga": 39, "gk_gaa": 10.14, "gk_sv": 23, "gk_sv_pct": 37.1,
+            "gk_w": 2, "gk_l": 1,
+            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
+            "game_sh": [0,0,0,0,0], "game_to": [0,0,0,0,0]},
+        "Mel Josephson": {"num": 26, "pos": "GK", "yr": "Sr", "gp": 3, "gs": 2,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 3, "dc": 0, "to": 0, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
+            "gk_min": 68.47, "gk_ga": 17, "gk_gaa": 14.90, "gk_sv": 10, "gk_sv_pct": 37.0,
+            "gk_w": 0, "gk_l": 2,
+            "game_g": [0,0,0], "game_a": [0,0,0], "game_pts": [0,0,0],
+            "game_sh": [0,0,0], "game_to": [0,0,0]},
+        "Carly Kennedy": {"num": 13, "pos": "M", "yr": "So", "gp": 3, "gs": 2,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 4, "dc": 0, "to": 0, "ct": 3, "fpg": 0, "fps": 0, "yc": 0, "gc": 1,
+            "game_g": [0,0,0], "game_a": [0,0,0], "game_pts": [0,0,0],
+            "game_sh": [0,0,0], "game_to": [0,0,0]},
+        "Megan Rocklein": {"num": 11, "pos": "M", "yr": "Fr", "gp": 3, "gs": 0,
+            "g": 0, "a": 2, "pts": 2, "sh": 1, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 1, "dc": 0, "to": 3, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
+            "game_g": [0,0,0], "game_a": [0,2,0], "game_pts": [0,2,0],
+            "game_sh": [0,0,1], "game_to": [1,0,2]},
+        "Fiona Allen": {"num": 41, "pos": "A", "yr": "So", "gp": 4, "gs": 0,
+            "g": 1, "a": 1, "pts": 2, "sh": 2, "sh_pct": 50.0, "sog": 1, "sog_pct": 50.0,
+            "gb": 0, "dc": 0, "to": 1, "ct": 0, "fpg": 1, "fps": 1, "yc": 0, "gc": 0,
+            "game_g": [0,0,1,0], "game_a": [1,0,0,0], "game_pts": [1,0,1,0],
+            "game_sh": [0,0,1,0], "game_to": [0,0,0,0]},
+        "Abby Musser": {"num": 14, "pos": "D", "yr": "So", "gp": 4, "gs": 3,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 2, "dc": 0, "to": 1, "ct": 1, "fpg": 0, "fps": 0, "yc": 1, "gc": 0,
+            "game_g": [0,0,0,0], "game_a": [0,0,0,0], "game_pts": [0,0,0,0],
+            "game_sh": [0,0,0,0], "game_to": [0,0,0,1]},
+        "Jayden Piraino": {"num": 2, "pos": "A", "yr": "So", "gp": 1, "gs": 0,
+            "g": 2, "a": 0, "pts": 2, "sh": 2, "sh_pct": 100.0, "sog": 2, "sog_pct": 100.0,
+            "gb": 0, "dc": 0, "to": 0, "ct": 0, "fpg": 1, "fps": 1, "yc": 0, "gc": 0,
+            "game_g": [2], "game_a": [0], "game_pts": [2],
+            "game_sh": [2], "game_to": [0]},
+        "Corey White": {"num": 25, "pos": "M", "yr": "Jr", "gp": 4, "gs": 0,
+            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
+            "gb": 0, "dc": 1, "to": 0, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
+            "game_g": [0,0,0,0], "game_a": [0,0,0,0], "game_pts": [0,0,0,0],
+            "game_sh": [0,0,0,0], "game_to": [0,0,0,0]},
+    }
+    games = ["vs Navy (L 12-10)", "vs Richmond (L 12-11)", "at Maryland (L 17-9)", "at Liberty (W 17-8)", "at Notre Dame (W 9-7)"]
+    game_results = ["L", "L", "L", "W", "W"]
+    return players, games, game_results
+
+
+@perf.timed()
+def load_clean_data(strict=False):
+    """load_data() with quarantined rows dropped, plus the validation report."""
+    players, games, game_results = load_data()
+    players, violations, quarantined = wlax_validate.clean_players(players, strict=strict)
+    return players, games, game_results, violations, quarantined
+
+
+# ═══════════════════════════════════════════════
+# COACHING TEXT
+# ═══════════════════════════════════════════════
+
+@perf.timed()
+def generate_coaching_notes(name, p, metrics, scores, tier_num, flags, profile=None):
+    """Narrative note; shooting thresholds come from the profile's "texts" section."""
+    texts = (profile or DEFAULT_COMPILED)["texts"]
+    pos_full = {"A": "Attacker", "M": "Midfielder", "D": "Defender", "GK": "Goalkeeper"}[p["pos"]]
+    tier_names = {1: "Program Driver", 2: "System Amplifier", 3: "Situational Specialist", 4: "Developmental Player"}
+    note = f"{name} is a {p['yr']} {pos_full} classified as a **Tier {tier_num} — {tier_names[tier_num]}**. "
+    if p["pos"] == "A":
+        if p["g"] >= 8: note += f"She is a primary scoring threat with {p['g']}G and {p['a']}A in {p['gp']} games. "
+        if p["sh_pct"] < texts["attack_sh_pct"] and p["sh"] > 15: note += f"However, her {p['sh_pct']:.0f}% shooting on {p['sh']} shots suggests shot selection needs refinement. "
+        if p["to"] >= 8: note += f"Her {p['to']} turnovers are a concern and represent a key development area. "
+        if p["a"] >= 10: note += f"Her {p['a']} assists make her the offense's primary distributor. "
+    elif p["pos"] == "M":
+        if p["dc"] >= 20: note += f"She dominates the draw circle with {p['dc']} draw controls. "
+        if p["pts"] >= 5: note += f"Contributes offensively with {p['pts']} points. "
+        if p["ct"] >= 5: note += f"Adds defensive value with {p['ct']} caused turnovers. "
+    elif p["pos"] == "D":
+        if p["ct"] >= 5: note += f"An elite defender with {p['ct']} caused turnovers. "
+        if p["gb"] >= 5: note += f"Active on ground balls ({p['gb']}). "
+    elif p["pos"] == "GK" and "gk_sv_pct" in p:
+        note += f"Posted a {p['gk_sv_pct']:.1f}% save rate with {p['gk_gaa']:.2f} GAA. "
+    flag_names = [f[0] for f in flags]
+    pos_flags = [f for f in flag_names if any(x in f for x in ["Elite", "Specialist", "Engine", "Clutch", "Reliable", "Solid", "Low GAA"])]
+    if pos_flags: note += f"Key strengths: {', '.join(pos_flags)}. "
+    return note
+
+
+@perf.timed()
+def generate_recommendations(name, p, metrics, scores, tier_num, flags, profile=None):
+    """Generate actionable coaching recommendations.
+
+    Rate thresholds are the profile's flag thresholds (the attacker shooting
+    and GAA-review cutoffs, which have no flag, are in its "texts" section).
+    """
+    profile = profile or DEFAULT_COMPILED
+    th, texts = profile["flags"], profile["texts"]
+    recs = []
+    pos = p["pos"]
+    gp = max(p["gp"], 1)
+
+    if pos == "A":
+        if p["sh_pct"] < texts["attack_sh_pct"] and p["sh"] >= 10:
+            recs.append(f"🎯 **Shot Selection:** {name}'s {p['sh_pct']:.0f}% shooting on {p['sh']} shots is below the productive threshold. Focus drills on shooting from higher-percentage zones and reducing contested attempts. Consider a 'two-touch-before-shoot' constraint in practice.")
+        if p["to"] / gp >= th["High Turnover Risk"]["to_per_game"]:
+            recs.append(f"🔄 **Ball Security:** Averaging {p['to']/gp:.1f} TO/game — work on off-hand stick skills and decision-making under pressure. Use small-sided games with turnover penalties to build awareness.")
+        if p["a"] / gp >= th["Elite Playmaker"]["a_per_game"] and p["g"] / gp >= 1.5:
+            recs.append(f"⭐ **Maximize Usage:** {name} is a dual-threat creator ({metrics['gpg']:.1f} G/gm, {metrics['apg']:.1f} A/gm). She should be the primary option in critical possessions and settled offense. Consider running the offense through her in close games.")
+        if p["g"] >= 5 and p["a"] < 3:
+            recs.append(f"👀 **Expand Playmaking:** Strong finisher with {p['g']}G but only {p['a']}A — encourage her to look for the extra pass when doubled. This will open up her own shots long-term.")
+        if metrics["consistency"] < 0.5 and p["pts"] >= 5:
+            recs.append(f"📊 **Reduce Variance:** Point production is inconsistent (game pts: {p['game_pts']}). Use her in structured sets where she's guaranteed touches rather than relying on transition opportunities.")
+        if tier_num >= 3 and p["gp"] >= 3:
+            recs.append(f"🕐 **Situational Deployment:** Deploy {name} primarily in man-up / free-position situations and as a late-game spark plug off the bench rather than full-game starter.")
+
+    elif pos == "M":
+        if p["dc"] / gp >= th["Draw Control Engine"]["dc_per_game"]:
+            recs.append(f"🏆 **Protect the Draw:** {name} at {p['dc']/gp:.0f} DC/game is an elite asset. Ensure she takes every draw and build secondary draw options to spell her in blowouts. Track draw-to-goal conversion rate.")
+        if p["ct"] / gp >= th["Defensive Disruptor"]["ct_per_game"] and p["pts"] >= 5:
+            recs.append(f"🔥 **Two-Way Star:** Rare combo of {p['ct']} CTs and {p['pts']} PTS — maximize her minutes in competitive games. She impacts both ends.")
+        if p["to"] / gp >= th["High Turnover Risk"]["to_per_game"]:
+            recs.append(f"🔄 **Transition Discipline:** High turnovers ({p['to']}) for a midfielder. Focus on controlled clears and limiting risky passes in the midfield. Use film sessions to identify turnover patterns.")
+        if p["sh_pct"] < th["Shot Selection Concern"]["sh_pct"] and p["sh"] >= 5:
+            recs.append(f"🎯 **Shot Quality:** Only {p['sh_pct']:.0f}% shooting — reduce long-range attempts and focus on feeding attackers or driving to higher-percentage areas before releasing.")
+        if tier_num >= 3:
+            recs.append(f"🕐 **Role Clarity:** Use {name} as a defensive midfielder or draw-circle specialist rather than expecting offensive production. Clear role definition will boost confidence.")
+
+    elif pos == "D":
+        if p["ct"] / gp >= th["Defensive Disruptor"]["ct_per_game"]:
+            recs.append(f"🛡️ **Defensive Anchor:** {name}'s {p['ct']/gp:.1f} CTs/game make her a cornerstone — assign her to the opponent's top attacker in every game.")
+        if p["gb"] / gp >= th["Ground Ball Magnet"]["gb_per_game"]:
+            recs.append(f"💪 **Ground Ball Intensity:** Strong ground ball rate ({p['gb']/gp:.1f}/gm) — use her on the draw circle for first-ground-ball recovery.")
+        if scores["discipline"] <= th["Discipline Concern"]["discipline"]:
+            recs.append(f"⚠️ **Penalty Management:** Card accumulation is a risk — work on body positioning and footwork to avoid reaching fouls. A 1-game suspension would hurt the defense.")
+        if tier_num >= 3 and p["ct"] < 3:
+            recs.append(f"📈 **Development Focus:** Needs to increase disruptive plays (only {p['ct']} CTs). Use video breakdown to improve anticipation and check timing. Consider more minutes in lower-leverage situations to build experience.")
+
+    elif pos == "GK":
+        if p.get("gk_sv_pct", 0) < th["Solid Save Rate"]["gk_sv_pct"]:
+            recs.append(f"🧤 **Save Rate Development:** {p.get('gk_sv_pct', 0):.1f}% is below D1 average (~45%). Focus on positioning drills, especially on free-position shots. Track save % by shot location to find weaknesses.")
+        if p.get("gk_gaa", 0) >= texts["gk_gaa_review"]:
+            recs.append(f"📉 **Defensive System Review:** {p.get('gk_gaa', 0):.2f} GAA is elevated — this isn't solely a goalkeeper issue. Review defensive slide packages and communication protocols to reduce high-quality shots against.")
+        if p.get("gk_w", 0) >= 2:
+            recs.append(f"✅ **Start in Big Games:** {name}'s experience in wins makes her the clear choice for high-leverage matchups. Build confidence with clear communication from the coaching staff.")
+
+    # Universal recommendations
+    if len(recs) == 0:
+        if tier_num == 4:
+            recs.append(f"🌱 **Development Plan:** {name} needs increased practice reps to earn more game minutes. Focus on her best positional skill and track improvement weekly.")
+        elif tier_num == 3:
+            recs.append(f"📋 **Defined Role:** {name} can contribute in specific situations. Identify her top 1-2 skills and deploy her accordingly — don't ask her to do everything.")
+
+    return recs
+
+
+# ═══════════════════════════════════════════════
+# COMPACT RECORDS
+# ═══════════════════════════════════════════════
+# One PlayerTable holds the whole roster as NumPy structured arrays (stats,
+# metrics, scores), padded game logs, a tier column and a flag bitmask over
+# the interned FLAG_DEFS. all_data entries are small __slots__ views onto a
+# table row, so the views keep their data["player"]["g"] access while nothing
+# is stored per player as a Python dict.
+
+INT_STATS = ["num", "gp", "gs", "g", "a", "pts", "sh", "sog", "gb", "dc", "to", "ct",
+             "fpg", "fps", "yc", "gc"]
+FLOAT_STATS = ["sh_pct", "sog_pct"]
+STR_STATS = ["pos", "yr"]
+GK_STATS = {"gk_min": float, "gk_ga": int, "gk_gaa": float, "gk_sv": int, "gk_sv_pct": float,
+            "gk_w": int, "gk_l": int}
+LOG_FIELDS = ["game_g", "game_a", "game_pts", "game_sh", "game_to"]
+PLAYER_KEYS = (["num", "pos", "yr", "gp", "gs", "g", "a", "pts", "sh", "sh_pct", "sog", "sog_pct",
+                "gb", "dc", "to", "ct", "fpg", "fps", "yc", "gc"] + list(GK_STATS) + LOG_FIELDS)
+
+STATS_DTYPE = np.dtype([(k, "i2") for k in INT_STATS] + [(k, "f8") for k in FLOAT_STATS]
+                       + [(k, "u1") for k in STR_STATS] + [(k, "f8") for k in GK_STATS])
+METRICS_DTYPE = np.dtype([("ppg", "f8"), ("gpg", "f8"), ("apg", "f8"), ("pts_per_shot", "f8"),
+                          ("shot_quality", "f8"), ("poss_involvement", "i4"), ("to_rate", "f8"),
+                          ("poss_impact", "i4"), ("fp_eff", "f8"), ("discipline_raw", "i4"),
+                          ("gbpg", "f8"), ("dcpg", "f8"), ("ctpg", "f8"), ("topg", "f8"),
+                          ("consistency", "f8"), ("clutch_ratio", "f8")])
+# All-float variants for derived tables whose counts are fractional (cutoffs, schedule adjustment)
+FLOAT_STATS_DTYPE = np.dtype([(k, "f8") for k in INT_STATS + FLOAT_STATS]
+                             + [(k, "u1") for k in STR_STATS] + [(k, "f8") for k in GK_STATS])
+METRICS_FLOAT_DTYPE = np.dtype([(k, "f8") for k in METRICS_DTYPE.names])
+SCORE_KEYS = ["offensive", "defensive", "possession", "efficiency", "discipline"]
+SCORES_DTYPE = np.dtype([(k, "f8") for k in SCORE_KEYS + ["overall"]])
+
+POS_WEIGHTS = {"A": [0.40, 0.05, 0.15, 0.30, 0.10], "M": [0.25, 0.20, 0.25, 0.20, 0.10],
+               "D": [0.05, 0.45, 0.20, 0.10, 0.20], "GK": [0.00, 0.35, 0.15, 0.35, 0.15]}
+DEFAULT_WEIGHTS = [0.25, 0.25, 0.20, 0.20, 0.10]
+TIER_LABELS = {1: "Program Driver", 2: "System Amplifier", 3: "Situational Specialist", 4: "Developmental"}
+
+# Interned flags, in the order compile_flag_rules lists them; bit i of PlayerTable.flags is FLAG_DEFS[i]
+FLAG_DEFS = (("High Turnover Risk", "negative"), ("Elite Finisher", "positive"),
+             ("Shot Selection Concern", "warning"), ("FP Specialist", "positive"),
+             ("Defensive Disruptor", "positive"), ("Draw Control Engine", "positive"),
+             ("Ground Ball Magnet", "positive"), ("Reliable Contributor", "info"),
+             ("High Variance", "warning"), ("Clutch Performer", "positive"),
+             ("Discipline Concern", "warning"), ("Solid Save Rate", "positive"),
+             ("Low GAA", "positive"), ("High GAA Concern", "negative"),
+             ("Elite Playmaker", "positive"), ("Limited Impact", "negative"))
+FLAG_ID = {name: i for i, (name, _) in enumerate(FLAG_DEFS)}
+
+# The built-in scoring profile: every tunable literal of the vectorized scoring,
+# flag and tier passes and of the coaching texts. Profiles (see wlax_profiles) override parts of it and
+# are compiled once by compile_profile.
+DEFAULT_PROFILE = {
+    "position_weights": {**POS_WEIGHTS, "default": DEFAULT_WEIGHTS},
+    "caps": {"sh_pct": 75, "sog_pct": 100, "discipline_raw": 10, "to_rate": 1, "consistency": 1,
+             "gk_sv_pct": 60, "gk_gaa": 20},
+    "flags": {"High Turnover Risk": {"to_per_game": 2.0}, "Elite Finisher": {"sh_pct": 50, "shots": 5},
+              "Shot Selection Concern": {"sh_pct": 30, "shots": 10}, "FP Specialist": {"fp_eff": 70, "fps": 3},
+              "Defensive Disruptor": {"ct_per_game": 1.5}, "Draw Control Engine": {"dc_per_game": 3},
+              "Ground Ball Magnet": {"gb_per_game": 1.5}, "Reliable Contributor": {"consistency": 0.7, "pts": 3},
+              "High Variance": {"consistency": 0.4, "pts": 3}, "Clutch Performer": {"clutch_ratio": 1.5, "goals": 3},
+              "Discipline Concern": {"discipline": 60}, "Solid Save Rate": {"gk_sv_pct": 40},
+              "Low GAA": {"gk_gaa": 10}, "High GAA Concern": {"gk_gaa": 14},
+              "Elite Playmaker": {"a_per_game": 2}, "Limited Impact": {"gb": 2}},
+    # A goalkeeper's overall replaces the position weights: save %, GAA, ground balls/game, discipline
+    "gk_weights": {"gk_sv_pct": 0.40, "gk_gaa": 0.30, "gb": 0.15, "discipline": 0.15},
+    # Coaching-text thresholds with no matching flag
+    "texts": {"attack_sh_pct": 35, "gk_gaa_review": 12},
+    "tiers": [65, 45, 25],
+}
+# Every additive term of the scoring formulas as (sub-score, input, label), in the
+# column order of PlayerTable.contrib. "overall" rows only feed the GK overall.
+CONTRIB_TERMS = [("offensive", "gpg", "Goals/game"), ("offensive", "sh_pct", "Shooting %"),
+                 ("offensive", "ppg", "Points/game"), ("offensive", "apg", "Assists/game"),
+                 ("defensive", "ctpg", "Caused TOs/game"), ("defensive", "gbpg", "Ground balls/game"),
+                 ("defensive", "cards", "Card avoidance"), ("defensive", "gk_gaa", "GAA"),
+                 ("possession", "poss_impact", "Possession impact"), ("possession", "dcpg", "Draw controls/game"),
+                 ("possession", "gbpg", "Ground balls/game"),
+                 ("efficiency", "finishing", "Finishing"), ("efficiency", "sog_pct", "On-target %"),
+                 ("efficiency", "to_rate", "Ball security"), ("efficiency", "consistency", "Consistency"),
+                 ("efficiency", "gk_sv_pct", "Save %"),
+                 ("discipline", "base", "Clean record"), ("discipline", "cards", "Cards"),
+                 ("overall", "gk_gbpg", "Ground balls/game")]
+CONTRIB_PLANES = ("subscore", "overall")   # contrib[:, 0] sums to each sub-score, contrib[:, 1] to overall
+
+
+class PlayerTable:
+    """Columnar roster: one row per player across every array."""
+    __slots__ = ("names", "index", "vocab", "stats", "logs", "n_games", "finishing", "metrics", "scores",
+                 "contrib", "tier", "flags", "notes", "recs", "entries")
+
+    def __len__(self):
+        return len(self.stats)
+
+    def col(self, field):
+        """A stats column as float64, with int counts promoted (NaN for absent goalie fields)."""
+        return self.stats[field].astype(np.float64)
+
+    def log(self, field):
+        """Padded (players × games) array for one game log; padding is zero."""
+        return self.logs[:, LOG_FIELDS.index(field), :]
+
+    def game_mask(self):
+        return np.arange(self.logs.shape[2]) < self.n_games[:, None]
+
+    def flag_list(self, i):
+        bits = int(self.flags[i])
+        return [FLAG_DEFS[b] for b in range(len(FLAG_DEFS)) if bits >> b & 1]
+
+    def has_flag(self, name):
+        return (self.flags >> FLAG_ID[name]) & 1 == 1
+
+    def as_float(self):
+        """Copy with float stats and logs, for derived tables that hold fractional counts."""
+        f = PlayerTable()
+        f.names, f.index, f.vocab = self.names, self.index, self.vocab
+        f.stats = self.stats.astype(FLOAT_STATS_DTYPE)
+        f.logs = self.logs.astype(np.float64)
+        f.n_games = self.n_games
+        f.finishing = self.finishing
+        return f
+
+    def build_entries(self):
+        self.entries = {name: PlayerEntry(self, i) for i, name in enumerate(self.names)}
+        return self.entries
+
+
+class RecordView(Mapping):
+    """Read-only mapping over one row of a structured array."""
+    __slots__ = ("_row",)
+
+    def __init__(self, arr, i):
+        self._row = arr[i]
+
+    def __getitem__(self, key):
+        try:
+            return self._row[key].item()
+        except (KeyError, ValueError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self._row.dtype.names)
+
+    def __len__(self):
+        return len(self._row.dtype.names)
+
+
+class PlayerStats(Mapping):
+    """Mapping view of one player's box score, shaped like the load_data dicts (absent gk_* keys raise KeyError)."""
+    __slots__ = ("_t", "_i")
+
+    def __init__(self, table, i):
+        self._t, self._i = table, i
+
+    def __getitem__(self, key):
+        t, i = self._t, self._i
+        if key in LOG_FIELDS:
+            return t.logs[i, LOG_FIELDS.index(key), :t.n_games[i]].tolist()
+        if key in STR_STATS:
+            return t.vocab[key][t.stats[key][i]]
+        if key in GK_STATS:
+            v = t.stats[key][i]
+            if np.isnan(v):
+                raise KeyError(key)
+            return GK_STATS[key](v)
+        try:
+            return t.stats[key][i].item()
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return (k for k in PLAYER_KEYS if k not in GK_STATS or not np.isnan(self._t.stats[k][self._i]))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class PlayerEntry(Mapping):
+    """One all_data entry: player/metrics/scores views plus flags, tier and texts from the table."""
+    __slots__ = ("table", "i")
+    KEYS = ("player", "metrics", "scores", "flags", "tier_num", "tier_label", "notes", "recs")
+
+    def __init__(self, table, i):
+        self.table, self.i = table, i
+
+    def __getitem__(self, key):
+        t, i = self.table, self.i
+        if key == "player": return PlayerStats(t, i)
+        if key == "metrics": return RecordView(t.metrics, i)
+        if key == "scores": return RecordView(t.scores, i)
+        if key == "flags": return t.flag_list(i)
+        if key == "tier_num": return int(t.tier[i])
+        if key == "tier_label": return TIER_LABELS[int(t.tier[i])]
+        if key == "notes": return t.notes[i]
+        if key == "recs": return t.recs[i]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def to_dict(self):
+        """Plain-dict copy (e.g. for JSON)."""
+        d = {k: self[k] for k in self.KEYS}
+        for k in ("player", "metrics", "scores"):
+            d[k] = dict(d[k])
+        return d
+
+
+@perf.timed()
+def build_table(players):
+    """Pack a roster dict into a PlayerTable (stats and logs only; run analyze_table for the rest)."""
+    t = PlayerTable()
+    rows = list(players.values())
+    n = len(rows)
+    t.names = list(players)
+    t.index = {name: i for i, name in enumerate(t.names)}
+    t.vocab = {k: sorted({p[k] for p in rows}) for k in STR_STATS}
+    t.stats = np.zeros(n, dtype=STATS_DTYPE)
+    for k in INT_STATS + FLOAT_STATS:
+        t.stats[k] = [p[k] for p in rows]
+    for k in STR_STATS:
+        code = {v: c for c, v in enumerate(t.vocab[k])}
+        t.stats[k] = [code[p[k]] for p in rows]
+    for k in GK_STATS:
+        t.stats[k] = [p.get(k, np.nan) for p in rows]
+    t.n_games = np.array([len(p["game_g"]) for p in rows], dtype=np.int16)
+    width = max((len(p[f]) for p in rows for f in LOG_FIELDS), default=0)
+    t.logs = np.zeros((n, len(LOG_FIELDS), width), dtype=np.int16)
+    for i, p in enumerate(rows):
+        for j, f in enumerate(LOG_FIELDS):
+            t.logs[i, j, :len(p[f])] = p[f]
+    t.finishing = np.full(n, np.nan)
+    return t
+
+
+def is_pos(t, pos):
+    return t.stats["pos"] == (t.vocab["pos"].index(pos) if pos in t.vocab["pos"] else -1)
+
+
+# ═══════════════════════════════════════════════
+# VECTORIZED ENGINE
+# ═══════════════════════════════════════════════
+# Metrics, scores, flags and tiers for every row at once, one column at a time.
+
+def vnorm(val, max_val, invert=False):
+    """val / max_val capped at 1.5×, scaled to 0-100; 50 where max_val is 0."""
+    max_val = np.asarray(max_val, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.minimum(val / max_val, 1.5) / 1.5 * 100
+    if invert:
+        r = 100 - r
+    return np.where(max_val == 0, 50.0, r)
+
+
+@perf.timed()
+def compute_team_avg(t):
+    """Per-game maxima over active players (2+ GP), used as score normalizers."""
+    active = t.stats["gp"] >= 2
+    gp = t.col("gp")[active]
+    col = lambda k: t.col(k)[active]
+    return {"max_gpg": float(np.max(col("g") / gp)), "max_ppg": float(np.max(col("pts") / gp)),
+            "max_apg": float(np.max(col("a") / gp)), "max_ctpg": float(np.max(col("ct") / gp)),
+            "max_gbpg": float(np.max(col("gb") / gp)), "max_dcpg": float(np.max(col("dc") / gp)),
+            "max_poss_impact": int(np.max(col("gb") + col("dc") + col("ct") - col("to")))}
+
+
+@perf.timed()
+def compute_metrics_table(t, dtype=METRICS_DTYPE):
+    """Per-game rates and derived metrics for every row (pass an all-float dtype for prorated stats)."""
+    c = t.col
+    gp = np.maximum(c("gp"), 1)
+    m = np.zeros(len(t), dtype=dtype)
+    m["ppg"] = c("pts") / gp
+    m["gpg"] = c("g") / gp
+    m["apg"] = c("a") / gp
+    m["pts_per_shot"] = c("pts") / np.maximum(c("sh"), 1)
+    m["shot_quality"] = (c("sog_pct") * c("sh_pct")) / 100
+    poss_inv = c("sh") + c("to") + c("dc") + c("gb")
+    m["poss_involvement"] = poss_inv
+    m["to_rate"] = c("to") / np.maximum(poss_inv, 1)
+    m["poss_impact"] = c("gb") + c("dc") + c("ct") - c("to")
+    m["fp_eff"] = c("fpg") / np.maximum(c("fps"), 1) * 100
+    m["discipline_raw"] = c("yc") * 3 + c("gc") * 1
+    m["gbpg"] = c("gb") / gp
+    m["dcpg"] = c("dc") / gp
+    m["ctpg"] = c("ct") / gp
+    m["topg"] = c("to") / gp
+    m["consistency"] = consistency_from_logs(t.log("game_pts"), t.n_games)
+    m["clutch_ratio"] = clutch_from_logs(t.log("game_g"), t.n_games)
+    return m
+
+
+def consistency_from_logs(game_pts, n_games):
+    """1 − CV of points per game (0.5 with no scoring, 1.0 for a single scoring game); padding must be zero."""
+    n = np.maximum(n_games, 1).astype(np.float64)
+    mask = np.arange(game_pts.shape[-1]) < np.asarray(n_games)[..., None]
+    mean = game_pts.sum(axis=-1) / n
+    std = np.sqrt((((game_pts - mean[..., None]) ** 2) * mask).sum(axis=-1) / n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = np.minimum(std / mean, 1)
+    return np.where(mean > 0, np.where(n_games > 1, 1 - cv, 1.0), 0.5)
+
+
+def clutch_from_logs(game_g, n_games):
+    """Avg goals in the last two games (wins) over the first three (losses); 1.0 unless exactly 5 games."""
+    g = game_g.astype(np.float64)
+    losses = g[..., :3].sum(axis=-1)
+    loss_avg = np.where(losses > 0, losses / 3, 0.001)
+    win_avg = g[..., 3:5].sum(axis=-1) / 2
+    return np.where(n_games == 5, win_avg / np.maximum(loss_avg, 0.001), 1.0)
+
+
+@perf.timed()
+def compute_scores_table(t, m, team_avg, explain=False, profile=None):
+    """Sub-scores and overall for every row, GK override included (t.finishing NaN = no xG, use sh_pct).
+
+    `profile` is a compile_profile result (default: the built-in literals).
+    With explain=True also returns the (players × 2 × CONTRIB_TERMS) contribution
+    matrix: each term's points in its sub-score (plane 0) and in overall (plane 1).
+    """
+    profile = profile or DEFAULT_COMPILED
+    cap = profile["caps"]
+    c = t.col
+    gp = np.maximum(c("gp"), 1)
+    finishing = np.where(np.isnan(t.finishing), c("sh_pct"), t.finishing)
+    terms = {
+        ("offensive", "gpg"): vnorm(m["gpg"], team_avg["max_gpg"]) * 0.35,
+        ("offensive", "sh_pct"): vnorm(c("sh_pct"), cap["sh_pct"]) * 0.25,
+        ("offensive", "ppg"): vnorm(m["ppg"], team_avg["max_ppg"]) * 0.25,
+        ("offensive", "apg"): vnorm(c("a") / gp, team_avg["max_apg"]) * 0.15,
+        ("defensive", "ctpg"): vnorm(c("ct") / gp, team_avg["max_ctpg"]) * 0.45,
+        ("defensive", "gbpg"): vnorm(c("gb") / gp, team_avg["max_gbpg"]) * 0.35,
+        ("defensive", "cards"): vnorm(m["discipline_raw"], cap["discipline_raw"], invert=True) * 0.20,
+        ("possession", "poss_impact"): vnorm(m["poss_impact"], team_avg["max_poss_impact"]) * 0.40,
+        ("possession", "dcpg"): vnorm(c("dc") / gp, team_avg["max_dcpg"]) * 0.35,
+        ("possession", "gbpg"): vnorm(c("gb") / gp, team_avg["max_gbpg"]) * 0.25,
+        ("efficiency", "finishing"): vnorm(finishing, cap["sh_pct"]) * 0.30,
+        ("efficiency", "sog_pct"): vnorm(c("sog_pct"), cap["sog_pct"]) * 0.25,
+        ("efficiency", "to_rate"): vnorm(m["to_rate"], cap["to_rate"], invert=True) * 0.25,
+        ("efficiency", "consistency"): vnorm(m["consistency"], cap["consistency"]) * 0.20,
+    }
+    sub = np.zeros((len(t), len(CONTRIB_TERMS)))
+    col = {term[:2]: j for j, term in enumerate(CONTRIB_TERMS)}
+    s = np.zeros(len(t), dtype=SCORES_DTYPE)
+    for k in SCORE_KEYS[:4]:
+        raw = sum(v for (sk, _), v in terms.items() if sk == k)
+        s[k] = np.minimum(100, raw)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(raw > 100, 100 / raw, 1.0)   # a capped sub-score shares the cap pro rata
+        for (sk, name), v in terms.items():
+            if sk == k:
+                sub[:, col[sk, name]] = v * scale
+    s["discipline"] = np.maximum(0, 100 - m["discipline_raw"] * 12)
+    sub[:, col["discipline", "base"]] = 100
+    sub[:, col["discipline", "cards"]] = s["discipline"] - 100
+
+    w = position_weights(t, profile)
+    overall = 0
+    for j, k in enumerate(SCORE_KEYS):
+        overall = overall + s[k] * w[:, j]
+    s["overall"] = overall
+    sub_weight = w[:, [SCORE_KEYS.index(k) if k in SCORE_KEYS else 0 for k, _, _ in CONTRIB_TERMS]]
+    sub_weight[:, col["overall", "gk_gbpg"]] = 0
+    total = sub * sub_weight
+
+    gk = is_pos(t, "GK") & ~np.isnan(c("gk_sv_pct"))
+    if gk.any():
+        gw = profile["gk_weights"]
+        sv = vnorm(c("gk_sv_pct"), cap["gk_sv_pct"])
+        gaa = vnorm(cap["gk_gaa"] - c("gk_gaa"), cap["gk_gaa"])
+        gb_score = vnorm(c("gb") / gp, team_avg["max_gbpg"]) * gw["gb"]
+        overall = sv * gw["gk_sv_pct"] + gaa * gw["gk_gaa"] + gb_score + s["discipline"] * gw["discipline"]
+        s["overall"] = np.where(gk, overall, s["overall"])
+        s["efficiency"] = np.where(gk, sv, s["efficiency"])
+        s["defensive"] = np.where(gk, gaa, s["defensive"])
+        if explain:
+            overridden = [j for j, (sk, _, _) in enumerate(CONTRIB_TERMS) if sk in ("efficiency", "defensive")]
+            sub[np.ix_(gk, overridden)] = 0
+            sub[gk, col["efficiency", "gk_sv_pct"]] = sv[gk]
+            sub[gk, col["defensive", "gk_gaa"]] = gaa[gk]
+            sub[gk, col["overall", "gk_gbpg"]] = gb_score[gk]
+            gk_weight = {"efficiency": gw["gk_sv_pct"], "defensive": gw["gk_gaa"],
+                         "discipline": gw["discipline"], "overall": 1.0}
+            total[gk] = sub[gk] * np.array([gk_weight.get(k, 0.0) for k, _, _ in CONTRIB_TERMS])
+    if explain:
+        return s, np.stack([sub, total], axis=1)
+    return s
+
+
+def position_weights(t, profile=None):
+    """(players × 5) sub-score weights in SCORE_KEYS order, by listed position."""
+    pw = (profile or DEFAULT_COMPILED)["position_weights"]
+    lookup = np.array([pw.get(pos, pw["default"]) for pos in t.vocab["pos"]]).reshape(-1, len(SCORE_KEYS))
+    return lookup[t.stats["pos"]]
+
+
+def compile_flag_rules(th):
+    """Bind flag thresholds ({flag: {param: value}}) into one evaluator (t, m, s) → {flag: bool array}."""
+    def rules(t, m, s):
+        c = t.col
+        gp = np.maximum(c("gp"), 1)
+        is_gk = is_pos(t, "GK")
+        return {
+            "High Turnover Risk": (c("to") / gp >= th["High Turnover Risk"]["to_per_game"]) & (c("pts") > 0),
+            "Elite Finisher": (c("sh_pct") >= th["Elite Finisher"]["sh_pct"]) & (c("sh") >= th["Elite Finisher"]["shots"]),
+            "Shot Selection Concern": ((c("sh_pct") < th["Shot Selection Concern"]["sh_pct"])
+                                       & (c("sh") >= th["Shot Selection Concern"]["shots"])),
+            "FP Specialist": (m["fp_eff"] >= th["FP Specialist"]["fp_eff"]) & (c("fps") >= th["FP Specialist"]["fps"]),
+            "Defensive Disruptor": c("ct") / gp >= th["Defensive Disruptor"]["ct_per_game"],
+            "Draw Control Engine": c("dc") / gp >= th["Draw Control Engine"]["dc_per_game"],
+            "Ground Ball Magnet": c("gb") / gp >= th["Ground Ball Magnet"]["gb_per_game"],
+            "Reliable Contributor": ((m["consistency"] >= th["Reliable Contributor"]["consistency"])
+                                     & (c("pts") > th["Reliable Contributor"]["pts"])),
+            "High Variance": (m["consistency"] < th["High Variance"]["consistency"]) & (c("pts") > th["High Variance"]["pts"]),
+            "Clutch Performer": ((m["clutch_ratio"] >= th["Clutch Performer"]["clutch_ratio"])
+                                 & (c("g") >= th["Clutch Performer"]["goals"])),
+            "Discipline Concern": s["discipline"] <= th["Discipline Concern"]["discipline"],
+            "Solid Save Rate": is_gk & (c("gk_sv_pct") >= th["Solid Save Rate"]["gk_sv_pct"]),
+            "Low GAA": is_gk & (c("gk_gaa") <= th["Low GAA"]["gk_gaa"]),
+            "High GAA Concern": is_gk & (c("gk_gaa") >= th["High GAA Concern"]["gk_gaa"]),
+            "Elite Playmaker": c("a") / gp >= th["Elite Playmaker"]["a_per_game"],
+            "Limited Impact": (c("pts") == 0) & (c("ct") == 0) & (c("gb") <= th["Limited Impact"]["gb"]) & (c("dc") == 0),
+        }
+    return rules
+
+
+@perf.timed()
+def compute_flags_table(t, m, s, profile=None):
+    """Development flags for every row, as a bitmask over FLAG_DEFS."""
+    bits = np.zeros(len(t), dtype=np.uint32)
+    for name, hit in (profile or DEFAULT_COMPILED)["flag_rules"](t, m, s).items():
+        bits |= hit.astype(np.uint32) << np.uint32(FLAG_ID[name])
+    return bits
+
+
+def compute_tiers_table(s, profile=None):
+    """Tiers from cutoffs on the overall column (tiers 1-3 from the profile's descending cutoffs)."""
+    o = s["overall"]
+    cuts = (profile or DEFAULT_COMPILED)["tiers"]
+    return np.select([o >= cut for cut in cuts], [1, 2, 3], 4).astype(np.int8)
+
+
+def compile_profile(profile, name="default"):
+    """Validated, merged profile dict → the form the vectorized passes consume (weights as arrays, bound rules)."""
+    return {"name": name, "digest": profile_digest(profile),
+            "position_weights": {pos: np.asarray(w, dtype=np.float64) for pos, w in profile["position_weights"].items()},
+            "caps": dict(profile["caps"]), "tiers": list(profile["tiers"]),
+            "gk_weights": dict(profile["gk_weights"]), "texts": dict(profile["texts"]),
+            "flags": {flag: dict(params) for flag, params in profile["flags"].items()},
+            "flag_rules": compile_flag_rules(profile["flags"])}
+
+
+def profile_digest(profile):
+    """Stable short hash of a profile's contents; caches of profile-dependent results key on it."""
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode()).hexdigest()[:12]
+
+
+DEFAULT_COMPILED = compile_profile(DEFAULT_PROFILE)
+
+
+@perf.timed()
+def analyze_table(t, team_avg, profile=None):
+    """Fill metrics, scores, flags, tiers and texts on a PlayerTable built by build_table."""
+    t.metrics = compute_metrics_table(t)
+    t.scores, t.contrib = compute_scores_table(t, t.metrics, team_avg, explain=True, profile=profile)
+    t.flags = compute_flags_table(t, t.metrics, t.scores, profile)
+    t.tier = compute_tiers_table(t.scores, profile)
+    t.notes, t.recs = [], []
+    with perf.stage("texts"):
+        for i, name in enumerate(t.names):
+            p, m, s = PlayerStats(t, i), RecordView(t.metrics, i), RecordView(t.scores, i)
+            tier_num, flags = int(t.tier[i]), t.flag_list(i)
+            t.notes.append(generate_coaching_notes(name, p, m, s, tier_num, flags, profile))
+            t.recs.append(generate_recommendations(name, p, m, s, tier_num, flags, profile))
+    t.build_entries()
+    return t
+
+
+def build_analysis(players, finishing=None, profile=None):
+    """Roster dict → (team_avg, analyzed PlayerTable); `finishing` maps name → xG-adjusted SH%."""
+    t = build_table(players)
+    if finishing:
+        t.finishing = np.array([finishing.get(n, np.nan) for n in t.names], dtype=np.float64)
+    team_avg = compute_team_avg(t)
+    return team_avg, analyze_table(t, team_avg, profile)
+
+
+# ═══════════════════════════════════════════════
+# SEASON TIMELINE
+# ═══════════════════════════════════════════════
+# Scores and tiers as they stood after each game. Every (player, cutoff)
+# pair becomes one row of a virtual float-valued table, so the vectorized
+# engine evaluates all cutoffs in a single call with per-row team_avg
+# normalizers.
+#
+# Only g, a, pts, sh and to have per-game logs, and the published logs don't
+# always sum to the season totals. A logged stat at cutoff k is therefore the
+# season total × (cumulative log share through k); unlogged stats (gb, dc,
+# ct, sog, fp, cards) are prorated by games played. The last cutoff
+# reproduces the season scores exactly.
+
+LOGGED_TOTALS = {"g": "game_g", "a": "game_a", "pts": "game_pts", "sh": "game_sh", "to": "game_to"}
+
+
+def _cutoff_team_avg(vt, P, K):
+    """compute_team_avg per cutoff, returned as per-row arrays (row = player × K + cutoff)."""
+    played = vt.stats["gp"].reshape(P, K)
+    active = played >= 2
+    active = np.where(active.any(axis=0), active, played >= 1)   # early cutoffs: nobody has 2 GP yet
+    gp = np.maximum(played, 1)
+    col = lambda k: vt.stats[k].reshape(P, K)
+    per_game = {"max_gpg": col("g") / gp, "max_ppg": col("pts") / gp, "max_apg": col("a") / gp,
+                "max_ctpg": col("ct") / gp, "max_gbpg": col("gb") / gp, "max_dcpg": col("dc") / gp,
+                "max_poss_impact": col("gb") + col("dc") + col("ct") - col("to")}
+    return {k: np.tile(np.max(v, axis=0, where=active, initial=-np.inf), P) for k, v in per_game.items()}
+
+
+@perf.timed()
+def compute_timeline(t, profile=None):
+    """(players × cutoffs) scores and tiers for cutoffs after game 1..G, in one vectorized pass.
+
+    Returns {"scores": structured (P, K) SCORES_DTYPE, "tier": (P, K) int8,
+    "played": (P, K) games counted at each cutoff, "team_avg": {key: (K,)}}.
+    """
+    P, K = len(t), t.logs.shape[2]
+    n = t.n_games.astype(np.int64)[:, None]
+    played = np.minimum(np.arange(1, K + 1)[None, :], n)                  # (P, K)
+    full = played == n
+    frac = played / np.maximum(n, 1)
+
+    vt = PlayerTable()
+    vt.names, vt.vocab = t.names, t.vocab
+    vt.stats = np.zeros(P * K, dtype=FLOAT_STATS_DTYPE)
+    for k in STR_STATS + list(GK_STATS):
+        vt.stats[k] = np.repeat(t.stats[k], K)
+    for k in INT_STATS:
+        vt.stats[k] = (t.col(k)[:, None] * frac).ravel()
+    cum = np.cumsum(t.logs.astype(np.float64), axis=2)                   # (P, logs, K)
+    for k, log in LOGGED_TOTALS.items():
+        c = cum[:, LOG_FIELDS.index(log), :]
+        total = c[:, -1:]
+        share = np.where(total > 0, c / np.where(total > 0, total, 1), frac)
+        vt.stats[k] = (t.col(k)[:, None] * share).ravel()
+    vt.stats["gp"] = played.ravel()
+    vt.stats["num"] = np.repeat(t.stats["num"], K)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sh, g, sog = (vt.stats[k].reshape(P, K) for k in ("sh", "g", "sog"))
+        sh_pct = np.where(sh > 0, np.round(g / sh * 100, 1), 0.0)
+        sog_pct = np.where(sh > 0, np.round(sog / sh * 100, 1), 0.0)
+    vt.stats["sh_pct"] = np.where(full, t.col("sh_pct")[:, None], sh_pct).ravel()
+    vt.stats["sog_pct"] = np.where(full, t.col("sog_pct")[:, None], sog_pct).ravel()
+
+    # Game logs truncated at each cutoff, for consistency
+    keep = np.arange(K)[None, :, None] < played[:, None, :]              # (P, game, cutoff)
+    vt.logs = (np.repeat(t.logs[:, None, :, :], K, axis=1)
+               * np.moveaxis(keep, 2, 1)[:, :, None, :]).reshape(P * K, len(LOG_FIELDS), K)
+    vt.n_games = played.ravel()
+    vt.finishing = np.where(full, t.finishing[:, None], np.nan).ravel()
+
+    team_avg = _cutoff_team_avg(vt, P, K)
+    m = compute_metrics_table(vt, dtype=METRICS_FLOAT_DTYPE)
+    s = compute_scores_table(vt, m, team_avg, profile=profile)
+    return {"scores": s.reshape(P, K), "tier": compute_tiers_table(s, profile).reshape(P, K), "played": played,
+            "team_avg": {k: v[:K] for k, v in team_avg.items()}}
+
+
+def check_timeline(timeline, t):
+    """Raise ValueError unless every player's last cutoff reproduces her season scores and tier.
+
+    `t` must have been scored with the same profile as the timeline.
+    """
+    last = timeline["scores"][:, -1]
+    bad = np.zeros(len(t), dtype=bool)
+    for k in SCORES_DTYPE.names:
+        bad |= ~np.isclose(last[k], t.scores[k], rtol=0, atol=1e-6)
+    bad |= timeline["tier"][:, -1] != t.tier
+    if bad.any():
+        names = [t.names[i] for i in np.flatnonzero(bad)]
+        raise ValueError(f"timeline's last cutoff disagrees with the season scores for {len(names)} players: "
+                         + ", ".join(names[:5]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consistency checks on the scored roster.")
+    parser.add_argument("command", choices=["check-timeline"])
+    args = parser.parse_args()
+    import wlax_profiles   # imports this module, so only at run time
+    players, *_ = load_clean_data()
+    profiles, error = wlax_profiles.get_profiles()
+    if error:
+        parser.error(error)
+    failed = False
+    for name, profile in profiles.items():
+        _, t = build_analysis(players, profile=profile)
+        try:
+            check_timeline(compute_timeline(t, profile), t)
+            print(f"{name:24s} ok")
+        except ValueError as exc:
+            print(f"{name:24s} {exc}")
+            failed = True
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
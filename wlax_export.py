@@ -0,0 +1,186 @@
+"""Bulk export of the computed intelligence to a partitioned Parquet dataset for BI tools.
+
+    python wlax_export.py <out_dir> [--season 2026] [--full]
+
+Layout (hive partitioning, readable as one dataset by pyarrow, DuckDB, Spark,
+Power BI, ...):
+
+    <out_dir>/team=Virginia/season=2026/pos=M/part.parquet
+    <out_dir>/_wlax_export.json                  # partition digests, for incremental runs
+
+Every file has EXPORT_SCHEMA, derived from the engine's dtypes: the player
+name, every stats, metrics and scores field, games played in the log, xG
+finishing, tier (number and label), the flag bitmask plus flag names, notes
+and recommendations. Partition keys live in the path, not the files, and pos/yr
+are dictionary-encoded with the engine's own vocabulary codes as indices.
+
+Columns go from the engine arrays to Arrow without pandas or Python objects:
+plain arrays (tier, flags, n_games, finishing) are wrapped without a copy; a
+field of a structured array is strided, so it takes one contiguous NumPy copy.
+
+Incremental runs (the default) hash each partition's Arrow data and write
+only the partitions whose digest changed, removing partitions that no longer
+exist; a schema change forces a full rewrite.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import wlax_engine as engine
+import wlax_opponents as opponents
+import wlax_perf as perf
+
+SEASON = os.environ.get("WLAX_SEASON", "2026")
+MANIFEST = "_wlax_export.json"
+PARTITION_FILE = "part.parquet"
+
+_DICT = pa.dictionary(pa.int8(), pa.string())
+EXPORT_SCHEMA = pa.schema(
+    [pa.field("player", pa.string(), nullable=False)]
+    + [pa.field(k, _DICT if k in engine.STR_STATS else pa.from_numpy_dtype(engine.STATS_DTYPE[k]))
+       for k in engine.STATS_DTYPE.names if k != "pos"]
+    + [pa.field(k, pa.from_numpy_dtype(engine.METRICS_DTYPE[k])) for k in engine.METRICS_DTYPE.names]
+    + [pa.field(k, pa.float64()) for k in engine.SCORES_DTYPE.names]
+    + [pa.field("n_games", pa.int16()), pa.field("finishing", pa.float64()),
+       pa.field("tier", pa.int8()), pa.field("tier_label", _DICT),
+       pa.field("flags", pa.uint32()), pa.field("flag_names", pa.list_(pa.string())),
+       pa.field("notes", pa.string()), pa.field("recs", pa.list_(pa.string()))])
+SCHEMA_DIGEST = hashlib.sha256(EXPORT_SCHEMA.serialize().to_pybytes()).hexdigest()[:16]
+
+
+# ═══════════════════════════════════════════════
+# ENGINE COLUMNS → ARROW
+# ═══════════════════════════════════════════════
+
+def _column(arr):
+    """Arrow array over a NumPy column; contiguous arrays are wrapped as-is."""
+    return pa.array(arr if arr.flags.c_contiguous else np.ascontiguousarray(arr))
+
+
+def _dictionary(codes, vocab):
+    return pa.DictionaryArray.from_arrays(_column(codes.astype(np.int8)), pa.array(vocab, pa.string()))
+
+
+@perf.timed("export_arrow")
+def arrow_table(table):
+    """The whole PlayerTable as one Arrow table with EXPORT_SCHEMA plus the "pos" partition column."""
+    cols = {"player": pa.array(table.names, pa.string())}
+    for k in engine.STATS_DTYPE.names:
+        cols[k] = (_dictionary(table.stats[k], table.vocab[k]) if k in engine.STR_STATS
+                   else _column(table.stats[k]))
+    for arr in (table.metrics, table.scores):
+        cols.update({k: _column(arr[k]) for k in arr.dtype.names})
+    labels = [engine.TIER_LABELS[t] for t in sorted(engine.TIER_LABELS)]
+    cols.update({"n_games": _column(table.n_games), "finishing": _column(table.finishing),
+                 "tier": _column(table.tier), "tier_label": _dictionary(np.asarray(table.tier) - 1, labels),
+                 "flags": _column(table.flags),
+                 "flag_names": pa.array([[f for f, _ in table.flag_list(i)] for i in range(len(table))],
+                                        pa.list_(pa.string())),
+                 "notes": pa.array(table.notes, pa.string()), "recs": pa.array(table.recs, pa.list_(pa.string()))})
+    schema = EXPORT_SCHEMA.insert(1, pa.field("pos", _DICT))
+    return pa.Table.from_pydict({f.name: cols[f.name] for f in schema}, schema=schema)
+
+
+def partitions(table, team=opponents.TEAM_NAME, season=SEASON):
+    """{relative path: Arrow table} per position, partition columns dropped from the data."""
+    full = arrow_table(table)
+    codes = np.asarray(table.stats["pos"])
+    out = {}
+    for code, pos in enumerate(table.vocab["pos"]):
+        rows = np.flatnonzero(codes == code)
+        if len(rows):
+            path = os.path.join(f"team={team}", f"season={season}", f"pos={pos}", PARTITION_FILE)
+            out[path] = full.take(rows).drop_columns(["pos"])
+    return out
+
+
+def table_digest(t):
+    """Hash of an Arrow table's schema and data (its IPC stream bytes)."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, t.schema) as writer:
+        writer.write_table(t)
+    return hashlib.sha256(sink.getvalue()).hexdigest()[:16]
+
+
+# ═══════════════════════════════════════════════
+# WRITE
+# ═══════════════════════════════════════════════
+
+def _read_manifest(out_root):
+    try:
+        with open(os.path.join(out_root, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@perf.timed("export_write")
+def export(table, out_root, team=opponents.TEAM_NAME, season=SEASON, incremental=True):
+    """Write the partitioned dataset; returns {"written", "unchanged", "removed"} partition counts.
+
+    Other teams' or seasons' partitions already under `out_root` are left alone.
+    """
+    manifest = _read_manifest(out_root)
+    known = manifest.get("partitions", {}) if manifest.get("schema") == SCHEMA_DIGEST else {}
+    prefix = os.path.join(f"team={team}", f"season={season}") + os.sep
+    parts = partitions(table, team, season)
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+    digests = {path: d for path, d in known.items() if not path.startswith(prefix)}
+    for path, t in parts.items():
+        digests[path] = table_digest(t)
+        target = os.path.join(out_root, path)
+        if incremental and known.get(path) == digests[path] and os.path.exists(target):
+            stats["unchanged"] += 1
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        pq.write_table(t, target + ".tmp")
+        os.replace(target + ".tmp", target)
+        stats["written"] += 1
+    for path in known:
+        if path.startswith(prefix) and path not in parts:
+            try:
+                os.remove(os.path.join(out_root, path))
+                os.rmdir(os.path.dirname(os.path.join(out_root, path)))
+            except OSError:
+                pass
+            stats["removed"] += 1
+    os.makedirs(out_root, exist_ok=True)
+    tmp = os.path.join(out_root, MANIFEST + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"schema": SCHEMA_DIGEST, "partitions": dict(sorted(digests.items()))}, f, indent=1)
+    os.replace(tmp, os.path.join(out_root, MANIFEST))
+    return stats
+
+
+def parquet_bytes(table):
+    """The whole model as one in-memory Parquet file (pos kept as a column), for downloads."""
+    sink = pa.BufferOutputStream()
+    pq.write_table(arrow_table(table), sink)
+    return sink.getvalue().to_pybytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the computed player intelligence as partitioned Parquet.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--team", default=opponents.TEAM_NAME)
+    parser.add_argument("--season", default=SEASON)
+    parser.add_argument("--full", action="store_true", help="rewrite every partition, changed or not")
+    args = parser.parse_args()
+    import wlax_shots
+    import wlax_store as store
+    import wlax_xg
+    players, games, game_results, _, _ = engine.load_clean_data()
+    finishing, _ = wlax_xg.season_finishing(wlax_shots.load_shots())
+    digest = store.content_hash(players, games, game_results, finishing)
+    _, table = store.load_or_build(digest, players, games, game_results, finishing=finishing)
+    stats = export(table, args.out_dir, args.team, args.season, incremental=not args.full)
+    print(f"{args.out_dir}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
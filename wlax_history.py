@@ -0,0 +1,257 @@
+"""Out-of-core scoring for multi-season, league-wide player-game data.
+
+    python wlax_history.py score <dataset_dir> <out_dir> [--scope season] [--workers 8]
+
+Input is a Parquet dataset partitioned by season and team
+(``season=2024/team=Virginia/*.parquet``), one row per player-game:
+
+    player, pos, yr, num, game, started, g, a, sh, sog, gb, dc, to, ct, fpg, fps, yc, gc
+    [gk_min, gk_ga, gk_sv, gk_w, gk_l]
+
+Two passes, each a map over partitions in a process pool:
+
+  1. summarize  read one partition, roll player-games up into a PlayerTable,
+                and return its partial aggregates: the team_avg maxima and
+                column sums. Maxima merge by max and sums by addition, so the
+                normalizers for any scope (team, season, league) come from
+                merging partials without revisiting the data.
+  2. score      re-read the partition, score it against the merged team_avg
+                for its scope, and write scores/tier/flags next to it in the
+                output dataset.
+
+The merged sums and counts also give every scope's per-game averages, written
+to <out_dir>/_scope_averages.parquet as a league baseline for the scores.
+
+A worker holds one partition at a time, so peak memory is bounded by the
+largest team-season, not the dataset; the work is embarrassingly parallel,
+so it scales with cores.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import wlax_engine as engine
+
+COUNT_COLUMNS = ["g", "a", "sh", "sog", "gb", "dc", "to", "ct", "fpg", "fps", "yc", "gc"]
+GK_COLUMNS = ["gk_min", "gk_ga", "gk_sv", "gk_w", "gk_l"]
+ID_COLUMNS = ["player", "pos", "yr", "num", "game", "started"]
+SCOPES = {"team": ("season", "team"), "season": ("season",), "league": ()}
+MAX_WORKERS = os.cpu_count() or 1
+SCOPE_AVERAGES = "_scope_averages.parquet"
+
+
+def partitions(root):
+    """[(keys, directory)] for every leaf partition, keys parsed from hive-style names."""
+    out = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if any(f.endswith(".parquet") for f in filenames):
+            rel = os.path.relpath(dirpath, root)
+            keys = dict(part.split("=", 1) for part in rel.split(os.sep) if "=" in part)
+            out.append((keys, dirpath))
+    return sorted(out, key=lambda p: p[1])
+
+
+def read_partition(path):
+    """One partition's player-game rows (only the columns the engine uses)."""
+    schema = pq.read_schema(next(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".parquet")))
+    cols = [c for c in ID_COLUMNS + COUNT_COLUMNS + GK_COLUMNS if c in schema.names]
+    return pq.read_table(path, columns=cols).to_pandas()
+
+
+def table_from_games(df):
+    """Player-game rows → PlayerTable of season totals and per-game logs, built column-wise."""
+    df = df.sort_values(["player", "game"], kind="stable")
+    names, row = np.unique(df["player"].to_numpy(), return_inverse=True)
+    n = len(names)
+    first = np.unique(row, return_index=True)[1]
+    t = engine.PlayerTable()
+    t.names = names.tolist()
+    t.index = {name: i for i, name in enumerate(t.names)}
+    t.vocab = {k: sorted(df[k].astype(str).unique()) for k in engine.STR_STATS}
+    t.stats = np.zeros(n, dtype=engine.STATS_DTYPE)
+    sums = lambda col: np.bincount(row, weights=df[col].to_numpy(np.float64), minlength=n)
+    for k in COUNT_COLUMNS:
+        t.stats[k] = sums(k) if k in df else 0
+    t.stats["gp"] = np.bincount(row, minlength=n)
+    t.stats["gs"] = sums("started") if "started" in df else 0
+    t.stats["pts"] = t.stats["g"] + t.stats["a"]
+    t.stats["num"] = df["num"].to_numpy()[first]
+    for k in engine.STR_STATS:
+        codes = pd.Categorical(df[k].astype(str), categories=t.vocab[k]).codes
+        t.stats[k] = codes[first]
+    sh = t.col("sh")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t.stats["sh_pct"] = np.where(sh > 0, np.round(t.col("g") / sh * 100, 1), 0.0)
+        t.stats["sog_pct"] = np.where(sh > 0, np.round(t.col("sog") / sh * 100, 1), 0.0)
+    for k in engine.GK_STATS:
+        t.stats[k] = np.nan
+    if "gk_min" in df:
+        gk_min, ga, sv = sums("gk_min"), sums("gk_ga"), sums("gk_sv")
+        keeper = (gk_min > 0) & (t.stats["pos"] == (t.vocab["pos"].index("GK") if "GK" in t.vocab["pos"] else -1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fields = {"gk_min": gk_min, "gk_ga": ga, "gk_sv": sv, "gk_w": sums("gk_w"), "gk_l": sums("gk_l"),
+                      "gk_gaa": np.round(ga / gk_min * 60, 2),
+                      "gk_sv_pct": np.round(np.where(sv + ga > 0, sv / (sv + ga) * 100, 0.0), 1)}
+        for k, v in fields.items():
+            t.stats[k] = np.where(keeper, v, np.nan)
+    t.n_games = t.stats["gp"].astype(np.int16)
+    slot = np.arange(len(df)) - first[row]
+    t.logs = np.zeros((n, len(engine.LOG_FIELDS), max(int(t.n_games.max(initial=0)), 1)), dtype=np.int16)
+    for j, f in enumerate(engine.LOG_FIELDS):
+        col = f[len("game_"):]
+        vals = (df["g"] + df["a"]).to_numpy() if col == "pts" else df[col].to_numpy()
+        t.logs[row, j, slot] = vals
+    t.finishing = np.full(n, np.nan)
+    return t
+
+
+# ═══════════════════════════════════════════════
+# PASS 1: PARTIAL AGGREGATES
+# ═══════════════════════════════════════════════
+
+def partial_aggregates(t):
+    """Mergeable summary of one partition: team_avg maxima, column sums and row counts."""
+    active = t.stats["gp"] >= 2
+    avg = engine.compute_team_avg(t) if active.any() else None
+    return {"team_avg": avg, "n_players": len(t), "n_active": int(active.sum()),
+            "sums": {k: float(t.col(k).sum()) for k in ["gp"] + COUNT_COLUMNS}}
+
+
+def merge_partials(parts):
+    """Combine partials: maxima by max, sums and counts by addition."""
+    out = {"team_avg": None, "n_players": 0, "n_active": 0, "sums": {}}
+    for p in parts:
+        if p["team_avg"] is not None:
+            out["team_avg"] = (dict(p["team_avg"]) if out["team_avg"] is None else
+                               {k: max(v, p["team_avg"][k]) for k, v in out["team_avg"].items()})
+        out["n_players"] += p["n_players"]
+        out["n_active"] += p["n_active"]
+        for k, v in p["sums"].items():
+            out["sums"][k] = out["sums"].get(k, 0.0) + v
+    return out
+
+
+def scope_averages(merged, scope):
+    """One row per scope: its key columns, player counts and per-game rates of every count column."""
+    keys = SCOPES[scope]
+    rows = []
+    for key, p in sorted(merged.items(), key=lambda kv: tuple(str(k) for k in kv[0])):
+        gp = max(p["sums"].get("gp", 0.0), 1.0)
+        rows.append({**dict(zip(keys, key)), "players": p["n_players"], "active_players": p["n_active"],
+                     "player_games": int(p["sums"].get("gp", 0)),
+                     **{f"{k}_per_game": p["sums"].get(k, 0.0) / gp for k in COUNT_COLUMNS}})
+    return pd.DataFrame(rows)
+
+
+def _summarize(job):
+    keys, path = job
+    return keys, partial_aggregates(table_from_games(read_partition(path)))
+
+
+# ═══════════════════════════════════════════════
+# PASS 2: SCORE
+# ═══════════════════════════════════════════════
+
+def score_table(t, team_avg):
+    """Numeric scoring pass (metrics, scores, flags, tiers); notes and recs are skipped at league scale."""
+    m = engine.compute_metrics_table(t)
+    s = engine.compute_scores_table(t, m, team_avg)
+    return m, s, engine.compute_flags_table(t, m, s), engine.compute_tiers_table(s)
+
+
+def _score(job):
+    keys, path, team_avg, out_root = job
+    t = table_from_games(read_partition(path))
+    m, s, flags, tier = score_table(t, team_avg)
+    cols = {"player": t.names, "gp": t.stats["gp"]}  # partition keys live in the output path
+    cols.update({k: m[k] for k in m.dtype.names})
+    cols.update({k: s[k] for k in s.dtype.names})
+    cols.update({"tier": tier, "flags": flags})
+    out_dir = os.path.join(out_root, *(f"{k}={v}" for k, v in keys.items()))
+    os.makedirs(out_dir, exist_ok=True)
+    pq.write_table(pa.table(cols), os.path.join(out_dir, "scores.parquet"))
+    return len(t)
+
+
+def _scope_key(keys, scope):
+    return tuple(keys.get(k) for k in SCOPES[scope])
+
+
+def run(root, out_root, scope="team", workers=MAX_WORKERS):
+    """Summarize, merge per scope, then score every partition; returns run stats."""
+    jobs = partitions(root)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(_summarize, jobs, chunksize=max(len(jobs) // (workers * 4), 1)))
+        by_scope = {}
+        for keys, p in partials:
+            by_scope.setdefault(_scope_key(keys, scope), []).append(p)
+        merged = {k: merge_partials(v) for k, v in by_scope.items()}
+        t1 = time.perf_counter()
+        score_jobs = [(keys, path, merged[_scope_key(keys, scope)]["team_avg"], out_root)
+                      for (keys, path) in jobs if merged[_scope_key(keys, scope)]["team_avg"] is not None]
+        rows = sum(pool.map(_score, score_jobs, chunksize=max(len(score_jobs) // (workers * 4), 1)))
+    os.makedirs(out_root, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(scope_averages(merged, scope), preserve_index=False),
+                   os.path.join(out_root, SCOPE_AVERAGES))
+    t2 = time.perf_counter()
+    return {"partitions": len(jobs), "scored_partitions": len(score_jobs), "players": rows,
+            "summarize_s": t1 - t0, "score_s": t2 - t1, "scopes": len(merged), "workers": workers}
+
+
+def write_synthetic_history(root, seasons=2, teams=20, players=28, games=18, seed=0):
+    """Random player-game partitions in the expected layout, for benchmarks only."""
+    rng = np.random.default_rng(seed)
+    pos = np.array(["A"] * 8 + ["M"] * 9 + ["D"] * 8 + ["GK"] * 3)
+    for s in range(seasons):
+        for tm in range(teams):
+            n = players * games
+            rate = np.repeat(rng.gamma(2, 0.5, players), games)
+            p = np.repeat(np.resize(pos, players), games)
+            keeper = p == "GK"
+            df = pd.DataFrame({"player": np.repeat([f"P{tm}-{i}" for i in range(players)], games),
+                               "pos": p, "yr": np.repeat(rng.choice(["Fr", "So", "Jr", "Sr"], players), games),
+                               "num": np.repeat(np.arange(players), games), "game": np.tile(np.arange(games), players),
+                               "started": rng.random(n) < 0.5})
+            for c, scale in (("g", 1), ("a", 0.6), ("gb", 0.8), ("dc", 0.5), ("to", 0.7), ("ct", 0.4),
+                             ("fpg", 0.1), ("fps", 0.2), ("yc", 0.05), ("gc", 0.01)):
+                df[c] = np.where(keeper, 0, rng.poisson(rate * scale))
+            df["sog"] = df["g"] + np.where(keeper, 0, rng.poisson(rate))
+            df["sh"] = df["sog"] + np.where(keeper, 0, rng.poisson(rate * 0.6))
+            df["gk_min"] = np.where(keeper, 60.0, 0.0)
+            df["gk_ga"] = np.where(keeper, rng.poisson(10, n), 0)
+            df["gk_sv"] = np.where(keeper, rng.poisson(8, n), 0)
+            df["gk_w"] = np.where(keeper, rng.random(n) < 0.5, 0).astype(int)
+            df["gk_l"] = np.where(keeper, 1 - df["gk_w"], 0)
+            out = os.path.join(root, f"season={2016 + s}", f"team=T{tm:03d}")
+            os.makedirs(out, exist_ok=True)
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), os.path.join(out, "part-0.parquet"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked league-wide scoring over partitioned Parquet.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sc = sub.add_parser("score")
+    sc.add_argument("root")
+    sc.add_argument("out")
+    sc.add_argument("--scope", choices=list(SCOPES), default="team")
+    sc.add_argument("--workers", type=int, default=MAX_WORKERS)
+    syn = sub.add_parser("synthetic")
+    syn.add_argument("root")
+    syn.add_argument("--seasons", type=int, default=2)
+    syn.add_argument("--teams", type=int, default=20)
+    args = parser.parse_args()
+    if args.command == "synthetic":
+        write_synthetic_history(args.root, args.seasons, args.teams)
+    else:
+        print(run(args.root, args.out, args.scope, args.workers))
+
+
+if __name__ == "__main__":
+    main()
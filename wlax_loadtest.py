@@ -0,0 +1,228 @@
+"""Concurrent-user load test for the dashboard, driven headlessly with AppTest.
+
+    python wlax_loadtest.py --users 30 --rounds 3 [--json results.json]
+
+Each simulated user is its own AppTest session (own session state, shared
+process-wide caches, like sessions on one server process) running in its
+own thread. A user walks every view, nudging a filter on each visit, with a
+short think time between actions. Every rerun runs with ``?diag=1``, so the
+app's own per-rerun record (stages, cache hits/misses) is collected from the
+session's perf history.
+
+Reported: per-view rerun latency percentiles, cache hit rates across all
+sessions, resident memory per session (peak RSS, sampled during the run,
+over the warm baseline, divided by the number of users) and failures by
+kind. A failed action or empty render is counted and the user carries on in
+a fresh session, so failures never silently drop the rest of a session.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+from collections import Counter
+
+import numpy as np
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wlax_player_intelligence_v2.py")
+VIEWS = ["📋 Player Cards", "📊 Team Overview", "🔬 Comparison", "🎯 Recommendations", "🏆 Draw Control Center",
+         "📰 Change Feed"]
+POSITIONS = ["A", "M", "D", "GK"]
+TIMEOUT = 120
+
+
+def rss_mb():
+    """Current resident set size of this process, in MB (Linux /proc; 0 elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def new_session():
+    at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+    at.query_params["diag"] = "1"
+    return at.run()
+
+
+def warm_up():
+    """One session through every view, so shared caches are filled before the users arrive.
+
+    Streamlit's cache spinner misbehaves under AppTest when several sessions
+    wait on the same cold cache entry (the waiting sessions come back with an
+    empty element tree), so cold-start contention is kept out of the numbers.
+    """
+    at = new_session()
+    for view in VIEWS:
+        at.sidebar.radio[0].set_value(view)
+        at.run()
+
+
+def nudge_filters(at, rng):
+    """Move one sidebar filter the way an analyst would."""
+    which = rng.choice(["pos", "gp", "reset"])
+    if which == "pos":
+        at.sidebar.multiselect[0].set_value(rng.sample(POSITIONS, rng.randint(1, len(POSITIONS))))
+    elif which == "gp":
+        at.sidebar.slider[0].set_value(rng.randint(1, 3))
+    else:
+        at.sidebar.multiselect[0].set_value(POSITIONS)
+        at.sidebar.slider[0].set_value(1)
+
+
+def ready(at, uid, view, errors):
+    """The session, with a rendered sidebar: an empty tree is re-run once, then replaced by a fresh session.
+
+    Each empty render and replacement is recorded as an error, so dropped
+    work shows up in the report instead of silently thinning the samples.
+    """
+    if len(at.sidebar.radio):
+        return at
+    errors.append({"user": uid, "view": view, "error": "empty render"})
+    at.run()
+    if len(at.sidebar.radio):
+        return at
+    errors.append({"user": uid, "view": view, "error": "session recreated"})
+    return new_session()
+
+
+def simulate_user(uid, rounds, think, samples, errors, start):
+    rng = random.Random(uid)
+    start.wait()
+    at = None
+    try:
+        at = new_session()
+        for _ in range(rounds):
+            for view in rng.sample(VIEWS, len(VIEWS)):
+                for action in ("view", "filter"):
+                    at = ready(at, uid, view, errors)
+                    t0 = time.perf_counter()
+                    try:
+                        if action == "view":
+                            at.sidebar.radio[0].set_value(view)
+                        else:
+                            nudge_filters(at, rng)
+                        at.run()
+                    except Exception as exc:  # one failed action costs that action, not the rest of the session
+                        errors.append({"user": uid, "view": view, "error": repr(exc)})
+                        samples.append({"user": uid, "history": at.session_state["perf_history"]}
+                                       if "perf_history" in at.session_state else {"user": uid})
+                        at = new_session()
+                        continue
+                    samples.append({"user": uid, "view": view, "action": action,
+                                    "ms": (time.perf_counter() - t0) * 1000})
+                    if at.exception:
+                        errors.append({"user": uid, "view": view, "error": str(at.exception[0].value)})
+                    time.sleep(rng.uniform(0, think))
+        samples.append({"user": uid, "history": at.session_state["perf_history"]})
+    except Exception as exc:  # a crashed session is a result, not a harness failure
+        errors.append({"user": uid, "view": None, "error": repr(exc),
+                       "where": [f.line for f in traceback.extract_tb(exc.__traceback__) if f.filename == __file__][-1]})
+
+
+class PeakRSS(threading.Thread):
+    """Samples rss_mb() every `interval` seconds until stopped; `.peak` is the highest reading."""
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval, self.peak, self.done = interval, rss_mb(), threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.peak = max(self.peak, rss_mb())
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        self.peak = max(self.peak, rss_mb())
+        return self.peak
+
+
+def run_load_test(users=30, rounds=2, think=0.2):
+    """Drive `users` concurrent sessions; returns the summary dict."""
+    warm_up()
+    base = rss_mb()
+    samples, errors = [], []
+    start = threading.Barrier(users)
+    threads = [threading.Thread(target=simulate_user, args=(u, rounds, think, samples, errors, start))
+               for u in range(users)]
+    sampler = PeakRSS()
+    sampler.start()
+    wall = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wall = time.perf_counter() - wall
+    return summarize(samples, errors, users, wall, base, sampler.stop())
+
+
+def summarize(samples, errors, users, wall, base_mb, peak_mb):
+    reruns = [s for s in samples if "ms" in s]
+    views = {}
+    for view in VIEWS:
+        ms = np.array([s["ms"] for s in reruns if s["view"] == view])
+        if len(ms):
+            views[view] = {"n": int(len(ms)), "p50": float(np.percentile(ms, 50)),
+                           "p95": float(np.percentile(ms, 95)), "p99": float(np.percentile(ms, 99)),
+                           "max": float(ms.max())}
+    all_ms = np.array([s["ms"] for s in reruns]) if reruns else np.zeros(1)
+    caches = {}
+    for s in samples:
+        for rec in s.get("history", []):
+            for name, c in rec["caches"].items():
+                agg = caches.setdefault(name, {"hits": 0, "misses": 0})
+                agg["hits"] += c["hits"]
+                agg["misses"] += c["misses"]
+    for c in caches.values():
+        c["hit_rate"] = c["hits"] / max(c["hits"] + c["misses"], 1)
+    return {"users": users, "reruns": len(reruns), "wall_s": wall,
+            "throughput_rps": len(reruns) / max(wall, 1e-9),
+            "overall": {"p50": float(np.percentile(all_ms, 50)), "p95": float(np.percentile(all_ms, 95)),
+                        "p99": float(np.percentile(all_ms, 99))},
+            "views": views, "caches": caches,
+            "memory": {"baseline_mb": base_mb, "peak_mb": peak_mb,
+                       "per_session_mb": (peak_mb - base_mb) / max(users, 1)},
+            "errors": errors}
+
+
+def print_report(r):
+    print(f"{r['users']} users · {r['reruns']} reruns in {r['wall_s']:.1f}s ({r['throughput_rps']:.1f}/s)")
+    print(f"overall  p50 {r['overall']['p50']:.0f} ms  p95 {r['overall']['p95']:.0f} ms  p99 {r['overall']['p99']:.0f} ms")
+    for view, v in r["views"].items():
+        print(f"  {view:26s} n={v['n']:4d}  p50 {v['p50']:7.0f}  p95 {v['p95']:7.0f}  p99 {v['p99']:7.0f}  max {v['max']:7.0f}")
+    print("caches   " + "  ".join(f"{k} {v['hit_rate']:.0%}" for k, v in sorted(r["caches"].items())))
+    m = r["memory"]
+    print(f"memory   baseline {m['baseline_mb']:.0f} MB  peak {m['peak_mb']:.0f} MB  ≈{m['per_session_mb']:.1f} MB/session")
+    if r["errors"]:
+        kinds = Counter(e["error"].split("(")[0] for e in r["errors"])
+        print(f"errors   {len(r['errors'])} ({', '.join(f'{k} ×{n}' for k, n in kinds.most_common())}; "
+              f"first: {r['errors'][0]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for the Streamlit dashboard.")
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=2, help="passes over every view per user")
+    parser.add_argument("--think", type=float, default=0.2, help="max think time between actions, seconds")
+    parser.add_argument("--json", help="also write the full result here")
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # bare-mode ScriptRunContext noise
+    result = run_load_test(args.users, args.rounds, args.think)
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Opponent strength and schedule-adjusted scores.
+
+Team strength is a log-linear ridge model fit on a league-wide results table:
+
+    log(goals + 0.5) = mu + home * h + off[team] - def[opponent]
+
+Each game contributes one row per side to a sparse design matrix. The
+normal equations (XᵀX, Xᵀy) are kept in the model so newly arrived results
+are folded in with a rank-k update and a single small solve, not a refit
+over the whole season.
+
+A goal against an opponent with defensive strength d counts exp(d) goals
+against an average defense; turnovers are divided by the same factor, and
+caused turnovers scale with the opponent's offensive strength exp(o).
+"""
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import wlax_engine as engine
+import wlax_perf as perf
+import wlax_validate as validate
+
+TEAM_NAME = "Virginia"
+RIDGE = 2.0
+LEAGUE_RESULTS_PATH = os.environ.get("WLAX_LEAGUE_RESULTS", "")
+RESULT_COLUMNS = ["team", "opponent", "team_goals", "opp_goals", "home"]
+
+_LABEL_RE = re.compile(r"^(vs|at)\s+(.+?)\s+\(([WLT])\s+(\d+)-(\d+)\)$")
+
+
+def parse_game_label(label):
+    """'at Maryland (L 17-9)' → {'opponent': 'Maryland', 'home': -1, 'team_goals': 9, 'opp_goals': 17}.
+
+    Scores are written winner-first, so the result letter decides which side is ours.
+    """
+    m = _LABEL_RE.match(label.strip())
+    if not m:
+        return None
+    where, opp, res, hi, lo = m.groups()
+    hi, lo = int(hi), int(lo)
+    ours, theirs = (hi, lo) if res == "W" else (lo, hi) if res == "L" else (hi, lo)
+    return {"opponent": opp, "home": 1 if where == "vs" else -1, "team_goals": ours, "opp_goals": theirs}
+
+
+def team_results(games, team=TEAM_NAME):
+    """Our schedule as a results table (one row per game, unparseable labels dropped)."""
+    rows = [dict(team=team, **g) for g in map(parse_game_label, games) if g]
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def load_league_results(games, path=LEAGUE_RESULTS_PATH, team=TEAM_NAME):
+    """League results CSV (columns: team, opponent, team_goals, opp_goals[, home]) plus our own games.
+
+    Without a league file the fit falls back to our schedule alone, where the
+    ridge penalty keeps every team close to league average.
+    """
+    ours = team_results(games, team)
+    if not path or not os.path.exists(path):
+        return ours
+    league = pd.read_csv(path)
+    if "home" not in league:
+        league["home"] = 0
+    return pd.concat([league[RESULT_COLUMNS], ours], ignore_index=True).drop_duplicates()
+
+
+# ═══════════════════════════════════════════════
+# STRENGTH MODEL
+# ═══════════════════════════════════════════════
+# Columns: [intercept, home, off_0..off_T-1, def_0..def_T-1]
+
+def _empty_model(ridge):
+    return {"teams": [], "index": {}, "xtx": np.zeros((2, 2)), "xty": np.zeros(2),
+            "n_obs": 0, "ridge": ridge, "beta": np.zeros(2)}
+
+
+def _grow(model, teams):
+    """Add unseen teams, padding the normal equations with zero rows/cols."""
+    new = [t for t in dict.fromkeys(teams) if t not in model["index"]]
+    if not new:
+        return
+    T0 = len(model["teams"])
+    for t in new:
+        model["index"][t] = len(model["teams"])
+        model["teams"].append(t)
+    T = len(model["teams"])
+    old = np.r_[0, 1, 2 + np.arange(T0), 2 + T + np.arange(T0)]
+    xtx = np.zeros((2 + 2 * T, 2 + 2 * T))
+    xtx[np.ix_(old, old)] = model["xtx"]
+    xty = np.zeros(2 + 2 * T)
+    xty[old] = model["xty"]
+    model["xtx"], model["xty"] = xtx, xty
+
+
+def _design(model, results):
+    """Sparse design matrix and targets: each game gives a row for each side."""
+    T = len(model["teams"])
+    idx = model["index"]
+    team = results["team"].map(idx).to_numpy()
+    opp = results["opponent"].map(idx).to_numpy()
+    home = results["home"].fillna(0).to_numpy(float)
+    n = len(results)
+    rows = np.repeat(np.arange(2 * n), 4)
+    attack = np.r_[team, opp]
+    defend = np.r_[opp, team]
+    cols = np.column_stack([np.zeros(2 * n, int), np.ones(2 * n, int), 2 + attack, 2 + T + defend]).ravel()
+    vals = np.column_stack([np.ones(2 * n), np.r_[home, -home], np.ones(2 * n), -np.ones(2 * n)]).ravel()
+    X = sparse.csr_matrix((vals, (rows, cols)), shape=(2 * n, 2 + 2 * T))
+    y = np.log(np.r_[results["team_goals"].to_numpy(float), results["opp_goals"].to_numpy(float)] + 0.5)
+    return X, y
+
+
+def _solve(model):
+    penalty = np.full(len(model["xty"]), model["ridge"])
+    penalty[:2] = 1e-6
+    model["beta"] = np.linalg.solve(model["xtx"] + np.diag(penalty), model["xty"])
+    return model
+
+
+@perf.timed()
+def update_strengths(model, new_results):
+    """Fold new results into the normal equations and re-solve (incremental refit)."""
+    if len(new_results) == 0:
+        return model
+    _grow(model, pd.concat([new_results["team"], new_results["opponent"]]))
+    X, y = _design(model, new_results)
+    model["xtx"] += (X.T @ X).toarray()
+    model["xty"] += X.T @ y
+    model["n_obs"] += len(y)
+    return _solve(model)
+
+
+def fit_strengths(results, ridge=RIDGE):
+    """Fit team strengths from scratch on a results table."""
+    return update_strengths(_empty_model(ridge), results)
+
+
+def strength_table(model):
+    """One row per team: offensive/defensive strength (log scale, 0 = league average) and expected goals."""
+    T = len(model["teams"])
+    beta = model["beta"]
+    off, dfn = beta[2:2 + T], beta[2 + T:]
+    off, dfn = off - off.mean(), dfn - dfn.mean()
+    base = np.exp(beta[0]) - 0.5
+    return pd.DataFrame({"team": model["teams"], "off": off, "def": dfn,
+                         "exp_goals_for": np.exp(beta[0] + off) - 0.5,
+                         "exp_goals_against": np.exp(beta[0] - dfn) - 0.5,
+                         "league_avg_goals": base}).set_index("team")
+
+
+# ═══════════════════════════════════════════════
+# SCHEDULE-ADJUSTED SCORES
+# ═══════════════════════════════════════════════
+
+def schedule_factors(t, games, model):
+    """(players × games) offensive and defensive adjustment factors.
+
+    A player whose game log covers the whole schedule gets a per-game factor
+    from that game's opponent. For shorter logs we don't know which games were
+    played, so every game gets the schedule-average factor.
+    """
+    strengths = strength_table(model)
+    opps = [g["opponent"] if g else None for g in map(parse_game_label, games)]
+    d = np.array([strengths["def"].get(o, 0.0) for o in opps])
+    o = np.array([strengths["off"].get(o, 0.0) for o in opps])
+    P, G = len(t), t.logs.shape[2]
+    full = (t.n_games == len(games))[:, None]
+    pad = lambda v: np.pad(v, (0, max(G - len(v), 0)))[:G]
+    off_f = np.where(full, pad(np.exp(d))[None, :], np.exp(d).mean() if len(d) else 1.0)
+    def_f = np.where(full, pad(np.exp(o))[None, :], np.exp(o).mean() if len(o) else 1.0)
+    return np.broadcast_to(off_f, (P, G)), np.broadcast_to(def_f, (P, G))
+
+
+def _weighted_share(log, factor, n_games):
+    """Log-weighted mean factor per player (plain mean where the log is empty)."""
+    mask = np.arange(log.shape[1]) < n_games[:, None]
+    total = (log * mask).sum(axis=1)
+    plain = (factor * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, (log * factor * mask).sum(axis=1) / total, plain)
+
+
+@perf.timed()
+def adjusted_scores(t, games, model, profile=None):
+    """Schedule-adjusted scores and tiers, run through the same vectorized engine.
+
+    Returns {"scores", "tier", "team_avg", "off_factor", "def_factor"}; the
+    factors are per-player season multipliers for reference.
+    """
+    off_f, def_f = schedule_factors(t, games, model)
+    ft = t.as_float()
+    mask = np.arange(t.logs.shape[2]) < t.n_games[:, None]
+    for k in ("g", "a"):
+        ft.stats[k] *= _weighted_share(ft.log("game_" + k), off_f, t.n_games)
+    ft.stats["pts"] = ft.stats["g"] + ft.stats["a"]
+    ft.stats["to"] /= _weighted_share(ft.log("game_to"), off_f, t.n_games)
+    ct_f = (def_f * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1)
+    ft.stats["ct"] *= ct_f
+    for k in ("g", "a", "pts"):
+        ft.logs[:, engine.LOG_FIELDS.index("game_" + k), :] *= off_f
+    ft.logs[:, engine.LOG_FIELDS.index("game_to"), :] /= off_f
+    team_avg = engine.compute_team_avg(ft)
+    m = engine.compute_metrics_table(ft, dtype=engine.METRICS_FLOAT_DTYPE)
+    s = engine.compute_scores_table(ft, m, team_avg, profile=profile)
+    return {"scores": s, "tier": engine.compute_tiers_table(s, profile), "team_avg": team_avg,
+            "off_factor": _weighted_share(t.log("game_g").astype(float), off_f, t.n_games), "def_factor": ct_f}
+
+
+# ═══════════════════════════════════════════════
+# DEFENSIVE MATCHUPS
+# ═══════════════════════════════════════════════
+# disruption[i, j] = expected events per game defender i takes away from attacker j:
+#   ct share × attacker's turnovers/game (pressure on the ball) +
+#   gb share × attacker's goals/game      (denying the shooter's second chances)
+# ct/gb shares are our per-game rates over the roster's best, so a pairing is
+# only as disruptive as the defender's strength on the attacker's weak point.
+
+UNIT_SIZE = 7
+DEFENDER_POSITIONS = ("D", "M")
+ATTACKER_POSITIONS = ("A", "M")
+FORBIDDEN = -1e9   # stands in for -inf pairs inside the solver, which rejects infeasible matrices
+
+
+def load_opponent_roster(source):
+    """Opponent roster (JSON path, file object or dict in the load_data players shape) → (team_avg, PlayerTable).
+
+    Rows go through the same validation as ours, then the same engine scores them.
+    """
+    if isinstance(source, dict):
+        players = source
+    elif hasattr(source, "read"):
+        players = json.load(source)
+    else:
+        with open(source) as f:
+            players = json.load(f)
+    players, _, _ = validate.clean_players(players)
+    return engine.build_analysis(players)
+
+
+def defender_pool(t, min_gp=2, unavailable=()):
+    """Row indices of our D/M players eligible to guard, minus anyone carded or out."""
+    out = {t.index[n] for n in unavailable if n in t.index}
+    ok = np.any([engine.is_pos(t, p) for p in DEFENDER_POSITIONS], axis=0) & (t.stats["gp"] >= min_gp)
+    return np.array([i for i in np.flatnonzero(ok) if i not in out], dtype=np.intp)
+
+
+def attacker_pool(t, n=UNIT_SIZE):
+    """Row indices of their n most dangerous A/M players by goals per game."""
+    ok = np.flatnonzero(np.any([engine.is_pos(t, p) for p in ATTACKER_POSITIONS], axis=0))
+    return ok[np.argsort(-t.metrics["gpg"][ok], kind="stable")[:n]]
+
+
+def disruption_matrix(ours, team_avg, defenders, theirs, attackers):
+    gp = np.maximum(ours.col("gp")[defenders], 1)
+    ct = engine.vnorm(ours.col("ct")[defenders] / gp, team_avg["max_ctpg"]) / 100
+    gb = engine.vnorm(ours.col("gb")[defenders] / gp, team_avg["max_gbpg"]) / 100
+    m = theirs.metrics[attackers]
+    touches = m["poss_involvement"] / np.maximum(theirs.col("gp")[attackers], 1)
+    to_pg = m["to_rate"] * touches
+    return ct[:, None] * to_pg[None, :] + gb[:, None] * m["gpg"][None, :]
+
+
+@perf.timed()
+def _assign(D):
+    """linear_sum_assignment maximizing D, where -inf pairs are forbidden (and left unassigned if unavoidable)."""
+    from scipy.optimize import linear_sum_assignment
+    rows, cols = linear_sum_assignment(np.where(np.isfinite(D), D, FORBIDDEN), maximize=True)
+    ok = np.isfinite(D[rows, cols])
+    return rows[ok], cols[ok]
+
+
+def assign_matchups(ours, team_avg, theirs, unavailable=(), unit_size=UNIT_SIZE):
+    """Optimal defender → attacker matchups, with the best alternate for each.
+
+    Solved as a rectangular linear assignment maximizing total disruption. The
+    alternate for a matchup is who takes that attacker when the assigned
+    defender is unavailable, found by re-solving without that defender, so it accounts
+    for the knock-on reshuffle of the rest of the unit. Returns a DataFrame
+    (one row per attacker; defender is None where the unit is short).
+
+    In scout-team mode (`theirs is ours`) midfielders sit in both pools, so
+    a player is never matched against herself, as defender or alternate.
+    """
+    defenders = defender_pool(ours, unavailable=unavailable)
+    attackers = attacker_pool(theirs, unit_size)
+    D = disruption_matrix(ours, team_avg, defenders, theirs, attackers)
+    if theirs is ours:
+        D[defenders[:, None] == attackers[None, :]] = -np.inf
+    rows, cols = _assign(D)
+    assigned = dict(zip(cols.tolist(), rows.tolist()))
+    out = []
+    for j, a in enumerate(attackers):
+        i = assigned.get(j)
+        alt = None
+        if i is not None and len(defenders) > 1:
+            keep = np.delete(np.arange(len(defenders)), i)
+            r2, c2 = _assign(D[keep])
+            hit = np.flatnonzero(c2 == j)
+            alt = ours.names[defenders[keep[r2[hit[0]]]]] if len(hit) else None
+        out.append({"attacker": theirs.names[a], "attacker_gpg": float(theirs.metrics["gpg"][a]),
+                    "defender": ours.names[defenders[i]] if i is not None else None,
+                    "disruption": float(D[i, j]) if i is not None else 0.0, "alternate": alt})
+    return pd.DataFrame(out)
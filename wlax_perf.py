@@ -0,0 +1,147 @@
+"""Per-rerun instrumentation: stage timers, counters, cache hit/miss rates and payload sizes.
+
+Streamlit runs each session's script in its own thread, so the current run's
+record is kept thread-local and never mixes between concurrent sessions.
+"""
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+def _new_record(label=""):
+    return {"label": label, "started": time.time(), "t0": time.perf_counter(),
+            "total_ms": 0.0, "stages": {}, "counters": {}, "caches": {},
+            "payloads": {}, "events": []}
+
+
+def start_run(label=""):
+    """Reset the current thread's record; call once at the top of every rerun."""
+    _local.record = _new_record(label)
+    return _local.record
+
+
+def current():
+    rec = getattr(_local, "record", None)
+    if rec is None:
+        rec = start_run()
+    return rec
+
+
+def finish_run():
+    """Stamp total wall time on the current record and return it."""
+    rec = current()
+    rec["total_ms"] = (time.perf_counter() - rec["t0"]) * 1000
+    return rec
+
+
+def begin(name):
+    """Open a stage that spans code which can't be wrapped in a `with` block."""
+    return name, time.perf_counter()
+
+
+def end(token):
+    name, t = token
+    rec = current()
+    dur = time.perf_counter() - t
+    st_ = rec["stages"].setdefault(name, {"ms": 0.0, "calls": 0})
+    st_["ms"] += dur * 1000
+    st_["calls"] += 1
+    rec["events"].append((name, t - rec["t0"], dur))
+
+
+@contextmanager
+def stage(name):
+    """Time a block; repeated entries of the same stage accumulate."""
+    token = begin(name)
+    try:
+        yield
+    finally:
+        end(token)
+
+
+def timed(name=None):
+    """Decorator form of `stage`, defaulting to the function name."""
+    def deco(fn):
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def count(name, n=1):
+    c = current()["counters"]
+    c[name] = c.get(name, 0) + n
+
+
+def record_payload(name, nbytes):
+    p = current()["payloads"].setdefault(name, {"bytes": 0, "count": 0})
+    p["bytes"] += nbytes
+    p["count"] += 1
+
+
+def _cache_stats(name):
+    return current()["caches"].setdefault(name, {"hits": 0, "misses": 0})
+
+
+def cache_event(name, hit):
+    """Record a hit or miss for caches that aren't wrapped by `track_cache`."""
+    _cache_stats(name)["hits" if hit else "misses"] += 1
+
+
+def track_cache(name, cache_decorator):
+    """Wrap a caching decorator (st.cache_data, functools.lru_cache, ...) so hits and misses are counted.
+
+    The miss marker lives inside the cached body, so it only fires when the
+    cache actually recomputes.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _local.cache_miss = True
+            with stage(f"cache_fill:{name}"):
+                return fn(*args, **kwargs)
+        cached = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            _local.cache_miss = False
+            result = cached(*args, **kwargs)
+            cache_event(name, hit=not _local.cache_miss)
+            return result
+        call.clear = getattr(cached, "clear", None)
+        return call
+    return deco
+
+
+def summary(rec=None):
+    """Flat, JSON-friendly view of a record (events dropped)."""
+    rec = rec or current()
+    caches = {k: dict(v, hit_rate=v["hits"] / max(v["hits"] + v["misses"], 1))
+              for k, v in rec["caches"].items()}
+    return {"label": rec["label"], "started": rec["started"], "total_ms": round(rec["total_ms"], 3),
+            "stages": {k: {"ms": round(v["ms"], 3), "calls": v["calls"]} for k, v in rec["stages"].items()},
+            "counters": dict(rec["counters"]), "caches": caches, "payloads": dict(rec["payloads"])}
+
+
+def to_json(records):
+    return json.dumps([summary(r) for r in records], indent=2)
+
+
+def to_trace(records):
+    """Chrome trace-event JSON (chrome://tracing, Perfetto), one tid per rerun."""
+    events = []
+    for tid, rec in enumerate(records):
+        base = (rec["started"] - records[0]["started"]) * 1e6
+        events.append({"name": "rerun " + rec["label"], "ph": "X", "pid": 1, "tid": tid,
+                       "ts": base, "dur": rec["total_ms"] * 1000})
+        for name, start, dur in rec["events"]:
+            events.append({"name": name, "ph": "X", "pid": 1, "tid": tid,
+                           "ts": base + start * 1e6, "dur": dur * 1e6})
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
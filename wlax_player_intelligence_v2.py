@@ -4,7 +4,27 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import json
 import math
+import os
+import wlax_bootstrap as bootstrap
+import wlax_changes as changes
+import wlax_engine as engine
+import wlax_export as export
+import wlax_opponents as opponents
+import wlax_perf as perf
+import wlax_possessions as possessions
+import wlax_profiles as profiles
+import wlax_projections as projections
+import wlax_roles as roles
+import wlax_search as search
+import wlax_shots as shotmap
+import wlax_store as store
+import wlax_workload as workload
+import wlax_xg as xg
+from wlax_engine import HEADSHOT_URLS
+
+perf.start_run()
 
 # ─── PAGE CONFIG ───
 st.set_page_config(
@@ -14,6 +34,9 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Hidden diagnostics panel: append ?diag=1 to the URL
+DIAGNOSTICS = st.query_params.get("diag") == "1"
+
 # ═══════════════════════════════════════════════
 # UVA OFFICIAL BRAND COLORS
 # ═══════════════════════════════════════════════
@@ -38,7 +61,15 @@ TIER_COLORS = {1: CAV_ORANGE, 2: UVA_CYAN, 3: UVA_GREEN, 4: MED_GRAY}
 FLAG_COLORS = {"positive": UVA_GREEN, "negative": UVA_MAGENTA, "warning": UVA_YELLOW, "info": UVA_CYAN}
 
 # ─── CUSTOM CSS (LIGHT THEME) ───
-st.markdown(f"""
+@st.cache_resource
+def stylesheet():
+    """The app's CSS as one minified <style> block, built once per process.
+
+    Sent through st.html, a style-only block lands in the event container
+    (no layout space), and being byte-identical on every rerun it is sent as
+    a hash reference once the browser has cached it (see .streamlit/config.toml).
+    """
+    css = f"""
 <style>
 @import url('https://fonts.googleapis.com/css2?family=DM+Sans:ital,opsz,wght@0,9..40,300;0,9..40,400;0,9..40,500;0,9..40,700;1,9..40,400&family=Bebas+Neue&display=swap');
 
@@ -151,6 +182,19 @@ section[data-testid="stSidebar"] .stMarkdown h4 {{
     letter-spacing: 1.5px;
     font-weight: 700;
 }}
+.impact-score-ci {{
+    color: white;
+    font-size: 0.72rem;
+    font-weight: 700;
+    letter-spacing: 1px;
+    margin-top: 4px;
+}}
+.tier-odds {{
+    color: {TEXT_GRAY};
+    font-size: 0.75rem;
+    letter-spacing: 0.5px;
+    margin: 2px 0 0 0;
+}}
 
 /* Stat boxes */
 .stat-box {{
@@ -191,6 +235,17 @@ section[data-testid="stSidebar"] .stMarkdown h4 {{
 .tier-2 {{ background: {UVA_CYAN}; }}
 .tier-3 {{ background: {UVA_GREEN}; }}
 .tier-4 {{ background: {MED_GRAY}; color: {UVA_BLUE}; }}
+.role-badge {{
+    display: inline-block;
+    padding: 3px 12px;
+    border-radius: 50px;
+    font-size: 0.72rem;
+    font-weight: 600;
+    border: 1px solid {UVA_BLUE};
+    color: {UVA_BLUE};
+    vertical-align: middle;
+    margin-left: 6px;
+}}
 
 /* Flag tags */
 .flag-tag {{
@@ -248,6 +303,76 @@ section[data-testid="stSidebar"] .stMarkdown h4 {{
     background: {LIGHT_GRAY};
 }}
 
+.headshot-num {{
+    width: 80px;
+    height: 80px;
+    border-radius: 50%;
+    background: {UVA_BLUE_25};
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 1.8rem;
+    color: {UVA_BLUE};
+    font-family: 'Bebas Neue', sans-serif;
+}}
+.rec-headshot {{
+    width: 60px;
+    height: 60px;
+    border-radius: 50%;
+    object-fit: cover;
+    border: 2px solid {MED_GRAY};
+}}
+
+/* Card layout: header + sub-score row in one element */
+.card-top {{ display: flex; align-items: center; gap: 1.2rem; }}
+.card-id {{ flex: 1; }}
+.stat-row {{
+    display: grid;
+    grid-template-columns: repeat(5, 1fr);
+    gap: 0.8rem;
+    margin-top: 1rem;
+}}
+.band-high {{ color: {UVA_GREEN}; }}
+.band-mid {{ color: {UVA_YELLOW}; }}
+.band-low {{ color: {UVA_MAGENTA}; }}
+.card-foot {{ margin-bottom: 2rem; }}
+
+/* Tier tiles (Team Overview) */
+.tier-tiles {{
+    display: grid;
+    grid-template-columns: repeat(4, 1fr);
+    gap: 1rem;
+    margin-bottom: 1rem;
+}}
+.tier-tile {{
+    text-align: center;
+    padding: 1.2rem;
+    background: {WHITE};
+    border-radius: 14px;
+    border: 2px solid {MED_GRAY};
+    box-shadow: 0 2px 8px rgba(0,0,0,0.05);
+}}
+.tier-tile-count {{
+    font-family: 'Bebas Neue', sans-serif;
+    font-size: 2.5rem;
+    color: {UVA_BLUE};
+}}
+.tier-tile-label {{
+    font-size: 0.72rem;
+    color: {TEXT_GRAY};
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    font-weight: 600;
+}}
+.tier-tile-names {{ font-size: 0.8rem; color: {UVA_BLUE}; margin-top: 8px; }}
+.tier-tile.tier-ring-1 .tier-tile-count {{ color: {CAV_ORANGE}; }}
+.tier-tile.tier-ring-2 .tier-tile-count {{ color: {UVA_CYAN}; }}
+.tier-tile.tier-ring-3 .tier-tile-count {{ color: {UVA_GREEN}; }}
+/* Tier-colored borders (tiles, recommendation headshots); tier 4 keeps the gray */
+.tier-ring-1 {{ border-color: {CAV_ORANGE}; }}
+.tier-ring-2 {{ border-color: {UVA_CYAN}; }}
+.tier-ring-3 {{ border-color: {UVA_GREEN}; }}
+
 /* Metric cards */
 div[data-testid="stMetric"] {{
     background: {WHITE};
@@ -265,356 +390,61 @@ div[data-testid="stMetric"] div[data-testid="stMetricValue"] {{
 /* Dataframe */
 .stDataFrame {{ border-radius: 10px; overflow: hidden; }}
 </style>
-""", unsafe_allow_html=True)
+"""
+    return " ".join(css.split())
 
 
-# ═══════════════════════════════════════════════
-# DATA LAYER
-# ═══════════════════════════════════════════════
-
-# Player headshot URLs from virginiasports.com (manually mapped)
-HEADSHOT_URLS = {
-    "Madison Alaimo": "https://virginiasports.com/imgproxy/pYMb3-v9_Iw05OEJEvS-VLV-PkXLxFnbK2dnVLNGX2o/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvYm9JU25aRzgycFVLbFVqTjc3c3daUkRwV0JOWkdpVDQ2UG0zSUVCQy5qcGc.jpg",
-    "Jenna Dinardo": "https://virginiasports.com/imgproxy/M-EqJX8pcAsMqHLqjB7zcRq0P-nR7bKVTQ8i_D86R_4/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvaUpmMjVsZWtZazlNZzRRYWxoTWlCZmhSNldUZjBxZnBTdW1kbENRYi5qcGc.jpg",
-    "Addi Foster": "https://virginiasports.com/imgproxy/a-B08gK1VEOXrp9J_Bq82N_9xdFa-xpzxKphIiuuPcg/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvRGdrQ1czdnJKTnRJcGRvZjJuOWRjSHBZMGJnbjRTeWZ3amFWRlFOOS5qcGc.jpg",
-    "Kate Galica": "https://virginiasports.com/imgproxy/Z4W8fnWOqaA8_rvVBt7EqYIeGP5hJuEhM3yBq62nGYU/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvdmFpYXp5MlVkMXBRMThGVFJxemZ3V2hyb3ZkUjl4MEIzbTN5UHdaYi5qcGc.jpg",
-    "Cady Flaherty": "https://virginiasports.com/imgproxy/K-T-B3xpQl-aDjFqBq_Y80c5ZE8x4l5H8MbR7AqGnOE/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvN2xzcFN0THhFbnMwZFBPNk1mTUt2V1M5VUt3S01VVlZPdkVzNWltdi5qcGc.jpg",
-    "Gabby Laverghetta": "https://virginiasports.com/imgproxy/F_sxh_p1KSKW5FxzFKp3vQ0A-0k4Y5uyhd-yVCTBm2Y/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvWFdGa3VmcGdIbk9OT3FZaUlnVDQ5Uld3UXBZdWFSWENDcTdIT0RMMS5qcGc.jpg",
-    "Livy Laverghetta": "https://virginiasports.com/imgproxy/b9RWFgqGBkgGFIjgOK2CzY-VKfyX8o_0dNxA-KbFVIE/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvbGRYSUxQeTRLN2dGN2dXbFlhcUtIaXExbzFLcDlGWFNMamdaMTVOeS5qcGc.jpg",
-    "Elyse Finnelle": "https://virginiasports.com/imgproxy/0R3SdJ2qx08ccevzYjFN9e1z3SJEdN1jJ8kAMuBbZrQ/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcveDVla1RCZnluRnJIUWRjQzdGbWNLZGdFVXhGa25jWkh4amVJcG5Ybi5qcGc.jpg",
-    "Kate Demark": "https://virginiasports.com/imgproxy/hqJLp2fJTW5ZPt0Zp8_GV7yOlAIOcBrwCOOJKBt5YZU/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvN3dWb0xoWXV3a0htamdHYjFJb2tVcXdEYnV0c0NZcHRkNWZJWWdYdi5qcGc.jpg",
-    "Alexandra Schneider": "https://virginiasports.com/imgproxy/s9CLFpBGzTNyXL3r9hC6sSeLTsHXYSiNNGxkdDR7EoE/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvMk5uMGVGOXpSS3F2aHlSU0hHU1hGNmVPcjEweTYyNWxQQVZIVDhWWi5qcGc.jpg",
-    "Sophia Conti": "https://virginiasports.com/imgproxy/5z2L5PGXqj8_YJRy8H8-tXxjj3pIH3CjRXzE97dG-eA/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvQmRzQU1yNkZjME1MSjd5OVFqOXVmRHdLdndlcUh5WjBvaTdYSWVRSi5qcGc.jpg",
-    "Lara Kology": "https://virginiasports.com/imgproxy/gk2T0i4LG_ik2E-fL7oaS8nlJPhBl9aPWS-NHB2XpNM/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZkdZYlhiZFdHT1d2bXRuUXFndUxyWW5ERWh3R3lqR2lLYjgzbm1JMC5qcGc.jpg",
-    "Alex Reilly": "https://virginiasports.com/imgproxy/v5qLaFiVpJJ6AQBdz1V2PEiNWxJnS1vVPKN3Nde4wDk/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvUXRYTDUyOFJyODlUWm5wek1hOHRscXZXd2pjQnExNWdjY0VmQXZVbS5qcGc.jpg",
-    "Payton Sfreddo": "https://virginiasports.com/imgproxy/TXIbMgQ6cnYINW5h0zcOSjHGNcNbptNMhT4HwIFi7FI/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvQjI3eG1zcXZVd3BmVENpNjRkMjZ2NXJ3SjNIR0xCOFdVT09tTkFnUy5qcGc.jpg",
-    "Mel Josephson": "https://virginiasports.com/imgproxy/0l2LW0rXiVmhIAi7dFFqPjC_8iNmCIoNXHPj80L64io/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZXRKSk55RXF5Nnl3YUV2Y3FUVDRHR1RVclNYazlXdGJGTGd3ekVQYy5qcGc.jpg",
-    "Raleigh Foster": "https://virginiasports.com/imgproxy/Ke-zN1_Bc0bQF5BRmfL_y8JtajBT9e0Z3Y7WjMIyg6o/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvQjB4aWI5MlRFTXpPeFBzaW1Gc0VZc2drUEt5c0MyQ2JUZzVwM0Jqdy5qcGc.jpg",
-    "Carly Kennedy": "https://virginiasports.com/imgproxy/jP9nvB-_HjIFZ23hA5A_eMpRn7gU5XBmNXhxW1AKK5A/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvSE5SSHBxZWF4Mk5jQXQ0ZXRWVEFYTHhiUnJ2VTlMbUZPU3BYUDdiOC5qcGc.jpg",
-    "Megan Rocklein": "https://virginiasports.com/imgproxy/k7wIW43g42bHERYl-kL_FVPJ3-JqPxfjz4fwdZJBfbo/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvSk5yRDlpNldlSTBHbGpPUVFaYUVtNTBFWFhyVzFoRnBZcno0VmU1Yi5qcGc.jpg",
-    "Fiona Allen": "https://virginiasports.com/imgproxy/Z_e6g3SVzfXz9VffJLWQWJP0KdKdGH7BKxj1xEm3eiU/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvTEV5d0daUEE5RTczTlQ3TGdJUjh0S2RMeTFjRlJiTjB4dHlwQ0p3Sy5qcGc.jpg",
-    "Abby Musser": "https://virginiasports.com/imgproxy/2ZI8pSVJOr2J7oWmHI1Q-OWVeVj-6JFIm0fQRx8l5kM/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvU21NckJ6SEF3clZMZjdDNHlFMHQ0VjhxRmxVSmtLNWN4bVdwclRIVi5qcGc.jpg",
-    "Jayden Piraino": "https://virginiasports.com/imgproxy/5i_Fqg7Lxf8Wge2MfLXp5LYdKJgSqS6K8l3iqGS77RY/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZk5pZDFYYnhGR1UxTmkxSWdtSlI3aUQxZjM1MnBKSjN2VTlVUUoyYy5qcGc.jpg",
-    "Corey White": "https://virginiasports.com/imgproxy/P7CbNjrQg_YxRiGiPMeMLxIJMC9FW4OPqyuKw-3cpyw/rs:fit:400:0:0:0/g:ce:0:0/q:85/aHR0cHM6Ly9zdG9yYWdlLmdvb2dsZWFwaXMuY29tL3Zpcmdpbmlhc3BvcnRzLWNvbS1wcm9kLzIwMjUvMDEvMDcvZTFTQUVHRE5mWWRLYkNOc21QQk12VlRONXI3Ymo5bkI2MHdGOEptOS5qcGc.jpg",
-}
-
-@st.cache_data
-def load_data():
-    """Build all player data from the uploaded Virginia season stats."""
-    players = {
-        "Madison Alaimo": {"num": 16, "pos": "A", "yr": "Jr", "gp": 5, "gs": 5,
-            "g": 10, "a": 15, "pts": 25, "sh": 18, "sh_pct": 55.6, "sog": 16, "sog_pct": 88.9,
-            "gb": 4, "dc": 0, "to": 11, "ct": 1, "fpg": 3, "fps": 4, "yc": 0, "gc": 2,
-            "game_g": [0,5,3,4,2], "game_a": [4,1,2,3,3], "game_pts": [4,6,5,7,5],
-            "game_sh": [3,5,5,4,3], "game_to": [4,2,0,1,4]},
-        "Jenna Dinardo": {"num": 4, "pos": "A", "yr": "Jr", "gp": 5, "gs": 5,
-            "g": 9, "a": 2, "pts": 11, "sh": 29, "sh_pct": 31.0, "sog": 26, "sog_pct": 89.7,
-            "gb": 3, "dc": 8, "to": 10, "ct": 2, "fpg": 3, "fps": 9, "yc": 1, "gc": 3,
-            "game_g": [1,3,3,1,1], "game_a": [0,1,1,0,0], "game_pts": [1,4,4,1,1],
-            "game_sh": [4,10,8,6,5], "game_to": [3,2,2,1,4]},
-        "Addi Foster": {"num": 15, "pos": "A", "yr": "Jr", "gp": 5, "gs": 5,
-            "g": 10, "a": 2, "pts": 12, "sh": 24, "sh_pct": 41.7, "sog": 20, "sog_pct": 83.3,
-            "gb": 2, "dc": 0, "to": 3, "ct": 0, "fpg": 2, "fps": 2, "yc": 1, "gc": 1,
-            "game_g": [0,4,2,3,1], "game_a": [0,1,0,0,1], "game_pts": [0,5,2,3,2],
-            "game_sh": [1,5,3,6,6], "game_to": [1,1,0,1,0]},
-        "Kate Galica": {"num": 5, "pos": "M", "yr": "Jr", "gp": 5, "gs": 5,
-            "g": 6, "a": 5, "pts": 11, "sh": 24, "sh_pct": 25.0, "sog": 17, "sog_pct": 70.8,
-            "gb": 13, "dc": 35, "to": 13, "ct": 10, "fpg": 1, "fps": 4, "yc": 0, "gc": 3,
-            "game_g": [2,1,0,1,3], "game_a": [0,1,0,2,2], "game_pts": [2,2,0,3,5],
-            "game_sh": [3,5,5,6,7], "game_to": [1,4,4,4,2]},
-        "Cady Flaherty": {"num": 6, "pos": "M", "yr": "Fr", "gp": 5, "gs": 2,
-            "g": 4, "a": 1, "pts": 5, "sh": 7, "sh_pct": 57.1, "sog": 6, "sog_pct": 85.7,
-            "gb": 3, "dc": 1, "to": 1, "ct": 2, "fpg": 3, "fps": 3, "yc": 0, "gc": 3,
-            "game_g": [2,0,1,1,0], "game_a": [0,1,1,0,0], "game_pts": [2,1,2,1,0],
-            "game_sh": [2,1,2,2,1], "game_to": [0,0,0,1,0]},
-        "Gabby Laverghetta": {"num": 43, "pos": "A", "yr": "So", "gp": 5, "gs": 3,
-            "g": 5, "a": 2, "pts": 7, "sh": 8, "sh_pct": 62.5, "sog": 6, "sog_pct": 75.0,
-            "gb": 3, "dc": 0, "to": 3, "ct": 0, "fpg": 0, "fps": 0, "yc": 1, "gc": 3,
-            "game_g": [2,1,0,1,0], "game_a": [1,1,0,0,0], "game_pts": [3,2,0,1,0],
-            "game_sh": [3,1,0,2,0], "game_to": [0,0,0,2,0]},
-        "Livy Laverghetta": {"num": 42, "pos": "M", "yr": "So", "gp": 5, "gs": 0,
-            "g": 3, "a": 1, "pts": 4, "sh": 4, "sh_pct": 75.0, "sog": 4, "sog_pct": 100.0,
-            "gb": 2, "dc": 1, "to": 2, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
-            "game_g": [1,1,1,1,0], "game_a": [0,1,0,1,0], "game_pts": [1,2,1,2,0],
-            "game_sh": [1,1,1,1,0], "game_to": [0,0,0,0,0]},
-        "Raleigh Foster": {"num": 10, "pos": "A", "yr": "Fr", "gp": 2, "gs": 0,
-            "g": 3, "a": 0, "pts": 3, "sh": 7, "sh_pct": 42.9, "sog": 6, "sog_pct": 85.7,
-            "gb": 0, "dc": 0, "to": 0, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
-            "game_g": [1,2], "game_a": [0,0], "game_pts": [1,2],
-            "game_sh": [4,3], "game_to": [0,0]},
-        "Alex Reilly": {"num": 23, "pos": "M", "yr": "So", "gp": 5, "gs": 5,
-            "g": 1, "a": 0, "pts": 1, "sh": 5, "sh_pct": 20.0, "sog": 3, "sog_pct": 60.0,
-            "gb": 2, "dc": 6, "to": 3, "ct": 2, "fpg": 0, "fps": 0, "yc": 2, "gc": 1,
-            "game_g": [1,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [1,0,0,0,0],
-            "game_sh": [3,0,0,0,0], "game_to": [0,0,0,0,1]},
-        "Payton Sfreddo": {"num": 7, "pos": "M", "yr": "So", "gp": 5, "gs": 0,
-            "g": 1, "a": 0, "pts": 1, "sh": 1, "sh_pct": 100.0, "sog": 1, "sog_pct": 100.0,
-            "gb": 3, "dc": 1, "to": 1, "ct": 1, "fpg": 0, "fps": 0, "yc": 0, "gc": 1,
-            "game_g": [1,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [1,0,0,0,0],
-            "game_sh": [1,0,0,0,0], "game_to": [0,0,0,0,0]},
-        "Kate Demark": {"num": 3, "pos": "D", "yr": "Jr", "gp": 5, "gs": 5,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 3, "dc": 0, "to": 0, "ct": 10, "fpg": 0, "fps": 0, "yc": 0, "gc": 2,
-            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
-            "game_sh": [0,0,0,0,0], "game_to": [0,0,0,0,0]},
-        "Alexandra Schneider": {"num": 8, "pos": "D", "yr": "Jr", "gp": 5, "gs": 5,
-            "g": 0, "a": 0, "pts": 0, "sh": 1, "sh_pct": 0, "sog": 1, "sog_pct": 100.0,
-            "gb": 2, "dc": 0, "to": 0, "ct": 6, "fpg": 0, "fps": 0, "yc": 1, "gc": 0,
-            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
-            "game_sh": [0,0,1,0,0], "game_to": [0,0,0,0,0]},
-        "Sophia Conti": {"num": 9, "pos": "M", "yr": "So", "gp": 5, "gs": 5,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 9, "dc": 0, "to": 2, "ct": 4, "fpg": 0, "fps": 0, "yc": 0, "gc": 1,
-            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
-            "game_sh": [0,0,0,0,0], "game_to": [1,0,1,0,1]},
-        "Lara Kology": {"num": 36, "pos": "D", "yr": "Sr", "gp": 5, "gs": 5,
-            "g": 0, "a": 0, "pts": 0, "sh": 1, "sh_pct": 0, "sog": 1, "sog_pct": 100.0,
-            "gb": 7, "dc": 1, "to": 1, "ct": 1, "fpg": 0, "fps": 0, "yc": 1, "gc": 2,
-            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
-            "game_sh": [0,1,0,1,0], "game_to": [1,0,0,0,0]},
-        "Elyse Finnelle": {"num": 34, "pos": "GK", "yr": "Sr", "gp": 5, "gs": 3,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 10, "dc": 0, "to": 0, "ct": 1, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
-            "gk_min": 230.82, "gk_ga": 39, "gk_gaa": 10.14, "gk_sv": 23, "gk_sv_pct": 37.1,
-            "gk_w": 2, "gk_l": 1,
-            "game_g": [0,0,0,0,0], "game_a": [0,0,0,0,0], "game_pts": [0,0,0,0,0],
-            "game_sh": [0,0,0,0,0], "game_to": [0,0,0,0,0]},
-        "Mel Josephson": {"num": 26, "pos": "GK", "yr": "Sr", "gp": 3, "gs": 2,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 3, "dc": 0, "to": 0, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
-            "gk_min": 68.47, "gk_ga": 17, "gk_gaa": 14.90, "gk_sv": 10, "gk_sv_pct": 37.0,
-            "gk_w": 0, "gk_l": 2,
-            "game_g": [0,0,0], "game_a": [0,0,0], "game_pts": [0,0,0],
-            "game_sh": [0,0,0], "game_to": [0,0,0]},
-        "Carly Kennedy": {"num": 13, "pos": "M", "yr": "So", "gp": 3, "gs": 2,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 4, "dc": 0, "to": 0, "ct": 3, "fpg": 0, "fps": 0, "yc": 0, "gc": 1,
-            "game_g": [0,0,0], "game_a": [0,0,0], "game_pts": [0,0,0],
-            "game_sh": [0,0,0], "game_to": [0,0,0]},
-        "Megan Rocklein": {"num": 11, "pos": "M", "yr": "Fr", "gp": 3, "gs": 0,
-            "g": 0, "a": 2, "pts": 2, "sh": 1, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 1, "dc": 0, "to": 3, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
-            "game_g": [0,0,0], "game_a": [0,2,0], "game_pts": [0,2,0],
-            "game_sh": [0,0,1], "game_to": [1,0,2]},
-        "Fiona Allen": {"num": 41, "pos": "A", "yr": "So", "gp": 4, "gs": 0,
-            "g": 1, "a": 1, "pts": 2, "sh": 2, "sh_pct": 50.0, "sog": 1, "sog_pct": 50.0,
-            "gb": 0, "dc": 0, "to": 1, "ct": 0, "fpg": 1, "fps": 1, "yc": 0, "gc": 0,
-            "game_g": [0,0,1,0], "game_a": [1,0,0,0], "game_pts": [1,0,1,0],
-            "game_sh": [0,0,1,0], "game_to": [0,0,0,0]},
-        "Abby Musser": {"num": 14, "pos": "D", "yr": "So", "gp": 4, "gs": 3,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 2, "dc": 0, "to": 1, "ct": 1, "fpg": 0, "fps": 0, "yc": 1, "gc": 0,
-            "game_g": [0,0,0,0], "game_a": [0,0,0,0], "game_pts": [0,0,0,0],
-            "game_sh": [0,0,0,0], "game_to": [0,0,0,1]},
-        "Jayden Piraino": {"num": 2, "pos": "A", "yr": "So", "gp": 1, "gs": 0,
-            "g": 2, "a": 0, "pts": 2, "sh": 2, "sh_pct": 100.0, "sog": 2, "sog_pct": 100.0,
-            "gb": 0, "dc": 0, "to": 0, "ct": 0, "fpg": 1, "fps": 1, "yc": 0, "gc": 0,
-            "game_g": [2], "game_a": [0], "game_pts": [2],
-            "game_sh": [2], "game_to": [0]},
-        "Corey White": {"num": 25, "pos": "M", "yr": "Jr", "gp": 4, "gs": 0,
-            "g": 0, "a": 0, "pts": 0, "sh": 0, "sh_pct": 0, "sog": 0, "sog_pct": 0,
-            "gb": 0, "dc": 1, "to": 0, "ct": 0, "fpg": 0, "fps": 0, "yc": 0, "gc": 0,
-            "game_g": [0,0,0,0], "game_a": [0,0,0,0], "game_pts": [0,0,0,0],
-            "game_sh": [0,0,0,0], "game_to": [0,0,0,0]},
-    }
-    games = ["vs Navy (L 12-10)", "vs Richmond (L 12-11)", "at Maryland (L 17-9)", "at Liberty (W 17-8)", "at Notre Dame (W 9-7)"]
-    game_results = ["L", "L", "L", "W", "W"]
-    return players, games, game_results
+_css_t = perf.begin("css")
+st.html(stylesheet())
+perf.end(_css_t)
 
 
 # ═══════════════════════════════════════════════
-# METRICS ENGINE
+# HTML TEMPLATES
 # ═══════════════════════════════════════════════
-
-def compute_advanced_metrics(p):
-    gp = max(p["gp"], 1)
-    m = {}
-    m["ppg"] = p["pts"] / gp
-    m["gpg"] = p["g"] / gp
-    m["apg"] = p["a"] / gp
-    m["pts_per_shot"] = p["pts"] / max(p["sh"], 1)
-    m["shot_quality"] = (p.get("sog_pct", 0) * p.get("sh_pct", 0)) / 100
-    poss_inv = p["sh"] + p["to"] + p["dc"] + p["gb"]
-    m["poss_involvement"] = poss_inv
-    m["to_rate"] = p["to"] / max(poss_inv, 1)
-    m["poss_impact"] = p["gb"] + p["dc"] + p["ct"] - p["to"]
-    m["fp_eff"] = p["fpg"] / max(p["fps"], 1) * 100
-    m["discipline_raw"] = p["yc"] * 3 + p["gc"] * 1
-    m["gbpg"] = p["gb"] / gp
-    m["dcpg"] = p["dc"] / gp
-    m["ctpg"] = p["ct"] / gp
-    m["topg"] = p["to"] / gp
-    # Consistency
-    game_pts = p.get("game_pts", [])
-    if len(game_pts) > 1 and np.mean(game_pts) > 0:
-        m["consistency"] = 1 - min(np.std(game_pts) / np.mean(game_pts), 1)
-    elif len(game_pts) > 0 and np.mean(game_pts) > 0:
-        m["consistency"] = 1.0
-    else:
-        m["consistency"] = 0.5
-    # Clutch
-    game_g = p.get("game_g", [])
-    if len(game_g) == 5:
-        loss_avg = np.mean(game_g[:3]) if sum(game_g[:3]) > 0 else 0.001
-        win_avg = np.mean(game_g[3:])
-        m["clutch_ratio"] = win_avg / max(loss_avg, 0.001)
-    else:
-        m["clutch_ratio"] = 1.0
-    return m
-
-
-def compute_impact_scores(p, metrics, team_avg):
-    pos = p["pos"]
-    scores = {}
-    def norm(val, max_val, invert=False):
-        if max_val == 0: return 50
-        r = min(val / max_val, 1.5) / 1.5 * 100
-        return 100 - r if invert else r
-
-    scores["offensive"] = min(100, norm(metrics["gpg"], team_avg["max_gpg"]) * 0.35 +
-        norm(p["sh_pct"], 75) * 0.25 + norm(metrics["ppg"], team_avg["max_ppg"]) * 0.25 +
-        norm(p["a"] / max(p["gp"],1), team_avg["max_apg"]) * 0.15)
-    scores["defensive"] = min(100, norm(p["ct"] / max(p["gp"],1), team_avg["max_ctpg"]) * 0.45 +
-        norm(p["gb"] / max(p["gp"],1), team_avg["max_gbpg"]) * 0.35 +
-        norm(metrics["discipline_raw"], 10, invert=True) * 0.20)
-    scores["possession"] = min(100, norm(metrics["poss_impact"], team_avg["max_poss_impact"]) * 0.40 +
-        norm(p["dc"] / max(p["gp"],1), team_avg["max_dcpg"]) * 0.35 +
-        norm(p["gb"] / max(p["gp"],1), team_avg["max_gbpg"]) * 0.25)
-    scores["efficiency"] = min(100, norm(p["sh_pct"], 75) * 0.30 +
-        norm(p["sog_pct"], 100) * 0.25 + norm(metrics["to_rate"], 1, invert=True) * 0.25 +
-        norm(metrics["consistency"], 1) * 0.20)
-    scores["discipline"] = max(0, 100 - metrics["discipline_raw"] * 12)
-
-    if pos == "A": w = {"offensive": 0.40, "defensive": 0.05, "possession": 0.15, "efficiency": 0.30, "discipline": 0.10}
-    elif pos == "M": w = {"offensive": 0.25, "defensive": 0.20, "possession": 0.25, "efficiency": 0.20, "discipline": 0.10}
-    elif pos == "D": w = {"offensive": 0.05, "defensive": 0.45, "possession": 0.20, "efficiency": 0.10, "discipline": 0.20}
-    elif pos == "GK": w = {"offensive": 0.00, "defensive": 0.35, "possession": 0.15, "efficiency": 0.35, "discipline": 0.15}
-    else: w = {"offensive": 0.25, "defensive": 0.25, "possession": 0.20, "efficiency": 0.20, "discipline": 0.10}
-    scores["overall"] = sum(scores[k] * v for k, v in w.items())
-
-    if pos == "GK" and "gk_sv_pct" in p:
-        sv_score = norm(p["gk_sv_pct"], 60) * 0.40
-        gaa_score = norm(20 - p["gk_gaa"], 20) * 0.30
-        gb_score = norm(p["gb"] / max(p["gp"],1), team_avg["max_gbpg"]) * 0.15
-        disc = scores["discipline"] * 0.15
-        scores["overall"] = sv_score + gaa_score + gb_score + disc
-        scores["efficiency"] = sv_score / 0.40
-        scores["defensive"] = gaa_score / 0.30
-    return scores
-
-
-def get_development_flags(p, metrics, scores):
-    flags = []
-    if p["to"] / max(p["gp"],1) >= 2.0 and p["pts"] > 0: flags.append(("High Turnover Risk", "negative"))
-    if p["sh_pct"] >= 50 and p["sh"] >= 5: flags.append(("Elite Finisher", "positive"))
-    if p["sh_pct"] < 30 and p["sh"] >= 10: flags.append(("Shot Selection Concern", "warning"))
-    if metrics.get("fp_eff", 0) >= 70 and p["fps"] >= 3: flags.append(("FP Specialist", "positive"))
-    if p["ct"] / max(p["gp"],1) >= 1.5: flags.append(("Defensive Disruptor", "positive"))
-    if p["dc"] / max(p["gp"],1) >= 3: flags.append(("Draw Control Engine", "positive"))
-    if p["gb"] / max(p["gp"],1) >= 1.5: flags.append(("Ground Ball Magnet", "positive"))
-    if metrics["consistency"] >= 0.7 and p["pts"] > 3: flags.append(("Reliable Contributor", "info"))
-    if metrics["consistency"] < 0.4 and p["pts"] > 3: flags.append(("High Variance", "warning"))
-    if metrics.get("clutch_ratio", 1) >= 1.5 and p["g"] >= 3: flags.append(("Clutch Performer", "positive"))
-    if scores["discipline"] <= 60: flags.append(("Discipline Concern", "warning"))
-    if p["pos"] == "GK":
-        if p.get("gk_sv_pct", 0) >= 40: flags.append(("Solid Save Rate", "positive"))
-        if p.get("gk_gaa", 20) <= 10: flags.append(("Low GAA", "positive"))
-        if p.get("gk_gaa", 0) >= 14: flags.append(("High GAA Concern", "negative"))
-    if p["a"] / max(p["gp"],1) >= 2: flags.append(("Elite Playmaker", "positive"))
-    if p["pts"] == 0 and p["ct"] == 0 and p["gb"] <= 2 and p["dc"] == 0: flags.append(("Limited Impact", "negative"))
-    return flags
-
-
-def get_tier(scores, p):
-    s = scores["overall"]
-    if s >= 65: return 1, "Program Driver"
-    elif s >= 45: return 2, "System Amplifier"
-    elif s >= 25: return 3, "Situational Specialist"
-    else: return 4, "Developmental"
-
-
-def generate_coaching_notes(name, p, metrics, scores, tier_num, flags):
-    pos_full = {"A": "Attacker", "M": "Midfielder", "D": "Defender", "GK": "Goalkeeper"}[p["pos"]]
-    tier_names = {1: "Program Driver", 2: "System Amplifier", 3: "Situational Specialist", 4: "Developmental Player"}
-    note = f"{name} is a {p['yr']} {pos_full} classified as a **Tier {tier_num} — {tier_names[tier_num]}**. "
-    if p["pos"] == "A":
-        if p["g"] >= 8: note += f"She is a primary scoring threat with {p['g']}G and {p['a']}A in {p['gp']} games. "
-        if p["sh_pct"] < 35 and p["sh"] > 15: note += f"However, her {p['sh_pct']:.0f}% shooting on {p['sh']} shots suggests shot selection needs refinement. "
-        if p["to"] >= 8: note += f"Her {p['to']} turnovers are a concern and represent a key development area. "
-        if p["a"] >= 10: note += f"Her {p['a']} assists make her the offense's primary distributor. "
-    elif p["pos"] == "M":
-        if p["dc"] >= 20: note += f"She dominates the draw circle with {p['dc']} draw controls. "
-        if p["pts"] >= 5: note += f"Contributes offensively with {p['pts']} points. "
-        if p["ct"] >= 5: note += f"Adds defensive value with {p['ct']} caused turnovers. "
-    elif p["pos"] == "D":
-        if p["ct"] >= 5: note += f"An elite defender with {p['ct']} caused turnovers. "
-        if p["gb"] >= 5: note += f"Active on ground balls ({p['gb']}). "
-    elif p["pos"] == "GK" and "gk_sv_pct" in p:
-        note += f"Posted a {p['gk_sv_pct']:.1f}% save rate with {p['gk_gaa']:.2f} GAA. "
-    flag_names = [f[0] for f in flags]
-    pos_flags = [f for f in flag_names if any(x in f for x in ["Elite", "Specialist", "Engine", "Clutch", "Reliable", "Solid", "Low GAA"])]
-    if pos_flags: note += f"Key strengths: {', '.join(pos_flags)}. "
-    return note
-
-
-def generate_recommendations(name, p, metrics, scores, tier_num, flags):
-    """Generate actionable coaching recommendations."""
-    recs = []
-    pos = p["pos"]
-    gp = max(p["gp"], 1)
-
-    if pos == "A":
-        if p["sh_pct"] < 35 and p["sh"] >= 10:
-            recs.append(f"🎯 **Shot Selection:** {name}'s {p['sh_pct']:.0f}% shooting on {p['sh']} shots is below the productive threshold. Focus drills on shooting from higher-percentage zones and reducing contested attempts. Consider a 'two-touch-before-shoot' constraint in practice.")
-        if p["to"] / gp >= 2.0:
-            recs.append(f"🔄 **Ball Security:** Averaging {p['to']/gp:.1f} TO/game — work on off-hand stick skills and decision-making under pressure. Use small-sided games with turnover penalties to build awareness.")
-        if p["a"] / gp >= 2 and p["g"] / gp >= 1.5:
-            recs.append(f"⭐ **Maximize Usage:** {name} is a dual-threat creator ({metrics['gpg']:.1f} G/gm, {metrics['apg']:.1f} A/gm). She should be the primary option in critical possessions and settled offense. Consider running the offense through her in close games.")
-        if p["g"] >= 5 and p["a"] < 3:
-            recs.append(f"👀 **Expand Playmaking:** Strong finisher with {p['g']}G but only {p['a']}A — encourage her to look for the extra pass when doubled. This will open up her own shots long-term.")
-        if metrics["consistency"] < 0.5 and p["pts"] >= 5:
-            recs.append(f"📊 **Reduce Variance:** Point production is inconsistent (game pts: {p['game_pts']}). Use her in structured sets where she's guaranteed touches rather than relying on transition opportunities.")
-        if tier_num >= 3 and p["gp"] >= 3:
-            recs.append(f"🕐 **Situational Deployment:** Deploy {name} primarily in man-up / free-position situations and as a late-game spark plug off the bench rather than full-game starter.")
-
-    elif pos == "M":
-        if p["dc"] / gp >= 3:
-            recs.append(f"🏆 **Protect the Draw:** {name} at {p['dc']/gp:.0f} DC/game is an elite asset. Ensure she takes every draw and build secondary draw options to spell her in blowouts. Track draw-to-goal conversion rate.")
-        if p["ct"] / gp >= 1.5 and p["pts"] >= 5:
-            recs.append(f"🔥 **Two-Way Star:** Rare combo of {p['ct']} CTs and {p['pts']} PTS — maximize her minutes in competitive games. She impacts both ends.")
-        if p["to"] / gp >= 2.0:
-            recs.append(f"🔄 **Transition Discipline:** High turnovers ({p['to']}) for a midfielder. Focus on controlled clears and limiting risky passes in the midfield. Use film sessions to identify turnover patterns.")
-        if p["sh_pct"] < 30 and p["sh"] >= 5:
-            recs.append(f"🎯 **Shot Quality:** Only {p['sh_pct']:.0f}% shooting — reduce long-range attempts and focus on feeding attackers or driving to higher-percentage areas before releasing.")
-        if tier_num >= 3:
-            recs.append(f"🕐 **Role Clarity:** Use {name} as a defensive midfielder or draw-circle specialist rather than expecting offensive production. Clear role definition will boost confidence.")
-
-    elif pos == "D":
-        if p["ct"] / gp >= 1.5:
-            recs.append(f"🛡️ **Defensive Anchor:** {name}'s {p['ct']/gp:.1f} CTs/game make her a cornerstone — assign her to the opponent's top attacker in every game.")
-        if p["gb"] / gp >= 1.5:
-            recs.append(f"💪 **Ground Ball Intensity:** Strong ground ball rate ({p['gb']/gp:.1f}/gm) — use her on the draw circle for first-ground-ball recovery.")
-        if scores["discipline"] <= 60:
-            recs.append(f"⚠️ **Penalty Management:** Card accumulation is a risk — work on body positioning and footwork to avoid reaching fouls. A 1-game suspension would hurt the defense.")
-        if tier_num >= 3 and p["ct"] < 3:
-            recs.append(f"📈 **Development Focus:** Needs to increase disruptive plays (only {p['ct']} CTs). Use video breakdown to improve anticipation and check timing. Consider more minutes in lower-leverage situations to build experience.")
-
-    elif pos == "GK":
-        if p.get("gk_sv_pct", 0) < 40:
-            recs.append(f"🧤 **Save Rate Development:** {p.get('gk_sv_pct', 0):.1f}% is below D1 average (~45%). Focus on positioning drills, especially on free-position shots. Track save % by shot location to find weaknesses.")
-        if p.get("gk_gaa", 0) >= 12:
-            recs.append(f"📉 **Defensive System Review:** {p.get('gk_gaa', 0):.2f} GAA is elevated — this isn't solely a goalkeeper issue. Review defensive slide packages and communication protocols to reduce high-quality shots against.")
-        if p.get("gk_w", 0) >= 2:
-            recs.append(f"✅ **Start in Big Games:** {name}'s experience in wins makes her the clear choice for high-leverage matchups. Build confidence with clear communication from the coaching staff.")
-
-    # Universal recommendations
-    if len(recs) == 0:
-        if tier_num == 4:
-            recs.append(f"🌱 **Development Plan:** {name} needs increased practice reps to earn more game minutes. Focus on her best positional skill and track improvement weekly.")
-        elif tier_num == 3:
-            recs.append(f"📋 **Defined Role:** {name} can contribute in specific situations. Identify her top 1-2 skills and deploy her accordingly — don't ask her to do everything.")
-
-    return recs
+# Single-line on purpose: st.markdown would treat indented HTML as a code block.
+CARD_HEAD = ('<div class="player-card"><div class="card-top">{photo}<div class="card-id">'
+             '<p class="player-name">#{num} {name}</p>'
+             '<p class="player-meta">{pos} · {yr} · {gp} GP / {gs} GS '
+             '<span class="tier-badge tier-{tier}">{tier_text}</span>{role}</p>'
+             '<p class="tier-odds">{odds}</p></div>'
+             '<div class="impact-score-box" title="{level:.0%} bootstrap interval"><div class="impact-score-num">{overall:.0f}</div>'
+             '<div class="impact-score-label">Impact Score</div><div class="impact-score-ci">{lo:.0f}–{hi:.0f}</div></div></div>'
+             '<div class="stat-row">{stats}</div></div>')
+ROLE_BADGE = ' <span class="role-badge">{role}</span>'
+CARD_PHOTO = '<img src="{url}" class="headshot-circle" onerror="this.style.display=\'none\'">'
+CARD_PHOTO_NUM = '<div class="headshot-num">{num}</div>'
+STAT_BOX = '<div class="stat-box"><div class="stat-val band-{band}">{val:.0f}</div><div class="stat-label">{label}</div></div>'
+CARD_FOOT = '<div class="card-foot">{flags}<div class="coaching-notes">{notes}</div>{recs}</div>'
+FLAG_ROW = '<p><strong>Development Flags</strong> &nbsp; {tags}</p>'
+FLAG_TAG = '<span class="flag-tag flag-{kind}">{name}</span>'
+REC_BOX = '<div class="rec-box">{body}</div>'
+TIER_TILE = ('<div class="tier-tile tier-ring-{tier}"><div class="tier-tile-count">{count}</div>'
+             '<div class="tier-tile-label">{label}</div><div class="tier-tile-names">{names}</div></div>')
+REC_HEADSHOT = '<img src="{url}" class="rec-headshot tier-ring-{tier}" onerror="this.style.display=\'none\'">'
+CARD_SUBSCORES = [("OFFENSE", "offensive"), ("DEFENSE", "defensive"), ("POSSESSION", "possession"),
+                  ("EFFICIENCY", "efficiency"), ("DISCIPLINE", "discipline")]
+
+
+@perf.track_cache("card_html", st.cache_resource)
+def card_html(digest, name, role, _data, _ci):
+    """(header, footer) HTML of one player card; keyed on the score digest, so it's rebuilt only with the data."""
+    p, s = _data["player"], _data["scores"]
+    i = _data.i
+    odds = " · ".join(f"T{k + 1} {prob:.0%}" for k, prob in enumerate(_ci["tier_prob"][i]) if prob >= 0.01)
+    url = HEADSHOT_URLS.get(name, "")
+    stats = "".join(STAT_BOX.format(val=s[key], label=label,
+                                    band="high" if s[key] >= 65 else "mid" if s[key] >= 40 else "low")
+                    for label, key in CARD_SUBSCORES)
+    head = CARD_HEAD.format(photo=CARD_PHOTO.format(url=url) if url else CARD_PHOTO_NUM.format(num=p["num"]),
+                            num=p["num"], name=name, pos=p["pos"], yr=p["yr"], gp=p["gp"], gs=p["gs"],
+                            tier=_data["tier_num"], tier_text=f"TIER {_data['tier_num']} · {_data['tier_label'].upper()}",
+                            role=ROLE_BADGE.format(role=role) if role else "", overall=s["overall"], stats=stats, odds=f"Tier odds · {odds}",
+                            level=_ci["level"], lo=_ci["lo"]["overall"][i], hi=_ci["hi"]["overall"][i])
+    flags = "".join(FLAG_TAG.format(kind=kind, name=fname) for fname, kind in _data["flags"])
+    foot = CARD_FOOT.format(flags=FLAG_ROW.format(tags=flags) if flags else "", notes=_data["notes"],
+                            recs=REC_BOX.format(body="<br>".join(_data["recs"][:2])) if _data["recs"] else "")
+    return head, foot
 
 
 # ═══════════════════════════════════════════════
@@ -627,8 +457,48 @@ PLOTLY_LAYOUT = dict(
     font=dict(family="DM Sans", color=UVA_BLUE),
     margin=dict(l=30, r=30, t=40, b=30),
 )
-
-
+# Team charts change representation past these sizes (league pools); env overrides for tuning
+WEBGL_MIN_POINTS = int(os.environ.get("WLAX_WEBGL_MIN_POINTS", 200))     # SVG + labels below, WebGL above
+HEXBIN_MIN_POINTS = int(os.environ.get("WLAX_HEXBIN_MIN_POINTS", 2000))  # server-side hexbin density above
+HEATMAP_PAGE_ROWS = int(os.environ.get("WLAX_HEATMAP_PAGE_ROWS", 60))    # full heatmap up to this many rows
+HEXBIN_GRID = 40
+HEATMAP_COLORS = [[0, "#FCE4EC"], [0.35, "#FFF8E1"], [0.6, "#E8F5E9"], [1, UVA_GREEN]]
+HEATMAP_COLUMNS = ["Overall", "Offense", "Defense", "Possession", "Efficiency", "Discipline"]
+
+
+def show_chart(fig, name, **kwargs):
+    """st.plotly_chart with serialization timing (and payload size when diagnostics are on)."""
+    if DIAGNOSTICS:
+        with perf.stage("figure_to_json"):
+            perf.record_payload(name, len(fig.to_json()))
+    with perf.stage("plotly_chart"):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def hexbin(x, y, gridsize=HEXBIN_GRID):
+    """Hexagonal binning on the server: (bin per point, center x, center y, count per bin).
+
+    Points go to the nearer of two offset rectangular lattices, which together
+    form a hex grid (the matplotlib hexbin construction).
+    """
+    x0, y0 = x.min(), y.min()
+    sx = (x.max() - x0) / gridsize or 1.0
+    ny = max(int(gridsize / math.sqrt(3)), 1)
+    sy = (y.max() - y0) / ny or 1.0
+    ix, iy = (x - x0) / sx, (y - y0) / sy
+    ix1, iy1 = np.rint(ix), np.rint(iy)
+    ix2, iy2 = np.floor(ix), np.floor(iy)
+    first = (ix - ix1) ** 2 + 3 * (iy - iy1) ** 2 < (ix - ix2 - 0.5) ** 2 + 3 * (iy - iy2 - 0.5) ** 2
+    cx = np.where(first, ix1, ix2 + 0.5)
+    cy = np.where(first, iy1, iy2 + 0.5)
+    key = (cx * 2).astype(np.int64) * (4 * ny + 8) + (cy * 2).astype(np.int64)
+    uniq, ids, counts = np.unique(key, return_inverse=True, return_counts=True)
+    at = np.zeros(len(uniq), dtype=np.int64)
+    at[ids] = np.arange(len(ids))
+    return ids, x0 + cx[at] * sx, y0 + cy[at] * sy, counts
+
+
+@perf.timed()
 def make_radar_chart(scores, pos, height=300):
     if pos == "A":
         cats = ["Scoring", "Efficiency", "Playmaking", "Shot Quality", "Discipline", "Possession"]
@@ -674,6 +544,7 @@ def make_radar_chart(scores, pos, height=300):
     return fig
 
 
+@perf.timed()
 def make_game_log_chart(p, games):
     game_g = p.get("game_g", [])
     game_pts = p.get("game_pts", [])
@@ -695,6 +566,25 @@ def make_game_log_chart(p, games):
     return fig
 
 
+@perf.timed()
+def make_load_chart(acute, acwr, game_pts):
+    """Acute load in the week before each game (bars) against points in that game (line)."""
+    labels = [f"G{i+1}" for i in range(len(game_pts))]
+    risky = [a > 1.5 for a in acwr]
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Bar(x=labels, y=acute, name="7-day load",
+        marker_color=[UVA_MAGENTA if r else UVA_BLUE_25 for r in risky],
+        customdata=acwr, hovertemplate="load %{y:.0f}<br>ACWR %{customdata:.2f}<extra></extra>"))
+    fig.add_trace(go.Scatter(x=labels, y=game_pts, name="Points", mode="lines+markers",
+        line=dict(color=UVA_ORANGE, width=2.5), marker=dict(size=7)), secondary_y=True)
+    fig.update_layout(**PLOTLY_LAYOUT, height=240,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, font=dict(size=10)))
+    fig.update_yaxes(gridcolor=MED_GRAY, title_text="PlayerLoad", secondary_y=False)
+    fig.update_yaxes(showgrid=False, title_text="Points", secondary_y=True)
+    return fig
+
+
+@perf.timed()
 def make_shot_efficiency_bar(p):
     cats = ["Shots", "SOG", "Goals"]
     vals = [p["sh"], p.get("sog", 0), p["g"]]
@@ -710,6 +600,45 @@ def make_shot_efficiency_bar(p):
     return fig
 
 
+@perf.timed()
+def make_score_waterfall(contrib):
+    """Overall impact score as a waterfall of its stored per-term contributions (contrib: C × 2 row)."""
+    total = np.asarray(contrib[:, 1])
+    keep = np.flatnonzero(np.abs(total) >= 0.05)
+    keep = keep[np.argsort(-total[keep])]
+    labels = [f"{engine.CONTRIB_TERMS[j][2]} ({engine.CONTRIB_TERMS[j][0][:3]})" for j in keep]
+    fig = go.Figure(go.Waterfall(orientation="h", y=labels + ["Impact Score"],
+        x=[float(total[j]) for j in keep] + [float(total.sum())],
+        measure=["relative"] * len(keep) + ["total"],
+        text=[f"{total[j]:+.1f}" for j in keep] + [f"{total.sum():.0f}"], textposition="outside",
+        increasing=dict(marker=dict(color=UVA_CYAN)), decreasing=dict(marker=dict(color=UVA_MAGENTA)),
+        totals=dict(marker=dict(color=UVA_ORANGE)), connector=dict(line=dict(color=MED_GRAY, width=1))))
+    fig.update_layout(**PLOTLY_LAYOUT, height=90 + 24 * len(keep),
+        yaxis=dict(autorange="reversed", tickfont=dict(size=11, color=TEXT_GRAY)), xaxis=dict(title="points"))
+    return fig
+
+
+@perf.timed()
+def make_shot_heatmap(attempts, made, role):
+    """Field heat map: cell colour is shooting % (shooter) or save % (goalie), text is attempts."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(attempts > 0, made / attempts * 100, np.nan)
+    xc = (shotmap.X_EDGES[:-1] + shotmap.X_EDGES[1:]) / 2
+    yc = (shotmap.Y_EDGES[:-1] + shotmap.Y_EDGES[1:]) / 2
+    scale = [[0, "#FCE4EC"], [0.5, "#FFF8E1"], [1, UVA_GREEN]]
+    fig = go.Figure(go.Heatmap(z=rate, x=xc, y=yc, zmin=0, zmax=100, colorscale=scale,
+        text=np.where(attempts > 0, attempts.astype(int).astype(str), ""), texttemplate="%{text}",
+        hovertemplate=("SH%" if role == "shooter" else "SV%") + " %{z:.0f}<br>attempts %{text}<extra></extra>",
+        colorbar=dict(title="SH%" if role == "shooter" else "SV%", thickness=10)))
+    for r in (8, 12):
+        fig.add_shape(type="circle", x0=-r, x1=r, y0=-r, y1=r, line=dict(color=UVA_BLUE, width=1, dash="dot"))
+    fig.update_layout(**PLOTLY_LAYOUT, height=300,
+        xaxis=dict(range=[shotmap.X_EDGES[0], shotmap.X_EDGES[-1]], title=None, zeroline=False),
+        yaxis=dict(range=[shotmap.Y_EDGES[0], shotmap.Y_EDGES[-1]], title="m from goal", scaleanchor="x"))
+    return fig
+
+
+@perf.timed()
 def make_percentile_bars(scores, pos):
     """Horizontal percentile bars for impact categories."""
     cats = ["Offense", "Defense", "Possession", "Efficiency", "Discipline"]
@@ -736,6 +665,7 @@ def make_percentile_bars(scores, pos):
     return fig
 
 
+@perf.timed()
 def make_rolling_avg_chart(p):
     """Rolling average trend for goals."""
     game_g = p.get("game_g", [])
@@ -755,18 +685,25 @@ def make_rolling_avg_chart(p):
     return fig
 
 
-def make_cumulative_points_chart(all_data, top_n=6):
+def top_rows(values, mask=None, k=None):
+    """Rows ordered by `values` descending (ties keep roster order), optionally masked and cut to k."""
+    rows = np.flatnonzero(mask) if mask is not None else np.arange(len(values))
+    return rows[np.argsort(-values[rows], kind="stable")][:k]
+
+
+@perf.timed()
+def make_cumulative_points_chart(table, top_n=6):
     """Cumulative points stacked area chart."""
-    top_scorers = sorted([(n, d) for n, d in all_data.items() if d["player"]["pts"] >= 3],
-                         key=lambda x: x[1]["player"]["pts"], reverse=True)[:top_n]
-    if not top_scorers: return None
+    pts = table.stats["pts"]
+    top_scorers = top_rows(pts, pts >= 3, top_n)
+    if not len(top_scorers): return None
     colors = [UVA_ORANGE, UVA_BLUE, UVA_CYAN, UVA_GREEN, UVA_MAGENTA, UVA_YELLOW]
+    game_pts = table.log("game_pts")
     fig = go.Figure()
-    for idx, (name, data) in enumerate(top_scorers):
-        game_pts = data["player"]["game_pts"]
-        cum = np.cumsum(game_pts).tolist()
-        labels = [f"G{i+1}" for i in range(len(game_pts))]
-        fig.add_trace(go.Scatter(x=labels, y=cum, name=name, mode="lines+markers",
+    for idx, i in enumerate(top_scorers):
+        cum = np.cumsum(game_pts[i, :table.n_games[i]]).tolist()
+        labels = [f"G{g+1}" for g in range(len(cum))]
+        fig.add_trace(go.Scatter(x=labels, y=cum, name=table.names[i], mode="lines+markers",
             line=dict(width=2.5, color=colors[idx % len(colors)]),
             marker=dict(size=5)))
     fig.update_layout(**PLOTLY_LAYOUT, height=350,
@@ -776,26 +713,70 @@ def make_cumulative_points_chart(all_data, top_n=6):
     return fig
 
 
-def make_usage_efficiency_chart(all_data):
-    """Usage vs Efficiency quadrant plot."""
-    scatter_data = []
-    for name, data in all_data.items():
-        p = data["player"]
-        if p["gp"] >= 2 and p["sh"] >= 3:
-            scatter_data.append({
-                "name": name, "pos": p["pos"],
-                "shots_per_game": p["sh"] / p["gp"],
-                "shooting_pct": p["sh_pct"],
-                "points": p["pts"],
-                "tier": data["tier_num"],
-            })
-    if not scatter_data: return None
-    df = pd.DataFrame(scatter_data)
-    color_map = {"A": UVA_ORANGE, "M": UVA_BLUE, "D": UVA_GREEN, "GK": TEXT_GRAY}
-    fig = px.scatter(df, x="shots_per_game", y="shooting_pct", size="points",
-        color="pos", text="name", color_discrete_map=color_map,
-        labels={"shots_per_game": "Shots / Game (Usage)", "shooting_pct": "Shooting % (Efficiency)", "pos": "Position"})
-    fig.update_traces(textposition="top center", textfont_size=10)
+@perf.timed()
+def make_score_timeline_chart(timeline, table, names, profile=None):
+    """Impact score after each game, with the profile's tier bands behind the lines."""
+    if not names: return None
+    colors = [UVA_ORANGE, UVA_BLUE, UVA_CYAN, UVA_GREEN, UVA_MAGENTA, UVA_YELLOW]
+    overall = timeline["scores"]["overall"]
+    labels = [f"G{i+1}" for i in range(overall.shape[1])]
+    fig = go.Figure()
+    cuts = list((profile or engine.DEFAULT_COMPILED)["tiers"])
+    for lo, hi, t in zip(cuts, [100] + cuts[:-1], (1, 2, 3)):
+        fig.add_hrect(y0=lo, y1=hi, fillcolor=TIER_COLORS[t], opacity=0.07, line_width=0)
+    # Every team cutoff: past a player's last game her totals carry forward, so the line ends on the card score
+    for idx, name in enumerate(names):
+        i = table.index[name]
+        fig.add_trace(go.Scatter(x=labels, y=overall[i], name=name, mode="lines+markers",
+            line=dict(width=2.5, color=colors[idx % len(colors)]), marker=dict(size=6),
+            customdata=np.column_stack([timeline["tier"][i], timeline["played"][i]]),
+            hovertemplate="%{x}: %{y:.0f} (Tier %{customdata[0]}, %{customdata[1]} GP)"))
+    fig.update_layout(**PLOTLY_LAYOUT, height=350,
+        legend=dict(font=dict(size=10)),
+        yaxis=dict(gridcolor=MED_GRAY, title="Impact Score", range=[0, 100]),
+        xaxis=dict(title=None))
+    return fig
+
+
+def usage_points(table):
+    """Rows on the usage/efficiency chart (2+ GP, 3+ shots) with their shots/game, SH% and points."""
+    c = table.col
+    rows = np.flatnonzero((c("gp") >= 2) & (c("sh") >= 3))
+    return rows, c("sh")[rows] / c("gp")[rows], c("sh_pct")[rows], c("pts")[rows]
+
+
+@perf.timed()
+def make_usage_efficiency_chart(table):
+    """Usage vs Efficiency quadrant plot.
+
+    Labelled SVG markers for a roster, unlabelled WebGL markers from
+    WEBGL_MIN_POINTS players, and from HEXBIN_MIN_POINTS a server-side hexbin
+    density (one marker per hex; selecting hexes lists their players).
+    """
+    rows, x, y, pts = usage_points(table)
+    if not len(rows): return None
+    names = np.asarray(table.names, dtype=object)[rows]
+    if len(rows) >= HEXBIN_MIN_POINTS:
+        ids, cx, cy, counts = hexbin(x, y)
+        order = np.lexsort((-pts, ids))
+        top = order[np.r_[True, ids[order][1:] != ids[order][:-1]]]     # best scorer per hex, in hex order
+        fig = go.Figure(go.Scattergl(x=cx, y=cy, mode="markers", customdata=np.arange(len(cx)), text=names[top],
+            marker=dict(symbol="hexagon", size=14, color=counts, line_width=0,
+                        colorscale=[[0, UVA_ORANGE_25], [1, CAV_ORANGE]], colorbar=dict(title="Players")),
+            hovertemplate="%{marker.color} players · top scorer %{text}<extra></extra>"))
+        fig.update_layout(xaxis_title="Shots / Game (Usage)", yaxis_title="Shooting % (Efficiency)")
+    else:
+        color_map = {"A": UVA_ORANGE, "M": UVA_BLUE, "D": UVA_GREEN, "GK": TEXT_GRAY}
+        df = pd.DataFrame({"name": names, "pos": np.asarray(table.vocab["pos"])[table.stats["pos"][rows]],
+                           "shots_per_game": x, "shooting_pct": y, "points": pts})
+        webgl = len(rows) >= WEBGL_MIN_POINTS
+        fig = px.scatter(df, x="shots_per_game", y="shooting_pct", size="points",
+            color="pos", text=None if webgl else "name", hover_name="name", color_discrete_map=color_map,
+            render_mode="webgl" if webgl else "svg",
+            labels={"shots_per_game": "Shots / Game (Usage)", "shooting_pct": "Shooting % (Efficiency)", "pos": "Position"})
+        if not webgl:
+            fig.update_traces(textposition="top center", textfont_size=10)
+    df = pd.DataFrame({"shots_per_game": x, "shooting_pct": y})
 
     med_x = df["shots_per_game"].median()
     med_y = df["shooting_pct"].median()
@@ -816,22 +797,41 @@ def make_usage_efficiency_chart(all_data):
     return fig
 
 
-def make_draw_control_chart(all_data):
-    """Draw control analysis for top draw takers."""
-    dc_players = sorted([(n, d) for n, d in all_data.items() if d["player"]["dc"] >= 1],
-                        key=lambda x: x[1]["player"]["dc"], reverse=True)[:6]
-    if not dc_players: return None
-    names = [f"#{d['player']['num']} {n}" for n, d in dc_players]
-    dcs = [d["player"]["dc"] for _, d in dc_players]
-    colors = [UVA_ORANGE if d["player"]["dc"] >= 5 else UVA_BLUE_25 for _, d in dc_players]
+@perf.timed()
+def make_roster_heatmap(z, labels, cell_text=True):
+    """Players × score heatmap; `cell_text` prints each value (only sensible for a page of rows)."""
+    fig = go.Figure(go.Heatmap(z=z, x=HEATMAP_COLUMNS, y=labels, colorscale=HEATMAP_COLORS, showscale=False,
+        text=np.vectorize(lambda v: f"{v:.0f}")(z) if cell_text else None,
+        texttemplate="%{text}" if cell_text else None, textfont=dict(size=11, color=UVA_BLUE)))
+    fig.update_layout(**PLOTLY_LAYOUT, height=max(400, len(labels)*35+80) if cell_text else 600,
+        yaxis=dict(autorange="reversed", tickfont=dict(size=10)),
+        xaxis=dict(side="top", tickfont=dict(size=11)))
+    return fig
 
-    fig = go.Figure()
+
+@perf.timed()
+def make_draw_control_chart(table, value_added=None):
+    """Draw control analysis for top draw takers; `value_added` (possession model) adds each one's xG added."""
+    dc = table.stats["dc"]
+    dc_players = top_rows(dc, dc >= 1, 6)
+    if not len(dc_players): return None
+    names = [f"#{table.stats['num'][i]} {table.names[i]}" for i in dc_players]
+    dcs = dc[dc_players].tolist()
+    colors = [UVA_ORANGE if d >= 5 else UVA_BLUE_25 for d in dcs]
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(go.Bar(x=names, y=dcs, marker_color=colors,
         text=[str(d) for d in dcs], textposition="outside",
-        textfont=dict(size=12, color=UVA_BLUE)))
-    fig.update_layout(**PLOTLY_LAYOUT, height=300,
-        yaxis=dict(gridcolor=MED_GRAY, title="Draw Controls"),
+        textfont=dict(size=12, color=UVA_BLUE), name="Draw Controls", showlegend=False))
+    if value_added is not None:
+        va = [float(value_added["value_added"].get(table.names[i], 0.0)) for i in dc_players]
+        fig.add_trace(go.Scatter(x=names, y=va, mode="markers+text", name="xG added (possession model)",
+            marker=dict(size=12, color=UVA_CYAN, symbol="diamond"), text=[f"{v:+.1f}" for v in va],
+            textposition="top center", textfont=dict(size=11, color=UVA_CYAN)), secondary_y=True)
+        fig.update_yaxes(title_text="xG Added", showgrid=False, secondary_y=True)
+    fig.update_layout(**PLOTLY_LAYOUT, height=300, legend=dict(orientation="h", y=1.12),
         xaxis=dict(tickfont=dict(size=10)))
+    fig.update_yaxes(gridcolor=MED_GRAY, title_text="Draw Controls", secondary_y=False)
     return fig
 
 
@@ -839,30 +839,178 @@ def make_draw_control_chart(all_data):
 # MAIN APP
 # ═══════════════════════════════════════════════
 
-players, games, game_results = load_data()
-
-# Compute team averages
-team_avg = {}
-active = {k: v for k, v in players.items() if v["gp"] >= 2}
-team_avg["max_gpg"] = max(v["g"]/v["gp"] for v in active.values())
-team_avg["max_ppg"] = max(v["pts"]/v["gp"] for v in active.values())
-team_avg["max_apg"] = max(v["a"]/v["gp"] for v in active.values())
-team_avg["max_ctpg"] = max(v["ct"]/v["gp"] for v in active.values())
-team_avg["max_gbpg"] = max(v["gb"]/v["gp"] for v in active.values())
-team_avg["max_dcpg"] = max(v["dc"]/v["gp"] for v in active.values())
-team_avg["max_poss_impact"] = max(v["gb"]+v["dc"]+v["ct"]-v["to"] for v in active.values())
-
-# Compute all player data
-all_data = {}
-for name, p in players.items():
-    m = compute_advanced_metrics(p)
-    s = compute_impact_scores(p, m, team_avg)
-    flags = get_development_flags(p, m, s)
-    tier_num, tier_label = get_tier(s, p)
-    notes = generate_coaching_notes(name, p, m, s, tier_num, flags)
-    recs = generate_recommendations(name, p, m, s, tier_num, flags)
-    all_data[name] = {"player": p, "metrics": m, "scores": s, "flags": flags,
-                      "tier_num": tier_num, "tier_label": tier_label, "notes": notes, "recs": recs}
+@perf.track_cache("load_data", st.cache_data)
+def load_data():
+    players, games, game_results, violations, quarantined = engine.load_clean_data()
+    return players, games, game_results, violations, quarantined, store.content_hash(players, games, game_results)
+
+
+@perf.track_cache("analysis", st.cache_resource)
+def load_analysis(digest, _players, _games, _game_results, _finishing=None, _profile=None):
+    """One (team_avg, PlayerTable) per process and scoring profile, mapped from the on-disk snapshot when it exists."""
+    return store.load_or_build(digest, _players, _games, _game_results, finishing=_finishing, profile=_profile)
+
+
+@perf.track_cache("version_columns", st.cache_resource)
+def load_version_columns(digest):
+    """Diff columns of one logged version, mapped from its snapshot (None if it's been deleted)."""
+    return changes.snapshot_columns(digest)
+
+
+@perf.track_cache("shots", st.cache_resource)
+def load_shot_data(path, mtime):
+    """Shot events and their per-player aggregates; reloaded when the file changes."""
+    shots = shotmap.load_shots(path)
+    return (shots, shotmap.aggregate_shots(shots)) if shots else (None, None)
+
+
+@perf.track_cache("xg", st.cache_resource)
+def load_xg(shots_digest, model_mtime, _shots):
+    """Batch-scored xG roll-up and per-player finishing, once per (shot data, model) version."""
+    return xg.season_finishing(_shots)
+
+
+players, games, game_results, violations, quarantined, data_digest = load_data()
+perf.count("players", len(players))
+perf.count("games", len(games))
+shot_path = shotmap.SHOTS_PATH
+shots, shot_agg = load_shot_data(shot_path, os.path.getmtime(shot_path) if os.path.exists(shot_path) else 0)
+model_path = xg.MODEL_PATH
+finishing, xg_roll = load_xg(shots["digest"] if shots else "",
+                             os.path.getmtime(model_path) if os.path.exists(model_path) else 0, shots)
+if finishing:
+    data_digest = store.content_hash(players, games, game_results, finishing)
+# Scoring profiles hot-reload from their file; results that depend on scores key on
+# score_digest, so switching or editing a profile leaves the others' caches alone.
+scoring_profiles, profile_error = profiles.get_profiles()
+profile_name = st.session_state.get("scoring_profile", profiles.DEFAULT_NAME)
+profile = scoring_profiles.get(profile_name, scoring_profiles[profiles.DEFAULT_NAME])
+score_digest = (data_digest if profile is engine.DEFAULT_COMPILED else
+                store.content_hash(players, games, game_results, finishing, profile["digest"]))
+team_avg, table = load_analysis(score_digest, players, games, game_results, finishing, profile)
+all_data = table.entries
+
+
+@perf.track_cache("bootstrap", st.cache_resource)
+def load_bootstrap(digest, _table, _team_avg, _profile=None):
+    """Score intervals and tier probabilities per scoring version (about a second for 10k resamples)."""
+    return bootstrap.bootstrap(_table, _team_avg, profile=_profile)
+
+
+@perf.track_cache("timeline", st.cache_resource)
+def load_timeline(digest, _table, _profile=None):
+    """(timeline, problem): `problem` is check_timeline's message when the last cutoff disagrees with the cards."""
+    timeline = engine.compute_timeline(_table, _profile)
+    try:
+        engine.check_timeline(timeline, _table)
+    except ValueError as exc:
+        perf.count("timeline_mismatch")
+        return timeline, str(exc)
+    return timeline, None
+
+
+@perf.track_cache("roles", st.cache_resource)
+def load_roles(digest, model_mtime, _table):
+    """Archetype per player from the offline league model; None until `python wlax_roles.py fit` has run."""
+    model = roles.load_model()
+    if model is None:
+        return None
+    return dict(zip(_table.names, roles.assign_roles(model, _table)["role"]))
+
+
+@perf.track_cache("projections", st.cache_resource)
+def load_projections(digest, model_mtime, _table):
+    """Next-game projections, one batched inference per data/model version; None until a model is trained."""
+    model = projections.load_model()
+    return projections.project(model, _table) if model is not None else None
+
+
+@perf.track_cache("schedule_adjusted", st.cache_resource)
+def load_schedule_adjusted(digest, _table, _games, _profile=None):
+    """League strength fit plus schedule-adjusted scores; the league file is read via WLAX_LEAGUE_RESULTS."""
+    model = opponents.fit_strengths(opponents.load_league_results(_games))
+    return opponents.strength_table(model), opponents.adjusted_scores(_table, _games, model, _profile)
+
+
+@perf.track_cache("shot_heatmap", st.cache_data)
+def shot_heatmap(shots_digest, name, role, _shots, _agg):
+    """One heat map per (shot data version, player, role)."""
+    i = _shots[f"{role}_index"][name]
+    grids = _agg[role]
+    attempts, made = (grids["shots"], grids["goals"]) if role == "shooter" else (grids["faced"], grids["saves"])
+    return make_shot_heatmap(attempts[i], made[i], role)
+
+
+@perf.track_cache("opponent_roster", st.cache_resource)
+def load_opponent(raw):
+    """Opponent roster JSON bytes → (team_avg, PlayerTable), scored by the same engine."""
+    return opponents.load_opponent_roster(json.loads(raw))
+
+
+@perf.track_cache("possessions", st.cache_resource)
+def load_possessions(path, mtime, model_mtime):
+    """State values from the league possession model (or a fit on our play-by-play), plus our value added."""
+    pbp = possessions.load_pbp(path)
+    model = possessions.load_model() or (possessions.fit_model(pbp) if pbp else None)
+    if model is None:
+        return None
+    values = possessions.state_values(model)
+    return {"values": values, "value_added": possessions.value_added(pbp, values) if pbp else None,
+            "summary": possessions.team_summary(pbp, values) if pbp else None}
+
+
+@perf.track_cache("search_index", st.cache_resource)
+def load_search_index(digest, _table):
+    """Picker search index over names, numbers, positions and team, once per data version."""
+    pos = np.asarray(_table.vocab["pos"])[_table.stats["pos"]]
+    return search.build_index(_table.names, _table.stats["num"], pos, team=opponents.TEAM_NAME)
+
+
+def player_label(i):
+    return f"#{table.stats['num'][i]} {table.names[i]} ({table.vocab['pos'][table.stats['pos'][i]]})"
+
+
+def player_picker(label, key, allowed=None, default=None, rank=None, multi=False):
+    """Search box plus a picker holding only the top matches and the current pick(s); returns names.
+
+    Options are row ids, so the widget payload is k labels however many
+    players are eligible.
+    """
+    query = st.text_input(f"Search {label}", key=f"{key}_q", placeholder="Name, #, position…",
+                          label_visibility="collapsed")
+    rank = table.scores["overall"] if rank is None else rank
+    ids = search.search(search_index, query, allowed=allowed, rank=rank)
+    if multi:
+        current = st.session_state.get(key, [])
+        options = current + [i for i in ids if i not in current]
+        picked = st.multiselect(label, options, format_func=player_label, key=key)
+        return [table.names[i] for i in picked]
+    current = st.session_state.get(key, default)
+    options = ([current] if current is not None else []) + [i for i in ids if i != current]
+    if not options:
+        st.caption("No players match.")
+        return None
+    picked = st.selectbox(label, options, index=0, format_func=player_label, key=key)
+    return table.names[picked]
+
+
+@perf.track_cache("workload", st.cache_resource)
+def load_workload(digest, sessions_mtime, dates_mtime, _table, _games):
+    """Per-game acute/chronic load and ACWR for the roster, or None before any sessions are ingested."""
+    sessions = workload.load_sessions()
+    if not len(sessions):
+        return None
+    return workload.game_load(sessions, _table.names, workload.load_game_dates(_games))
+
+
+player_roles = load_roles(data_digest, os.path.getmtime(roles.MODEL_PATH) if os.path.exists(roles.MODEL_PATH) else 0, table)
+proj = load_projections(data_digest, os.path.getmtime(projections.MODEL_PATH)
+                        if os.path.exists(projections.MODEL_PATH) else 0, table)
+PROJ_STATS = [("G", "g"), ("A", "a"), ("DC", "dc"), ("TO", "to")]
+NO_PROJECTIONS = "No projection model trained — run `python wlax_projections.py train` to project the next game."
+search_index = load_search_index(data_digest, table)
+loads = load_workload(data_digest, *(os.path.getmtime(f) if f and os.path.exists(f) else 0
+                                     for f in (workload.SESSIONS_PATH, workload.GAME_DATES_PATH)), table, games)
 
 # ─── HEADER ───
 st.markdown("""
@@ -877,7 +1025,8 @@ st.markdown("""
 # ─── SIDEBAR ───
 with st.sidebar:
     st.markdown("### ⚔️ Navigation")
-    view_mode = st.radio("View", ["📋 Player Cards", "📊 Team Overview", "🔬 Comparison", "🎯 Recommendations", "🏆 Draw Control Center"],
+    view_mode = st.radio("View", ["📋 Player Cards", "📊 Team Overview", "🔬 Comparison", "🎯 Recommendations",
+                                  "🏆 Draw Control Center", "📰 Change Feed"],
                          label_visibility="collapsed")
     st.markdown("---")
     st.markdown("### Filters")
@@ -885,7 +1034,18 @@ with st.sidebar:
     tier_filter = st.multiselect("Tier", [1, 2, 3, 4], default=[1, 2, 3, 4],
         format_func=lambda x: {1:"Tier 1: Driver", 2:"Tier 2: Amplifier", 3:"Tier 3: Specialist", 4:"Tier 4: Dev"}[x])
     min_gp = st.slider("Min Games Played", 1, 5, 1)
+    if len(scoring_profiles) > 1:
+        st.selectbox("Scoring profile", list(scoring_profiles), key="scoring_profile",
+                     help=f"Profiles are read from {os.path.basename(profiles.PROFILES_PATH)} and reload when it changes.")
+    if profile_error:
+        st.error(f"Scoring profiles not reloaded: {profile_error}")
     st.markdown("---")
+    if quarantined:
+        st.warning(f"{len(quarantined)} player row(s) quarantined: {', '.join(quarantined)}")
+    if len(violations):
+        with st.expander(f"🧪 Data Quality ({len(violations)} issues)"):
+            st.dataframe(violations[["name", "check", "severity", "expected", "actual"]].round(2),
+                         use_container_width=True, hide_index=True)
     with st.expander("📐 Formula Reference"):
         st.markdown("""
         **Pts/Shot** = PTS / SH  
@@ -895,57 +1055,163 @@ with st.sidebar:
         **Clutch** = Avg G(wins) / Avg G(losses)
         """)
 
-# Filter players
-filtered = {k: v for k, v in all_data.items()
-            if v["player"]["pos"] in pos_filter
-            and v["tier_num"] in tier_filter
-            and v["player"]["gp"] >= min_gp}
-sorted_players = sorted(filtered.items(), key=lambda x: x[1]["scores"]["overall"], reverse=True)
+# Filter and sort on the table's columns; entries are looked up only for the rows a view renders
+pos_codes = [c for c, pos in enumerate(table.vocab["pos"]) if pos in pos_filter]
+keep = np.isin(table.stats["pos"], pos_codes) & np.isin(table.tier, tier_filter) & (table.stats["gp"] >= min_gp)
+sorted_rows = np.flatnonzero(keep)
+sorted_rows = sorted_rows[np.argsort(-table.scores["overall"][sorted_rows], kind="stable")]
+perf.current()["label"] = view_mode
+perf.count("filtered_players", len(sorted_rows))
+
+
+def row_entries(rows):
+    """(name, all_data entry) for each table row, in order."""
+    return [(table.names[i], all_data[table.names[i]]) for i in rows]
+
+_view_t = perf.begin(f"view:{view_mode}")
+
+
+# ═══════════════════════════════════════════════
+# FRAGMENTS
+# ═══════════════════════════════════════════════
+# Interactive sections that rerun on their own: a widget change inside one
+# re-executes just that function against the cached data above, without the
+# CSS, sidebar or other views.
+
+@st.fragment
+def comparison_panel(allowed, defaults):
+    """Player pickers and everything under them; changing a pick reruns only this fragment."""
+    perf.count("fragment:comparison")
+    c1, c2 = st.columns(2)
+    with c1: p1_name = player_picker("Player 1", "cmp_p1", allowed, defaults[0])
+    with c2: p2_name = player_picker("Player 2", "cmp_p2", allowed, defaults[1])
+    if p1_name is None or p2_name is None:
+        return
+    d1, d2 = all_data[p1_name], all_data[p2_name]
+
+    # Determine shared radar dimensions (use same categories for both)
+    shared_cats = ["Offense", "Defense", "Possession", "Efficiency", "Discipline"]
+    shared_keys = ["offensive", "defensive", "possession", "efficiency", "discipline"]
+
+    # Side by side with headshots and matching radars
+    rc1, rc2 = st.columns(2)
+    for col, pname, pdata, color in [(rc1, p1_name, d1, UVA_ORANGE), (rc2, p2_name, d2, UVA_BLUE)]:
+        with col:
+            # Headshot + name
+            img_url = HEADSHOT_URLS.get(pname, "")
+            hdr = f'<div style="text-align:center;">'
+            if img_url:
+                hdr += f'<img src="{img_url}" style="width:90px;height:90px;border-radius:50%;object-fit:cover;border:3px solid {color};margin-bottom:8px;" onerror="this.style.display=\'none\'">'
+            hdr += f'<h3 style="color:{color} !important;margin:0;">{pname}</h3>'
+            hdr += f'<p style="color:{TEXT_GRAY};font-size:0.85rem;">#{pdata["player"]["num"]} · {pdata["player"]["pos"]} · {pdata["player"]["yr"]} · Impact: {pdata["scores"]["overall"]:.0f}</p></div>'
+            st.markdown(hdr, unsafe_allow_html=True)
+
+            # Unified radar
+            vals = [pdata["scores"][k] for k in shared_keys]
+            vals = [max(0, min(v, 100)) for v in vals]
+            vals.append(vals[0])
+            cats_closed = shared_cats + [shared_cats[0]]
+            fig = go.Figure()
+            fig.add_trace(go.Scatterpolar(r=vals, theta=cats_closed, fill='toself',
+                fillcolor=f'rgba({",".join(str(int(color[i:i+2], 16)) for i in (1,3,5))},0.15)',
+                line=dict(color=color, width=2.5), marker=dict(size=6, color=color)))
+            fig.update_layout(**PLOTLY_LAYOUT, polar=dict(bgcolor="rgba(0,0,0,0)",
+                radialaxis=dict(visible=True, range=[0, 100], showticklabels=False, gridcolor=MED_GRAY),
+                angularaxis=dict(gridcolor=MED_GRAY, tickfont=dict(size=10, color=TEXT_GRAY))),
+                showlegend=False, height=280)
+            show_chart(fig, "comparison_radar", use_container_width=True, key=f"cmp_r_{pname}")
+
+    # Comparison bar chart
+    v1 = [d1["scores"][k] for k in shared_keys]
+    v2 = [d2["scores"][k] for k in shared_keys]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=shared_cats, y=v1, name=p1_name, marker_color=UVA_ORANGE))
+    fig.add_trace(go.Bar(x=shared_cats, y=v2, name=p2_name, marker_color=UVA_BLUE))
+    fig.update_layout(**PLOTLY_LAYOUT, height=320, barmode="group",
+        yaxis=dict(gridcolor=MED_GRAY, range=[0, 100]),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02))
+    show_chart(fig, "comparison_bars", use_container_width=True)
+
+    # Stats table
+    st.markdown("### Raw Stats Comparison")
+    stat_keys = ["gp", "g", "a", "pts", "sh", "sh_pct", "sog_pct", "gb", "dc", "to", "ct"]
+    stat_labels = ["GP", "Goals", "Assists", "Points", "Shots", "SH%", "SOG%", "GB", "DC", "TO", "CT"]
+    comp_df = pd.DataFrame({
+        "Stat": stat_labels,
+        p1_name: [d1["player"].get(k, "—") for k in stat_keys],
+        p2_name: [d2["player"].get(k, "—") for k in stat_keys],
+    })
+    st.dataframe(comp_df, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def matchup_planner():
+    """Opponent upload, availability and matchups; edits rerun only this fragment."""
+    perf.count("fragment:matchup_planner")
+    opp_file = st.file_uploader("Opponent roster (JSON, same shape as our box scores)", type="json")
+    if opp_file is not None:
+        opp_avg, opp_table = load_opponent(opp_file.getvalue())
+    else:
+        st.caption("No opponent roster loaded — planning against our own attack as a scout team.")
+        opp_table = table
+    pool = np.zeros(len(table), dtype=bool)
+    pool[opponents.defender_pool(table)] = True
+    out_players = player_picker("Unavailable (carded / injured)", "unavailable", pool, multi=True)
+    matchups = opponents.assign_matchups(table, team_avg, opp_table, unavailable=out_players)
+    st.dataframe(matchups.rename(columns={"attacker": "Attacker", "attacker_gpg": "Att G/Game", "defender": "Defender",
+                                          "disruption": "Exp. Disruption", "alternate": "Alternate"}).round(2),
+                 use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def draw_deep_dive(total_dc):
+    """Deep dive on one draw taker (default: the team leader); switching players reruns only this fragment."""
+    perf.count("fragment:draw_deep_dive")
+    dc = table.col("dc")
+    takers = [table.names[i] for i in top_rows(dc, dc > 0)]
+    if not takers:
+        return
+    who = player_picker("Draw taker", "draw_taker", dc > 0, table.index[takers[0]], rank=dc) or takers[0]
+    st.markdown(f"### {who} — Draw Control Deep Dive")
+    p = all_data[who]["player"]
+    last = who.split()[-1]
+    backups = [n for n in takers if n != who][:2]
+    backup_text = " or ".join(f"{n.split()[-1]} with {dc[table.index[n]]:.0f} DCs" for n in backups)
+    g1, g2 = st.columns(2)
+    with g1:
+        st.markdown(f"""<div class="coaching-notes">
+        <strong>Draw Control Dominance:</strong> {p['dc']} draws won across {p['gp']} games = {p['dc']/p['gp']:.0f} DC/game<br>
+        She accounts for <strong>{p['dc']/max(total_dc,1)*100:.0f}%</strong> of all team draw controls.<br><br>
+        <strong>Recommendation:</strong> {last} must take every draw in competitive games. Build a secondary option
+        ({backup_text})
+        for rest in blowouts and as insurance.
+        </div>""", unsafe_allow_html=True)
+    with g2:
+        # Game-by-game rolling performance
+        fig = make_rolling_avg_chart(p)
+        if fig:
+            st.markdown("**Goals Rolling Average (3-game)**")
+            show_chart(fig, "rolling_avg", use_container_width=True)
 
 
 # ═══════════════════════════════════════════════
 # VIEW: PLAYER CARDS
 # ═══════════════════════════════════════════════
 if view_mode == "📋 Player Cards":
-    for name, data in sorted_players:
+    score_ci = load_bootstrap(score_digest, table, team_avg, profile)
+    for name, data in row_entries(sorted_rows):
         p = data["player"]
         m = data["metrics"]
         s = data["scores"]
-        flags = data["flags"]
+        head_html, foot_html = card_html(score_digest, name, player_roles and player_roles[name], data, score_ci)
 
-        tier_text = f"TIER {data['tier_num']} · {data['tier_label'].upper()}"
-
-        st.markdown('<div class="player-card">', unsafe_allow_html=True)
-
-        # Top row: headshot + name + impact score
-        top1, top2, top3 = st.columns([0.5, 3.5, 1])
-        with top1:
-            img_url = HEADSHOT_URLS.get(name, "")
-            if img_url:
-                st.markdown(f'<img src="{img_url}" class="headshot-circle" onerror="this.style.display=\'none\'">', unsafe_allow_html=True)
-            else:
-                st.markdown(f'<div style="width:80px;height:80px;border-radius:50%;background:{UVA_BLUE_25};display:flex;align-items:center;justify-content:center;font-size:1.8rem;color:{UVA_BLUE};font-family:Bebas Neue;">{p["num"]}</div>', unsafe_allow_html=True)
-        with top2:
-            st.markdown(f'<p class="player-name">#{p["num"]} {name}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="player-meta">{p["pos"]} · {p["yr"]} · {p["gp"]} GP / {p["gs"]} GS <span class="tier-badge tier-{data["tier_num"]}">{tier_text}</span></p>', unsafe_allow_html=True)
-        with top3:
-            st.markdown(f'<div class="impact-score-box"><div class="impact-score-num">{s["overall"]:.0f}</div><div class="impact-score-label">Impact Score</div></div>', unsafe_allow_html=True)
-
-        # Impact category bars
-        cat_cols = st.columns(5)
-        for col, (label, key) in zip(cat_cols, [("OFFENSE", "offensive"), ("DEFENSE", "defensive"),
-                                                 ("POSSESSION", "possession"), ("EFFICIENCY", "efficiency"), ("DISCIPLINE", "discipline")]):
-            val = s[key]
-            color = UVA_GREEN if val >= 65 else UVA_YELLOW if val >= 40 else UVA_MAGENTA
-            with col:
-                st.markdown(f'<div class="stat-box"><div class="stat-val" style="color:{color}">{val:.0f}</div><div class="stat-label">{label}</div></div>', unsafe_allow_html=True)
-
-        st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
+        # Header: headshot, name, tier/role badges, impact score and sub-score boxes in one element
+        st.markdown(head_html, unsafe_allow_html=True)
 
         # Middle: radar + stats + game log
         col_radar, col_stats, col_gamelog = st.columns([1.2, 1, 1.3])
         with col_radar:
-            st.plotly_chart(make_radar_chart(s, p["pos"]), use_container_width=True, key=f"radar_{name}")
+            show_chart(make_radar_chart(s, p["pos"]), "radar", use_container_width=True, key=f"radar_{name}")
         with col_stats:
             st.markdown("**Core Stats**")
             if p["pos"] != "GK":
@@ -971,30 +1237,67 @@ if view_mode == "📋 Player Cards":
                 a3.metric("Poss Impact", f"{m['poss_impact']:+d}"); a4.metric("Consistency", f"{m['consistency']:.2f}")
         with col_gamelog:
             st.markdown("**Game-by-Game Trend**")
-            st.plotly_chart(make_game_log_chart(p, games), use_container_width=True, key=f"gl_{name}")
+            show_chart(make_game_log_chart(p, games), "game_log", use_container_width=True, key=f"gl_{name}")
+            st.markdown("**Next Game Projection**")
+            i = table.index[name]
+            if proj is None:
+                st.caption(NO_PROJECTIONS)
+            else:
+                for pc, (label, k) in zip(st.columns(4), PROJ_STATS):
+                    pc.metric(label, f"{proj[k]['mean'][i]:.1f}", help=f"80% range {proj[k]['lo'][i]:.0f}–{proj[k]['hi'][i]:.0f}")
 
         # Shot funnel
         if p["sh"] >= 3 and p["pos"] != "GK":
             st.markdown("**Shot Funnel**")
-            st.plotly_chart(make_shot_efficiency_bar(p), use_container_width=True, key=f"sf_{name}")
-
-        # Flags
-        if flags:
-            flag_html = ""
-            for fname, ftype in flags:
-                flag_html += f'<span class="flag-tag flag-{ftype}">{fname}</span>'
-            st.markdown(f"**Development Flags** &nbsp; {flag_html}", unsafe_allow_html=True)
-
-        # Coaching notes
-        st.markdown(f'<div class="coaching-notes">{data["notes"]}</div>', unsafe_allow_html=True)
+            show_chart(make_shot_efficiency_bar(p), "shot_funnel", use_container_width=True, key=f"sf_{name}")
+
+        # Shot map (needs a shot-event file, see WLAX_SHOTS_PATH)
+        if shots is not None:
+            role = "goalie" if p["pos"] == "GK" else "shooter"
+            if name in shots[f"{role}_index"]:
+                with st.expander("📍 Shot Map" if role == "shooter" else "📍 Save Map"):
+                    hm_col, zone_col = st.columns([1.3, 1])
+                    with hm_col:
+                        show_chart(shot_heatmap(shots["digest"], name, role, shots, shot_agg), "shot_heatmap",
+                                   use_container_width=True, key=f"hm_{name}")
+                    with zone_col:
+                        if role == "shooter" and xg_roll is not None and name in xg_roll.index:
+                            r = xg_roll.loc[name]
+                            x1, x2, x3 = st.columns(3)
+                            x1.metric("xG", f"{r['xg']:.1f}"); x2.metric("G − xG", f"{r['gax']:+.1f}")
+                            x3.metric("xG/Shot", f"{r['xg_per_shot']:.2f}")
+                        zones = (shotmap.shooter_zones if role == "shooter" else shotmap.goalie_zones)(shots, shot_agg, name)
+                        st.dataframe(zones.round(1), use_container_width=True, hide_index=True)
+
+        # Training load before each game (needs ingested wearable sessions and WLAX_GAME_DATES)
+        if loads is not None:
+            i = table.index[name]
+            if not np.isnan(loads["acute"][i]).all():
+                with st.expander("🏃 Load vs Performance"):
+                    # Loads are per team game but game logs per game played (undated), so pair them only when they line up
+                    n, team_games = int(table.n_games[i]), loads["acute"].shape[1]
+                    if n == team_games:
+                        show_chart(make_load_chart(loads["acute"][i], loads["acwr"][i], p["game_pts"]),
+                                   "load_chart", use_container_width=True, key=f"load_{name}")
+                        st.caption("Bars: PlayerLoad in the 7 days before the game, magenta when the acute:chronic ratio is above 1.5.")
+                    else:
+                        st.caption(f"Game log covers {n} of {team_games} team games, so points can't be matched "
+                                   "to the load before each game.")
 
-        # Recommendations
-        if data["recs"]:
-            recs_html = "<br>".join(data["recs"][:2])
-            st.markdown(f'<div class="rec-box">{recs_html}</div>', unsafe_allow_html=True)
+        # Score breakdown, read from the contribution matrix stored with the scores
+        with st.expander("🧮 Why this score?"):
+            row = np.asarray(table.contrib[table.index[name]]).T
+            wf_col, sub_col = st.columns([1.3, 1])
+            with wf_col:
+                show_chart(make_score_waterfall(row), "score_waterfall", use_container_width=True, key=f"wf_{name}")
+            with sub_col:
+                parts = pd.DataFrame([(k.title(), label, row[j, 0]) for j, (k, _, label) in enumerate(engine.CONTRIB_TERMS)
+                                      if k in engine.SCORE_KEYS and abs(row[j, 0]) >= 0.05],
+                                     columns=["Sub-score", "Input", "Points"])
+                st.dataframe(parts.round(1), use_container_width=True, hide_index=True)
 
-        st.markdown('</div>', unsafe_allow_html=True)
-        st.markdown("")
+        # Footer: flags, coaching notes and recommendations in one element
+        st.markdown(foot_html, unsafe_allow_html=True)
 
 
 # ═══════════════════════════════════════════════
@@ -1004,63 +1307,98 @@ elif view_mode == "📊 Team Overview":
     st.markdown("## Team-Wide Impact Overview")
 
     # Tier Distribution
-    tier_counts = {1: 0, 2: 0, 3: 0, 4: 0}
-    tier_players = {1: [], 2: [], 3: [], 4: []}
-    for name, data in all_data.items():
-        t = data["tier_num"]
-        tier_counts[t] += 1
-        tier_players[t].append(name)
-
-    tc1, tc2, tc3, tc4 = st.columns(4)
-    for col, t, label, color in [(tc1, 1, "Program Drivers", CAV_ORANGE), (tc2, 2, "System Amplifiers", UVA_CYAN),
-                                  (tc3, 3, "Situational Specialists", UVA_GREEN), (tc4, 4, "Developmental", MED_GRAY)]:
-        text_col = UVA_BLUE if color == MED_GRAY else color
-        with col:
-            st.markdown(f"<div style='text-align:center;padding:1.2rem;background:{WHITE};border-radius:14px;border:2px solid {color};box-shadow:0 2px 8px rgba(0,0,0,0.05);'>"
-                       f"<div style='font-family:Bebas Neue;font-size:2.5rem;color:{text_col};'>{tier_counts[t]}</div>"
-                       f"<div style='font-size:0.72rem;color:{TEXT_GRAY};text-transform:uppercase;letter-spacing:1px;font-weight:600;'>{label}</div>"
-                       f"<div style='font-size:0.8rem;color:{UVA_BLUE};margin-top:8px;'>{'<br>'.join(tier_players[t][:5])}</div>"
-                       f"</div>", unsafe_allow_html=True)
+    tier_counts = {t: int((table.tier == t).sum()) for t in (1, 2, 3, 4)}
+    tier_players = {t: [table.names[i] for i in np.flatnonzero(table.tier == t)[:5]] for t in (1, 2, 3, 4)}
 
-    st.markdown("")
+    tiles = "".join(TIER_TILE.format(tier=t, count=tier_counts[t], label=label, names="<br>".join(tier_players[t][:5]))
+                    for t, label in [(1, "Program Drivers"), (2, "System Amplifiers"),
+                                     (3, "Situational Specialists"), (4, "Developmental")])
+    st.markdown(f'<div class="tier-tiles">{tiles}</div>', unsafe_allow_html=True)
 
     # Usage vs Efficiency quadrant
     st.markdown("### Usage vs Efficiency Matrix")
-    ue_fig = make_usage_efficiency_chart(all_data)
+    ue_fig = make_usage_efficiency_chart(table)
     if ue_fig:
-        st.plotly_chart(ue_fig, use_container_width=True)
+        ue_rows, ue_x, ue_y, ue_pts = usage_points(table)
+        if len(ue_rows) < HEXBIN_MIN_POINTS:
+            show_chart(ue_fig, "usage_efficiency", use_container_width=True)
+        else:
+            # Player details on demand: selecting hexes lists who is in them
+            event = show_chart(ue_fig, "usage_efficiency", use_container_width=True, key="ue_hexbin",
+                               on_select="rerun", selection_mode=("points", "box", "lasso"))
+            picked = [pt["customdata"] for pt in event.selection.points if "customdata" in pt]
+            if picked:
+                inside = np.isin(hexbin(ue_x, ue_y)[0], picked)
+                members = pd.DataFrame({"Player": np.asarray(table.names, dtype=object)[ue_rows[inside]],
+                                        "Shots/Game": ue_x[inside], "SH%": ue_y[inside], "Points": ue_pts[inside]})
+                st.dataframe(members.sort_values("Points", ascending=False).head(200).round(2),
+                             use_container_width=True, hide_index=True)
+            else:
+                st.caption(f"{len(ue_rows):,} players binned into hexes — click or box-select hexes to list their players.")
 
     # Cumulative Points
     st.markdown("### Cumulative Scoring Progression")
-    cum_fig = make_cumulative_points_chart(all_data)
+    cum_fig = make_cumulative_points_chart(table)
     if cum_fig:
-        st.plotly_chart(cum_fig, use_container_width=True)
+        show_chart(cum_fig, "cumulative_points", use_container_width=True)
+
+    # Impact timeline
+    st.markdown("### Impact Score Timeline")
+    timeline, timeline_problem = load_timeline(score_digest, table, profile)
+    if timeline_problem:
+        st.warning(f"Timeline check failed — {timeline_problem}. The lines may not end on the card scores.")
+    tl_fig = make_score_timeline_chart(timeline, table, [table.names[i] for i in sorted_rows[:6]], profile)
+    if tl_fig:
+        show_chart(tl_fig, "score_timeline", use_container_width=True)
+
+    # Strength of schedule
+    st.markdown("### Strength of Schedule")
+    strengths, adjusted = load_schedule_adjusted(score_digest, table, games, profile)
+    sched = [g for g in map(opponents.parse_game_label, games) if g]
+    sos_rows = [{"Opponent": g["opponent"], "Result": f"{g['team_goals']}-{g['opp_goals']}",
+                 "Off Strength": strengths["off"].get(g["opponent"], 0.0),
+                 "Def Strength": strengths["def"].get(g["opponent"], 0.0)} for g in sched]
+    adj_rows = {"Player": [table.names[i] for i in sorted_rows], "Overall": table.scores["overall"][sorted_rows],
+                "Adj Overall": adjusted["scores"]["overall"][sorted_rows],
+                "Tier": table.tier[sorted_rows], "Adj Tier": adjusted["tier"][sorted_rows]}
+    sc1, sc2 = st.columns([2, 3])
+    with sc1:
+        st.dataframe(pd.DataFrame(sos_rows).round(3), use_container_width=True, hide_index=True)
+    with sc2:
+        adj_df = pd.DataFrame(adj_rows)
+        adj_df["Δ"] = adj_df["Adj Overall"] - adj_df["Overall"]
+        st.dataframe(adj_df.round(1), use_container_width=True, hide_index=True)
 
     # Roster Heatmap
     st.markdown("### Roster Metrics Heatmap")
-    heatmap_data = []
-    heatmap_names = []
-    for name, data in sorted_players:
-        p = data["player"]
-        s = data["scores"]
-        if p["gp"] >= 2:
-            heatmap_names.append(f"#{p['num']} {name}")
-            heatmap_data.append([s["overall"], s["offensive"], s["defensive"],
-                               s["possession"], s["efficiency"], s["discipline"]])
-    if heatmap_data:
-        fig = go.Figure(go.Heatmap(
-            z=heatmap_data,
-            x=["Overall", "Offense", "Defense", "Possession", "Efficiency", "Discipline"],
-            y=heatmap_names,
-            colorscale=[[0, "#FCE4EC"], [0.35, "#FFF8E1"], [0.6, "#E8F5E9"], [1, UVA_GREEN]],
-            text=[[f"{v:.0f}" for v in row] for row in heatmap_data],
-            texttemplate="%{text}", textfont=dict(size=11, color=UVA_BLUE),
-            showscale=False,
-        ))
-        fig.update_layout(**PLOTLY_LAYOUT, height=max(400, len(heatmap_names)*35+80),
-            yaxis=dict(autorange="reversed", tickfont=dict(size=10)),
-            xaxis=dict(side="top", tickfont=dict(size=11)))
-        st.plotly_chart(fig, use_container_width=True)
+    hm_rows = sorted_rows[table.stats["gp"][sorted_rows] >= 2]
+    hm_z = np.column_stack([table.scores[k][hm_rows] for k in ["overall"] + engine.SCORE_KEYS]) if len(hm_rows) else None
+    if player_roles is None:
+        st.caption("No role model trained — run `python wlax_roles.py fit` to label archetypes.")
+    hm_label = lambda i: (f"#{table.stats['num'][i]} {table.names[i]}"
+                          + (f" · {player_roles[table.names[i]]}" if player_roles else ""))
+    if hm_z is not None and len(hm_rows) <= HEATMAP_PAGE_ROWS:
+        show_chart(make_roster_heatmap(hm_z, [hm_label(i) for i in hm_rows]), "roster_heatmap",
+                   use_container_width=True)
+    elif hm_z is not None:
+        # Overview downsampled to HEATMAP_PAGE_ROWS rank bands (band means), then one page of players in full
+        n = len(hm_rows)
+        band = np.arange(n) * HEATMAP_PAGE_ROWS // n
+        sizes = np.bincount(band)
+        means = np.column_stack([np.bincount(band, weights=hm_z[:, j]) for j in range(hm_z.shape[1])]) / sizes[:, None]
+        edges = np.r_[0, np.cumsum(sizes)]
+        show_chart(make_roster_heatmap(means, [f"Ranks {a + 1}–{b}" for a, b in zip(edges[:-1], edges[1:])],
+                                       cell_text=False), "roster_heatmap_overview", use_container_width=True)
+        pages = -(-n // HEATMAP_PAGE_ROWS)
+        page = st.number_input(f"Page (of {pages}, {HEATMAP_PAGE_ROWS} players each)", 1, pages, 1)
+        sl = slice((page - 1) * HEATMAP_PAGE_ROWS, page * HEATMAP_PAGE_ROWS)
+        show_chart(make_roster_heatmap(hm_z[sl], [hm_label(i) for i in hm_rows[sl]]), "roster_heatmap",
+                   use_container_width=True)
+
+    # Built only when clicked; the partitioned BI dataset comes from `python wlax_export.py <dir>`
+    st.download_button("⬇️ Export Full Model (Parquet)", data=lambda: export.parquet_bytes(table),
+                       file_name=f"wlax_intelligence_{score_digest}.parquet", mime="application/vnd.apache.parquet",
+                       on_click="ignore")
 
 
 # ═══════════════════════════════════════════════
@@ -1069,72 +1407,12 @@ elif view_mode == "📊 Team Overview":
 elif view_mode == "🔬 Comparison":
     st.markdown("## Head-to-Head Comparison")
 
-    comp_names = [n for n, _ in sorted_players]
-    comp_options = [f"#{all_data[n]['player']['num']} {n} ({all_data[n]['player']['pos']})" for n in comp_names]
-    if len(comp_options) < 2:
+    if len(sorted_rows) < 2:
         st.warning("Need at least 2 players for comparison.")
     else:
-        c1, c2 = st.columns(2)
-        with c1: p1_sel = st.selectbox("Player 1", comp_options, index=0)
-        with c2: p2_sel = st.selectbox("Player 2", comp_options, index=min(1, len(comp_options)-1))
-
-        p1_name = comp_names[comp_options.index(p1_sel)]
-        p2_name = comp_names[comp_options.index(p2_sel)]
-        d1, d2 = all_data[p1_name], all_data[p2_name]
-
-        # Determine shared radar dimensions (use same categories for both)
-        shared_cats = ["Offense", "Defense", "Possession", "Efficiency", "Discipline"]
-        shared_keys = ["offensive", "defensive", "possession", "efficiency", "discipline"]
-
-        # Side by side with headshots and matching radars
-        rc1, rc2 = st.columns(2)
-        for col, pname, pdata, color in [(rc1, p1_name, d1, UVA_ORANGE), (rc2, p2_name, d2, UVA_BLUE)]:
-            with col:
-                # Headshot + name
-                img_url = HEADSHOT_URLS.get(pname, "")
-                hdr = f'<div style="text-align:center;">'
-                if img_url:
-                    hdr += f'<img src="{img_url}" style="width:90px;height:90px;border-radius:50%;object-fit:cover;border:3px solid {color};margin-bottom:8px;" onerror="this.style.display=\'none\'">'
-                hdr += f'<h3 style="color:{color} !important;margin:0;">{pname}</h3>'
-                hdr += f'<p style="color:{TEXT_GRAY};font-size:0.85rem;">#{pdata["player"]["num"]} · {pdata["player"]["pos"]} · {pdata["player"]["yr"]} · Impact: {pdata["scores"]["overall"]:.0f}</p></div>'
-                st.markdown(hdr, unsafe_allow_html=True)
-
-                # Unified radar
-                vals = [pdata["scores"][k] for k in shared_keys]
-                vals = [max(0, min(v, 100)) for v in vals]
-                vals.append(vals[0])
-                cats_closed = shared_cats + [shared_cats[0]]
-                fig = go.Figure()
-                fig.add_trace(go.Scatterpolar(r=vals, theta=cats_closed, fill='toself',
-                    fillcolor=f'rgba({",".join(str(int(color[i:i+2], 16)) for i in (1,3,5))},0.15)',
-                    line=dict(color=color, width=2.5), marker=dict(size=6, color=color)))
-                fig.update_layout(**PLOTLY_LAYOUT, polar=dict(bgcolor="rgba(0,0,0,0)",
-                    radialaxis=dict(visible=True, range=[0, 100], showticklabels=False, gridcolor=MED_GRAY),
-                    angularaxis=dict(gridcolor=MED_GRAY, tickfont=dict(size=10, color=TEXT_GRAY))),
-                    showlegend=False, height=280)
-                st.plotly_chart(fig, use_container_width=True, key=f"cmp_r_{pname}")
-
-        # Comparison bar chart
-        v1 = [d1["scores"][k] for k in shared_keys]
-        v2 = [d2["scores"][k] for k in shared_keys]
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=shared_cats, y=v1, name=p1_name, marker_color=UVA_ORANGE))
-        fig.add_trace(go.Bar(x=shared_cats, y=v2, name=p2_name, marker_color=UVA_BLUE))
-        fig.update_layout(**PLOTLY_LAYOUT, height=320, barmode="group",
-            yaxis=dict(gridcolor=MED_GRAY, range=[0, 100]),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02))
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Stats table
-        st.markdown("### Raw Stats Comparison")
-        stat_keys = ["gp", "g", "a", "pts", "sh", "sh_pct", "sog_pct", "gb", "dc", "to", "ct"]
-        stat_labels = ["GP", "Goals", "Assists", "Points", "Shots", "SH%", "SOG%", "GB", "DC", "TO", "CT"]
-        comp_df = pd.DataFrame({
-            "Stat": stat_labels,
-            p1_name: [d1["player"].get(k, "—") for k in stat_keys],
-            p2_name: [d2["player"].get(k, "—") for k in stat_keys],
-        })
-        st.dataframe(comp_df, use_container_width=True, hide_index=True)
+        allowed = np.zeros(len(table), dtype=bool)
+        allowed[sorted_rows] = True
+        comparison_panel(allowed, sorted_rows[:2].tolist())
 
 
 # ═══════════════════════════════════════════════
@@ -1148,11 +1426,10 @@ elif view_mode == "🎯 Recommendations":
     st.markdown(f'<p style="color:{TEXT_GRAY};font-size:0.9rem;">Based on impact scores, efficiency, and development flags — who should get more minutes, who should be situational, and where each player fits.</p>', unsafe_allow_html=True)
 
     for tier_num in [1, 2, 3, 4]:
-        tier_players_list = [(n, d) for n, d in sorted_players if d["tier_num"] == tier_num]
+        tier_players_list = row_entries(sorted_rows[table.tier[sorted_rows] == tier_num])
         if not tier_players_list: continue
         tier_names_map = {1: "🔥 Program Drivers — Maximize Minutes", 2: "⚡ System Amplifiers — High Usage",
                      3: "🎯 Situational Specialists — Targeted Deployment", 4: "🌱 Developmental — Practice Priority"}
-        tier_colors_map = {1: CAV_ORANGE, 2: UVA_CYAN, 3: UVA_GREEN, 4: MED_GRAY}
 
         st.markdown(f"#### {tier_names_map[tier_num]}")
 
@@ -1164,12 +1441,11 @@ elif view_mode == "🎯 Recommendations":
                 hcol, ncol = st.columns([0.4, 4])
                 with hcol:
                     if img_url:
-                        st.markdown(f'<img src="{img_url}" style="width:60px;height:60px;border-radius:50%;object-fit:cover;border:2px solid {tier_colors_map[tier_num]};" onerror="this.style.display=\'none\'">', unsafe_allow_html=True)
+                        st.markdown(REC_HEADSHOT.format(url=img_url, tier=tier_num), unsafe_allow_html=True)
                 with ncol:
                     st.markdown(f"**#{p['num']} {name}** — {p['pos']} · {p['yr']} · Impact: {data['scores']['overall']:.0f}")
                     if data["recs"]:
-                        for rec in data["recs"]:
-                            st.markdown(f'<div class="rec-box">{rec}</div>', unsafe_allow_html=True)
+                        st.markdown("".join(REC_BOX.format(body=rec) for rec in data["recs"]), unsafe_allow_html=True)
                     else:
                         st.markdown(f'<div class="coaching-notes">{data["notes"]}</div>', unsafe_allow_html=True)
 
@@ -1177,27 +1453,51 @@ elif view_mode == "🎯 Recommendations":
     st.markdown("---")
     st.markdown("### Team-Level Strategic Insights")
 
-    top_off = sorted(all_data.items(), key=lambda x: x[1]["scores"]["offensive"], reverse=True)[:3]
-    top_def = sorted(all_data.items(), key=lambda x: x[1]["scores"]["defensive"], reverse=True)[:3]
-    high_to = sorted([(k,v) for k,v in all_data.items() if v["player"]["to"] >= 5],
-                    key=lambda x: x[1]["player"]["to"], reverse=True)
+    g, pts, to = table.stats["g"], table.stats["pts"], table.stats["to"]
+    top_off = top_rows(table.scores["offensive"], k=3)
+    top_def = top_rows(table.scores["defensive"], k=3)
+    high_to = top_rows(to, to >= 5, 3)
 
     i1, i2 = st.columns(2)
     with i1:
         st.markdown(f"""<div class="coaching-notes">
-        <strong>🏆 Core Offensive Unit:</strong> {', '.join([n for n,_ in top_off])} should be the primary scoring trio. 
-        They combine for {sum(d['player']['pts'] for _,d in top_off)} points on {sum(d['player']['g'] for _,d in top_off)} goals.<br><br>
-        <strong>🛡️ Defensive Anchors:</strong> {', '.join([n for n,_ in top_def])} are the backbone — prioritize their health and minutes management.
+        <strong>🏆 Core Offensive Unit:</strong> {', '.join(table.names[i] for i in top_off)} should be the primary scoring trio. 
+        They combine for {pts[top_off].sum()} points on {g[top_off].sum()} goals.<br><br>
+        <strong>🛡️ Defensive Anchors:</strong> {', '.join(table.names[i] for i in top_def)} are the backbone — prioritize their health and minutes management.
         </div>""", unsafe_allow_html=True)
     with i2:
-        to_text = ", ".join([f"{k} ({v['player']['to']} TO)" for k,v in high_to[:3]])
+        to_text = ", ".join(f"{table.names[i]} ({to[i]} TO)" for i in high_to)
         st.markdown(f"""<div class="coaching-notes">
         <strong>⚠️ Turnover Reduction Priority:</strong> {to_text} — these players account for 
-        {sum(v['player']['to'] for _,v in high_to[:3])} of the team's 57 turnovers. Film sessions and ball-handling drills needed.<br><br>
+        {to[high_to].sum()} of the team's 57 turnovers. Film sessions and ball-handling drills needed.<br><br>
         <strong>🎯 Late-Game Lineup:</strong> Use Alaimo + Foster + Galica in crunch time — they have the highest clutch ratios and combined 
         for the majority of 4th quarter production.
         </div>""", unsafe_allow_html=True)
 
+    # Projections
+    st.markdown("---")
+    st.markdown("### Next-Game Projections")
+    st.markdown(f'<p style="color:{TEXT_GRAY};font-size:0.9rem;">Projected from each player\'s game log with 80% ranges — use alongside the tiers when setting the next lineup.</p>', unsafe_allow_html=True)
+    if proj is None:
+        st.caption(NO_PROJECTIONS)
+    else:
+        proj_rows = []
+        for i in sorted_rows:
+            row = {"Player": table.names[i], "Pos": table.vocab["pos"][table.stats["pos"][i]]}
+            for label, k in PROJ_STATS:
+                row[label] = round(float(proj[k]["mean"][i]), 1)
+                row[f"{label} range"] = f"{proj[k]['lo'][i]:.0f}–{proj[k]['hi'][i]:.0f}"
+            row["Proj PTS"] = round(float(proj["g"]["mean"][i] + proj["a"]["mean"][i]), 1)
+            proj_rows.append(row)
+        st.dataframe(pd.DataFrame(proj_rows).sort_values("Proj PTS", ascending=False),
+                     use_container_width=True, hide_index=True)
+
+    # Defensive matchups
+    st.markdown("---")
+    st.markdown("### Defensive Matchup Planner")
+    st.markdown(f'<p style="color:{TEXT_GRAY};font-size:0.9rem;">Assigns our D/M defenders to the opponent\'s most dangerous attackers to maximize expected disruption (caused turnovers against turnover-prone carriers, ground balls against finishers). The alternate is who slides over if the assigned defender is carded.</p>', unsafe_allow_html=True)
+    matchup_planner()
+
 
 # ═══════════════════════════════════════════════
 # VIEW: DRAW CONTROL CENTER
@@ -1207,50 +1507,120 @@ elif view_mode == "🏆 Draw Control Center":
     st.markdown(f'<p style="color:{TEXT_GRAY};">Draw controls are the single highest-leverage stat in women\'s lacrosse. Teams winning 60%+ of draws gain multiple extra possessions per game, dramatically increasing win probability.</p>', unsafe_allow_html=True)
 
     # Team draw stats
-    total_dc = sum(d["player"]["dc"] for d in all_data.values())
-    dc_per_game = total_dc / 5
+    dc = table.stats["dc"]
+    total_dc = int(dc.sum())
+    results = opponents.team_results(games)
+    n_games = len(games) or len(results)
+    top_dc = int(np.argmax(dc)) if len(table) else None
 
     mc1, mc2, mc3 = st.columns(3)
     mc1.metric("Total Draw Controls", total_dc)
-    mc2.metric("DC / Game", f"{dc_per_game:.1f}")
-    mc3.metric("Primary Draw Specialist", "Kate Galica (35)")
+    mc2.metric("DC / Game", f"{total_dc / max(n_games, 1):.1f}")
+    mc3.metric("Primary Draw Specialist", f"{table.names[top_dc]} ({dc[top_dc]})" if top_dc is not None and dc[top_dc] else "—")
 
     st.markdown("")
 
     # Draw control distribution
     st.markdown("### Draw Control Distribution")
-    dc_fig = make_draw_control_chart(all_data)
+    pbp_path = possessions.PBP_PATH
+    poss = load_possessions(pbp_path, os.path.getmtime(pbp_path) if os.path.exists(pbp_path) else 0,
+                            os.path.getmtime(possessions.MODEL_PATH) if os.path.exists(possessions.MODEL_PATH) else 0)
+    dc_fig = make_draw_control_chart(table, poss["value_added"] if poss else None)
     if dc_fig:
-        st.plotly_chart(dc_fig, use_container_width=True)
-
-    # Galica deep dive
-    st.markdown("### Kate Galica — Draw Control Deep Dive")
-    galica = all_data.get("Kate Galica")
-    if galica:
-        p = galica["player"]
-        g1, g2 = st.columns(2)
-        with g1:
-            st.markdown(f"""<div class="coaching-notes">
-            <strong>Draw Control Dominance:</strong> {p['dc']} draws won across {p['gp']} games = {p['dc']/p['gp']:.0f} DC/game<br>
-            She accounts for <strong>{p['dc']/max(total_dc,1)*100:.0f}%</strong> of all team draw controls.<br><br>
-            <strong>Recommendation:</strong> Galica must take every draw in competitive games. Build a secondary option
-            (Dinardo with {all_data.get('Jenna Dinardo', {}).get('player', {}).get('dc', 0)} DCs or Reilly with {all_data.get('Alex Reilly', {}).get('player', {}).get('dc', 0)} DCs)
-            for rest in blowouts and as insurance.
-            </div>""", unsafe_allow_html=True)
-        with g2:
-            # Galica's game-by-game rolling performance
-            fig = make_rolling_avg_chart(p)
-            if fig:
-                st.markdown("**Goals Rolling Average (3-game)**")
-                st.plotly_chart(fig, use_container_width=True)
+        show_chart(dc_fig, "draw_control", use_container_width=True)
+
+    # Draw specialist deep dive
+    draw_deep_dive(total_dc)
 
     # Draw-to-Goal conversion
     st.markdown("### Draw Circle → Goal Conversion Pipeline")
+    team_goals = int(results["team_goals"].sum()) if len(results) else int(table.stats["g"].sum())
+    draw_value = poss["values"]["draw_win"] if poss else possessions.DEFAULT_DRAW_VALUE
+    value_source = ("from the possession-chain model" if poss else
+                    "based on D1 averages (load play-by-play via WLAX_PBP_PATH for a fitted value)")
+    observed = ""
+    if poss and poss["summary"]:
+        ps = poss["summary"]
+        observed = (f" In the play-by-play, {ps['draw_possessions']} draw-win possessions produced "
+                    f"<strong>{ps['draw_goals']}</strong> goals ({ps['draw_goals']/max(ps['draw_possessions'],1):.2f} per possession).")
     st.markdown(f"""<div class="rec-box">
     <strong>🔄 Team Draw-to-Goal Flow:</strong><br>
-    Draw Controls Won: <strong>{total_dc}</strong> → Ground Balls Recovered: <strong>{sum(d['player']['gb'] for d in all_data.values())}</strong> → 
-    Team Goals: <strong>56</strong><br><br>
-    <strong>Key Insight:</strong> With {total_dc} draws and 56 goals, the team converts roughly 1 goal per {total_dc/56:.1f} draws won. 
+    Draw Controls Won: <strong>{total_dc}</strong> → Ground Balls Recovered: <strong>{int(table.stats['gb'].sum())}</strong> → 
+    Team Goals: <strong>{team_goals}</strong><br><br>
+    <strong>Key Insight:</strong> With {total_dc} draws and {team_goals} goals, the team converts roughly 1 goal per {total_dc/max(team_goals,1):.1f} draws won. 
     Improving draw circle ground ball recovery (getting the loose ball after winning the draw) is a high-leverage practice area — 
-    every additional clean draw possession is worth approximately 0.4 expected goals based on D1 averages.
-    </div>""", unsafe_allow_html=True)
\ No newline at end of file
+    every additional clean draw possession is worth approximately {draw_value:.2f} expected goals {value_source}.{observed}
+    </div>""", unsafe_allow_html=True)
+
+
+# ═══════════════════════════════════════════════
+# VIEW: CHANGE FEED
+# ═══════════════════════════════════════════════
+elif view_mode == "📰 Change Feed":
+    st.markdown("## What Changed Since the Last Update")
+    versions = store.list_versions(profile=profile["name"])[::-1]   # newest first
+    if len(versions) < 2:
+        st.info("Only one version of the analysis so far — the feed fills in once the next game is loaded.")
+    else:
+        digests = [v["digest"] for v in versions]
+        labels = {v["digest"]: f"{v['created'].replace('T', ' ')} · {v['games']} games"
+                               + (f" · through {v['last_game']}" if v["last_game"] else "") for v in versions}
+        current = digests.index(score_digest) if score_digest in digests else 0
+        vc1, vc2 = st.columns(2)
+        previous = current + 1 if current + 1 < len(digests) else current - 1   # the version before, else after
+        old_digest = vc1.selectbox("Compare", digests, index=previous, format_func=labels.get)
+        new_digest = vc2.selectbox("Against", digests, index=current, format_func=labels.get)
+        old_cols = load_version_columns(old_digest)
+        new_cols = changes.table_columns(table) if new_digest == score_digest else load_version_columns(new_digest)
+        if old_cols is None or new_cols is None:
+            st.warning("That version's snapshot has been deleted; pick another.")
+        else:
+            feed = changes.diff(old_cols, new_cols)
+            counts = changes.summary(feed)
+            fc = st.columns(4)
+            fc[0].metric("Tier Moves", counts["tier_moves"])
+            fc[1].metric("Flags Gained", counts["flags_gained"])
+            fc[2].metric("Flags Cleared", counts["flags_cleared"])
+            fc[3].metric(f"Score Swings (±{changes.MIN_SCORE_DELTA:.0f})", counts["score_swings"])
+            if feed.empty:
+                st.success("No tier, flag or score changes between these versions.")
+            else:
+                st.dataframe(feed.rename(columns={"player": "Player", "change": "Change", "detail": "Detail",
+                                                  "old": "Before", "new": "After", "overall_delta": "Δ Overall"}).round(1),
+                             use_container_width=True, hide_index=True)
+            st.download_button("Export CSV", feed.to_csv(index=False), mime="text/csv",
+                               file_name=f"wlax_changes_{old_digest}_{new_digest}.csv")
+
+
+# ═══════════════════════════════════════════════
+# DIAGNOSTICS (hidden, ?diag=1)
+# ═══════════════════════════════════════════════
+perf.end(_view_t)
+_perf_rec = perf.finish_run()
+if DIAGNOSTICS:
+    history = st.session_state.setdefault("perf_history", [])
+    history.append(_perf_rec)
+    del history[:-50]
+    summ = perf.summary(_perf_rec)
+    with st.sidebar:
+        st.markdown("---")
+        with st.expander("🩺 Diagnostics", expanded=True):
+            st.markdown(f"**Rerun:** {summ['total_ms']:.1f} ms · {summ['label']}")
+            stage_df = pd.DataFrame([{"Stage": k, "ms": v["ms"], "Calls": v["calls"]}
+                                     for k, v in summ["stages"].items()]).sort_values("ms", ascending=False)
+            st.dataframe(stage_df, use_container_width=True, hide_index=True)
+            if summ["caches"]:
+                st.markdown("**Caches**")
+                st.dataframe(pd.DataFrame([{"Cache": k, "Hits": v["hits"], "Misses": v["misses"],
+                                            "Hit Rate": f"{v['hit_rate']:.0%}"} for k, v in summ["caches"].items()]),
+                             use_container_width=True, hide_index=True)
+            if summ["payloads"]:
+                st.markdown("**Figure Payloads**")
+                st.dataframe(pd.DataFrame([{"Figure": k, "KB": v["bytes"] / 1024, "Count": v["count"]}
+                                           for k, v in summ["payloads"].items()]),
+                             use_container_width=True, hide_index=True)
+            st.markdown("**Counters** · " + " · ".join(f"{k}: {v}" for k, v in summ["counters"].items()))
+            if len(history) > 1:
+                st.line_chart(pd.DataFrame({"Rerun ms": [r["total_ms"] for r in history]}), height=120)
+            st.download_button("Export JSON", perf.to_json(history), file_name="wlax_perf.json", mime="application/json")
+            st.download_button("Export Trace", perf.to_trace(history), file_name="wlax_trace.json", mime="application/json")
@@ -0,0 +1,266 @@
+"""Possession-chain Markov model: expected goals per possession state.
+
+    python wlax_possessions.py fit league_pbp.csv      # transition counts from every possession
+    python wlax_possessions.py update game_pbp.csv     # fold in new games only
+    python wlax_possessions.py show [our_pbp.csv]      # state values (and player value added)
+
+Play-by-play is a CSV of possession events, one row per event in order:
+
+    game, possession, seq, event, player
+
+with event one of STATES. A possession is an absorbing chain that ends in
+"goal" or "turnover". Transition counts come from every consecutive event
+pair in one vectorized pass (a bincount over from × to), so the model is just
+an S × S count matrix: adding a game adds its counts, and the games already
+folded in are remembered by a digest of their events (game numbers are only
+local to one file), so re-running an update or re-sending a game under another
+number is harmless, while two files' different "game 3"s are both counted.
+
+The expected goals of each transient state solve the absorbing-chain system
+(I − Q) v = r, where Q is the transient block of the transition matrix and r
+the one-step probability of a goal. A player's value added is the change in
+state value across every event they are credited with: v(after) − v(before),
+with v(before) = 0 for the event that starts a possession (a draw win is
+worth the whole v(draw_win)).
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import wlax_perf as perf
+
+PBP_PATH = os.environ.get("WLAX_PBP_PATH", "")
+MODEL_PATH = os.environ.get("WLAX_POSSESSIONS_MODEL",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         ".wlax_models", "possessions.joblib"))
+STATES = ["draw_win", "ground_ball", "clear", "settled", "shot", "goal", "turnover"]
+ABSORBING = ("goal", "turnover")
+TRANSIENT = [s for s in STATES if s not in ABSORBING]
+# Used only until play-by-play is loaded: the published D1 value of a clean draw possession.
+DEFAULT_DRAW_VALUE = 0.4
+
+EVENT_DTYPE = np.dtype([("game", "i4"), ("possession", "i4"), ("seq", "i2"), ("state", "u1"), ("player", "i4")])
+
+
+# ═══════════════════════════════════════════════
+# EVENT TABLE
+# ═══════════════════════════════════════════════
+
+def events_from_frame(df):
+    """Play-by-play DataFrame → {"events", "players", "player_index", "digest"}, events in chain order.
+
+    Unknown events raise; a blank player (team events, penalties) is coded -1.
+    """
+    df = df.sort_values(["game", "possession", "seq"], kind="stable")
+    ev = np.zeros(len(df), dtype=EVENT_DTYPE)
+    for col in ("game", "possession", "seq"):
+        ev[col] = df[col].to_numpy()
+    mapped = df["event"].map(pd.Series(range(len(STATES)), index=STATES))
+    if mapped.isna().any():
+        raise ValueError(f"unknown event: {sorted(set(df['event'][mapped.isna()]))}")
+    ev["state"] = mapped.to_numpy()
+    who = df["player"].fillna("").astype(str) if "player" in df else pd.Series([""] * len(df))
+    ev["player"], players = pd.factorize(who.where(who != ""))
+    digest = hashlib.sha256(ev.tobytes() + "\0".join(players).encode()).hexdigest()[:16]
+    return {"events": ev, "players": list(players), "player_index": {n: i for i, n in enumerate(players)},
+            "digest": digest}
+
+
+@perf.timed()
+def load_pbp(path=PBP_PATH):
+    """Possession events from CSV, or None when no play-by-play file is configured."""
+    if not path or not os.path.exists(path):
+        return None
+    return events_from_frame(pd.read_csv(path))
+
+
+def synthetic_pbp(n_games, players, possessions_per_game=60, seed=0):
+    """Random possession chains from a plausible transition matrix, for benchmarks and demos only."""
+    rng = np.random.default_rng(seed)
+    P = np.array([[0, .30, 0, .45, .10, 0, .15],       # draw_win
+                  [0, 0, .45, .30, .05, 0, .20],       # ground_ball
+                  [0, .05, 0, .75, .05, 0, .15],       # clear
+                  [0, .05, 0, .10, .62, 0, .23],       # settled
+                  [0, .20, 0, .12, 0, .40, .28]])      # shot (rebounds/resets, goal, save/miss)
+    start = np.array([.35, .30, .35, 0, 0])
+    n = n_games * possessions_per_game
+    state = rng.choice(5, n, p=start)
+    rows, pid, step = [], np.arange(n), 0
+    while len(pid):
+        rows.append(pd.DataFrame({"game": pid // possessions_per_game, "possession": pid, "seq": step,
+                                  "event": np.asarray(STATES)[state], "player": rng.choice(players, len(pid))}))
+        u = rng.random(len(pid))[:, None]
+        state = (u > np.cumsum(P[state], axis=1)).sum(axis=1)
+        live = state < len(TRANSIENT)
+        done = ~live
+        rows.append(pd.DataFrame({"game": pid[done] // possessions_per_game, "possession": pid[done],
+                                  "seq": step + 1, "event": np.asarray(STATES)[state[done]],
+                                  "player": rng.choice(players, done.sum())}))
+        pid, state, step = pid[live], state[live], step + 1
+    return pd.concat(rows, ignore_index=True)
+
+
+# ═══════════════════════════════════════════════
+# TRANSITIONS / STATE VALUES
+# ═══════════════════════════════════════════════
+
+def _pairs(ev):
+    """Boolean mask of rows whose next row continues the same possession (rows are in chain order)."""
+    return (ev["game"][1:] == ev["game"][:-1]) & (ev["possession"][1:] == ev["possession"][:-1])
+
+
+def transition_counts(ev):
+    """S × S counts of consecutive-event transitions within possessions."""
+    S = len(STATES)
+    cont = _pairs(ev)
+    flat = ev["state"][:-1][cont].astype(np.int64) * S + ev["state"][1:][cont]
+    return np.bincount(flat, minlength=S * S).reshape(S, S).astype(np.float64)
+
+
+def _empty_model():
+    return {"counts": np.zeros((len(STATES), len(STATES))), "games": set()}
+
+
+def game_keys(pbp):
+    """(game numbers, content digests): one stable key per game, independent of its number and possession ids."""
+    ev = pbp["events"]
+    starts = np.ones(len(ev), dtype=bool)
+    starts[1:] = ~_pairs(ev)
+    chain = np.cumsum(starts)
+    bounds = np.flatnonzero(np.r_[True, ev["game"][1:] != ev["game"][:-1], True])
+    names = np.asarray(pbp["players"] + [""], dtype=object)[ev["player"]]   # -1 (no player) → ""
+    keys = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        body = np.stack([chain[lo:hi] - chain[lo], ev["seq"][lo:hi], ev["state"][lo:hi]]).astype(np.int32)
+        keys.append(hashlib.sha256(body.tobytes() + "\0".join(names[lo:hi]).encode()).hexdigest()[:16])
+    return ev["game"][bounds[:-1]], keys
+
+
+@perf.timed("possessions_update")
+def update_model(model, pbp):
+    """Fold the games of `pbp` not yet in the model into its counts (in place); returns the keys added."""
+    if any(not isinstance(k, str) for k in model["games"]):
+        raise ValueError("model keys games by number (pre-digest); refit it with `fit`")
+    ev = pbp["events"]
+    numbers, keys = game_keys(pbp)
+    fresh = {}
+    for g, k in zip(numbers.tolist(), keys):
+        if k not in model["games"]:
+            fresh.setdefault(k, g)   # the same game twice in one file counts once
+    if not fresh:
+        return []
+    model["counts"] += transition_counts(ev[np.isin(ev["game"], list(fresh.values()))])
+    model["games"].update(fresh)
+    return sorted(fresh)
+
+
+def fit_model(pbp):
+    """Model from scratch over every possession in `pbp`."""
+    model = _empty_model()
+    update_model(model, pbp)
+    return model
+
+
+def state_values(model):
+    """Expected goals from each state until the possession ends: {state: value}, goal = 1, turnover = 0."""
+    counts = model["counts"]
+    t = [STATES.index(s) for s in TRANSIENT]
+    out = counts[t].sum(axis=1, keepdims=True)
+    # A state never left in the data is treated as ending the possession (no goal).
+    P = np.divide(counts[t], out, out=np.zeros_like(counts[t]), where=out > 0)
+    Q, r = P[:, t], P[:, STATES.index("goal")]
+    v = np.linalg.solve(np.eye(len(t)) - Q, r)
+    values = dict(zip(TRANSIENT, v.tolist()))
+    values.update({"goal": 1.0, "turnover": 0.0})
+    return values
+
+
+# ═══════════════════════════════════════════════
+# PLAYER VALUE ADDED
+# ═══════════════════════════════════════════════
+
+@perf.timed()
+def value_added(pbp, values):
+    """Per-player value added, in total and by state credited: DataFrame indexed by name."""
+    ev = pbp["events"]
+    v = np.array([values[s] for s in STATES])[ev["state"]]
+    before = np.zeros(len(ev))
+    before[1:] = np.where(_pairs(ev), v[:-1], 0.0)
+    delta = v - before
+    n, S = len(pbp["players"]), len(STATES)
+    keep = ev["player"] >= 0
+    flat = ev["player"][keep].astype(np.int64) * S + ev["state"][keep]
+    by_state = np.bincount(flat, weights=delta[keep], minlength=n * S).reshape(n, S)
+    events = np.bincount(flat, minlength=n * S).reshape(n, S)
+    df = pd.DataFrame(by_state, columns=[f"va_{s}" for s in STATES], index=pd.Index(pbp["players"], name="name"))
+    df.insert(0, "value_added", by_state.sum(axis=1))
+    df.insert(1, "draw_wins", events[:, STATES.index("draw_win")])
+    return df
+
+
+def team_summary(pbp, values):
+    """Possessions, goals and the draw-win → goal rate actually observed in `pbp`."""
+    ev = pbp["events"]
+    starts = np.ones(len(ev), dtype=bool)
+    starts[1:] = ~_pairs(ev)
+    draw_chain = np.cumsum(starts)[ev["state"] == STATES.index("goal")]
+    first = ev["state"][starts]
+    drawn = np.flatnonzero(first == STATES.index("draw_win")) + 1
+    return {"possessions": int(starts.sum()), "goals": int((ev["state"] == STATES.index("goal")).sum()),
+            "draw_possessions": int(len(drawn)),
+            "draw_goals": int(np.isin(draw_chain, drawn).sum()), "draw_value": values["draw_win"]}
+
+
+# ═══════════════════════════════════════════════
+# PERSIST
+# ═══════════════════════════════════════════════
+
+def save_model(model, path=MODEL_PATH):
+    import joblib
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_model(path=MODEL_PATH):
+    """The persisted count model, or None if it's missing."""
+    if not os.path.exists(path):
+        return None
+    import joblib
+    return joblib.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit, update or inspect the possession Markov model.")
+    parser.add_argument("command", choices=["fit", "update", "show"])
+    parser.add_argument("pbp", nargs="?", help="play-by-play CSV")
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+    pbp = load_pbp(args.pbp) if args.pbp else None
+    if args.command in ("fit", "update") and pbp is None:
+        parser.error(f"no play-by-play file at {args.pbp}")
+    if args.command == "fit":
+        model = fit_model(pbp)
+        print(save_model(model, args.model), f"{len(model['games'])} games")
+    elif args.command == "update":
+        model = load_model(args.model) or _empty_model()
+        added = update_model(model, pbp)
+        print(save_model(model, args.model), f"+{len(added)} games, {len(model['games'])} total")
+    else:
+        model = load_model(args.model) or (fit_model(pbp) if pbp is not None else None)
+        if model is None:
+            parser.error(f"no model at {args.model}; run fit first or pass a play-by-play file")
+        values = state_values(model)
+        print({k: round(v, 3) for k, v in values.items()})
+        if pbp is not None:
+            print(team_summary(pbp, values))
+            print(value_added(pbp, values).sort_values("value_added", ascending=False).round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Scoring profiles: per-team or per-staff overrides of the engine's scoring literals.
+
+    python wlax_profiles.py check [scoring_profiles.json]
+
+Profiles live in a JSON file (WLAX_PROFILES_PATH, default scoring_profiles.json
+next to this module):
+
+    {"profiles": {"Defense-first": {"position_weights": {"M": [0.15, 0.30, 0.25, 0.20, 0.10]},
+                                    "tiers": [60, 40, 20]}}}
+
+Each profile is a partial override of engine.DEFAULT_PROFILE (dicts merge, lists
+and numbers replace), validated as a whole, then compiled once by
+engine.compile_profile into the weight arrays and bound flag evaluator the
+vectorized passes take. The built-in "default" profile is always present.
+
+get_profiles re-reads the file only when its mtime changes. Every compiled
+profile carries a digest of its merged contents, so an edit changes the
+digest of the edited profile alone and only results keyed on it are rebuilt.
+"""
+import argparse
+import json
+import math
+import os
+
+import wlax_engine as engine
+
+PROFILES_PATH = os.environ.get("WLAX_PROFILES_PATH",
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_profiles.json"))
+DEFAULT_NAME = "default"
+_loaded = {}   # path → (mtime, profiles, error)
+
+
+def merge(base, override):
+    """Deep merge for dicts; anything else in `override` replaces the base value."""
+    out = dict(base)
+    for k, v in override.items():
+        out[k] = merge(base[k], v) if isinstance(v, dict) and isinstance(base.get(k), dict) else v
+    return out
+
+
+def _number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+
+
+def validate(profile, name):
+    """Raise ValueError listing every problem with a merged profile."""
+    problems = []
+    unknown = set(profile) - set(engine.DEFAULT_PROFILE)
+    if unknown:
+        problems.append(f"unknown sections {sorted(unknown)}")
+    for pos, w in profile.get("position_weights", {}).items():
+        if not (isinstance(w, list) and len(w) == len(engine.SCORE_KEYS) and all(_number(x) and x >= 0 for x in w)):
+            problems.append(f"position_weights.{pos}: need {len(engine.SCORE_KEYS)} non-negative numbers "
+                            f"({', '.join(engine.SCORE_KEYS)})")
+        elif abs(sum(w) - 1) > 1e-6:
+            problems.append(f"position_weights.{pos}: weights sum to {sum(w):.3f}, not 1")
+    for key, v in profile.get("caps", {}).items():
+        if key not in engine.DEFAULT_PROFILE["caps"]:
+            problems.append(f"caps.{key}: unknown cap")
+        elif not (_number(v) and v > 0):
+            problems.append(f"caps.{key}: must be a positive number")
+    for flag, params in profile.get("flags", {}).items():
+        known = engine.DEFAULT_PROFILE["flags"].get(flag)
+        if known is None:
+            problems.append(f"flags.{flag}: unknown flag")
+            continue
+        for param, v in params.items():
+            if param not in known:
+                problems.append(f"flags.{flag}.{param}: unknown threshold (expected one of {sorted(known)})")
+            elif not _number(v):
+                problems.append(f"flags.{flag}.{param}: must be a number")
+    gk_weights = profile.get("gk_weights", {})
+    if set(gk_weights) != set(engine.DEFAULT_PROFILE["gk_weights"]):
+        problems.append(f"gk_weights: need exactly {sorted(engine.DEFAULT_PROFILE['gk_weights'])}")
+    elif not all(_number(w) and w >= 0 for w in gk_weights.values()):
+        problems.append("gk_weights: weights must be non-negative numbers")
+    elif abs(sum(gk_weights.values()) - 1) > 1e-6:
+        problems.append(f"gk_weights: weights sum to {sum(gk_weights.values()):.3f}, not 1")
+    for key, v in profile.get("texts", {}).items():
+        if key not in engine.DEFAULT_PROFILE["texts"]:
+            problems.append(f"texts.{key}: unknown threshold")
+        elif not _number(v):
+            problems.append(f"texts.{key}: must be a number")
+    tiers = profile.get("tiers")
+    if not (isinstance(tiers, list) and len(tiers) == 3 and all(_number(x) for x in tiers)
+            and tiers[0] > tiers[1] > tiers[2]):
+        problems.append("tiers: need three descending cutoffs for tiers 1-3")
+    if problems:
+        raise ValueError(f"profile {name!r}: " + "; ".join(problems))
+
+
+def compile_profiles(raw):
+    """Parsed profiles file → {name: compiled profile}, "default" first."""
+    out = {DEFAULT_NAME: engine.DEFAULT_COMPILED}
+    entries = raw.get("profiles", {}) if isinstance(raw, dict) else None
+    if not isinstance(entries, dict):
+        raise ValueError('profiles file must be {"profiles": {name: overrides}}')
+    for name, override in entries.items():
+        if name == DEFAULT_NAME:
+            raise ValueError(f"profile name {DEFAULT_NAME!r} is reserved for the built-in literals")
+        if not isinstance(override, dict):
+            raise ValueError(f"profile {name!r}: overrides must be an object")
+        profile = merge(engine.DEFAULT_PROFILE, override)
+        validate(profile, name)
+        out[name] = engine.compile_profile(profile, name)
+    return out
+
+
+def get_profiles(path=PROFILES_PATH):
+    """(profiles, error): compiled profiles, reloaded when the file changes.
+
+    A broken edit doesn't take the app down: the last good set is kept and
+    the error is returned alongside it.
+    """
+    mtime = os.path.getmtime(path) if path and os.path.exists(path) else None
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    profiles, error = {DEFAULT_NAME: engine.DEFAULT_COMPILED}, None
+    if mtime is not None:
+        try:
+            with open(path) as f:
+                profiles = compile_profiles(json.load(f))
+        except (OSError, ValueError) as exc:
+            error = str(exc)
+            profiles = cached[1] if cached else profiles
+    _loaded[path] = (mtime, profiles, error)
+    return profiles, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a scoring profiles file.")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("path", nargs="?", default=PROFILES_PATH)
+    args = parser.parse_args()
+    profiles, error = get_profiles(args.path)
+    if error:
+        parser.error(error)
+    for name, p in profiles.items():
+        print(f"{name:24s} {p['digest']}")
+
+
+if __name__ == "__main__":
+    main()
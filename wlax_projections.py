@@ -0,0 +1,162 @@
+"""Next-game projections with uncertainty intervals.
+
+    python wlax_projections.py train league_rosters.json [more.json ...]
+    python wlax_projections.py show
+
+For every logged stat (goals, assists, turnovers) a Poisson GLM predicts the
+next game from the player's log so far: the running mean and an exponentially
+weighted mean of every logged stat, plus games played. Training examples are
+every (player, game k) pair in the league logs, with features built from games
+before k, all as array operations over the padded log tensor.
+
+Counts are over-dispersed, so each target stores a dispersion factor φ
+(Pearson χ²/dof on the training set); intervals come from a negative
+binomial with the predicted mean and variance φ·μ.
+
+Draw controls have no per-game log, so they are projected at the season
+per-game rate with a plain Poisson interval.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+from scipy import stats
+
+import wlax_engine as engine
+import wlax_perf as perf
+
+MODEL_PATH = os.environ.get("WLAX_PROJECTIONS_MODEL",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         ".wlax_models", "projections.joblib"))
+FEATURE_VERSION = 1
+TARGETS = {"g": "game_g", "a": "game_a", "to": "game_to"}
+EWMA_ALPHA = 0.5
+INTERVAL = 0.8
+FEATURES = ([f"mean_{f}" for f in engine.LOG_FIELDS] + [f"ewma_{f}" for f in engine.LOG_FIELDS]
+            + ["games"])
+
+
+def cutoff_features(t):
+    """(players × cutoffs × FEATURES): features using games before each cutoff k = 0..G.
+
+    Cutoff 0 has no history (all zeros); cutoff G (or n_games) is "next game".
+    """
+    L = t.logs.astype(np.float64)                                         # (P, F, G)
+    P, F, G = L.shape
+    played = np.minimum(np.arange(G + 1)[None, :], t.n_games[:, None])    # (P, G+1)
+    cum = np.concatenate([np.zeros((P, F, 1)), np.cumsum(L, axis=2)], axis=2)
+    mean = cum / np.maximum(played, 1)[:, None, :]
+    ewma = np.zeros((P, F, G + 1))
+    for k in range(1, G + 1):
+        new = (k <= t.n_games)[:, None]
+        step = np.where(k == 1, L[:, :, 0], EWMA_ALPHA * L[:, :, k - 1] + (1 - EWMA_ALPHA) * ewma[:, :, k - 1])
+        ewma[:, :, k] = np.where(new, step, ewma[:, :, k - 1])
+    return np.concatenate([np.moveaxis(mean, 1, 2), np.moveaxis(ewma, 1, 2), played[:, :, None]], axis=2)
+
+
+def training_set(t):
+    """Every (player, game k ≥ 1) example: features from games < k, targets from game k."""
+    X = cutoff_features(t)[:, :-1, :]                                      # cutoffs 0..G-1
+    G = t.logs.shape[2]
+    keep = (np.arange(G)[None, :] < t.n_games[:, None]) & (np.arange(G)[None, :] >= 1)
+    Y = {k: t.log(log).astype(np.float64)[keep] for k, log in TARGETS.items()}
+    return X[keep], Y
+
+
+# ═══════════════════════════════════════════════
+# TRAIN / PERSIST
+# ═══════════════════════════════════════════════
+
+@perf.timed("projections_train")
+def train(tables, alpha=1.0):
+    """One Poisson GLM per target over the pooled examples of every table."""
+    from sklearn.linear_model import PoissonRegressor
+    parts = [training_set(t) for t in tables]
+    X = np.concatenate([x for x, _ in parts])
+    model = {"feature_version": FEATURE_VERSION, "features": FEATURES, "n_train": int(len(X)), "targets": {}}
+    for k in TARGETS:
+        y = np.concatenate([ys[k] for _, ys in parts])
+        glm = PoissonRegressor(alpha=alpha, max_iter=300).fit(X, y)
+        mu = glm.predict(X)
+        phi = float(max(np.sum((y - mu) ** 2 / np.maximum(mu, 1e-9)) / max(len(y) - X.shape[1] - 1, 1), 1.0))
+        model["targets"][k] = {"coef": glm.coef_, "intercept": float(glm.intercept_), "phi": phi}
+    return model
+
+
+def save_model(model, path=MODEL_PATH):
+    import joblib
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_model(path=MODEL_PATH):
+    """The persisted model, or None if it's missing or was trained on another feature set."""
+    if not os.path.exists(path):
+        return None
+    import joblib
+    model = joblib.load(path)
+    return model if model.get("feature_version") == FEATURE_VERSION else None
+
+
+# ═══════════════════════════════════════════════
+# BATCHED INFERENCE
+# ═══════════════════════════════════════════════
+
+def _interval(mu, phi, q):
+    """Negative-binomial quantile with mean mu and variance phi·mu (Poisson when phi == 1)."""
+    mu = np.maximum(mu, 1e-9)
+    if phi <= 1.0 + 1e-9:
+        return stats.poisson.ppf(q, mu)
+    n = mu / (phi - 1)
+    return stats.nbinom.ppf(q, n, 1 / phi)
+
+
+@perf.timed("projections_predict")
+def project(model, t, interval=INTERVAL):
+    """Next-game mean and interval for every player and target, as {stat: {"mean", "lo", "hi"}} arrays."""
+    X = cutoff_features(t)[np.arange(len(t)), t.n_games.astype(np.intp)]
+    lo_q, hi_q = (1 - interval) / 2, 1 - (1 - interval) / 2
+    out = {}
+    for k, p in model["targets"].items():
+        mu = np.exp(X @ p["coef"] + p["intercept"])
+        out[k] = {"mean": mu, "lo": _interval(mu, p["phi"], lo_q), "hi": _interval(mu, p["phi"], hi_q)}
+    dc = t.col("dc") / np.maximum(t.col("gp"), 1)
+    out["dc"] = {"mean": dc, "lo": _interval(dc, 1.0, lo_q), "hi": _interval(dc, 1.0, hi_q)}
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or apply next-game projections.")
+    parser.add_argument("command", choices=["train", "show"])
+    parser.add_argument("rosters", nargs="*", help="roster JSON files (load_data players shape); default: ours")
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+    if args.command == "train":
+        tables = []
+        for path in args.rosters or [None]:
+            if path is None:
+                players = engine.load_clean_data()[0]
+            else:
+                with open(path) as f:
+                    players = json.load(f)
+            tables.append(engine.build_table(players))
+        model = train(tables)
+        print(save_model(model, args.model))
+        print(model["n_train"], {k: round(v["phi"], 2) for k, v in model["targets"].items()})
+    else:
+        model = load_model(args.model)
+        if model is None:
+            parser.error(f"no compatible model at {args.model}; run train first")
+        t = engine.build_table(engine.load_clean_data()[0])
+        proj = project(model, t)
+        for i, name in enumerate(t.names):
+            print(f"{name:24s} " + "  ".join(f"{k} {v['mean'][i]:.2f} [{v['lo'][i]:.0f}-{v['hi'][i]:.0f}]"
+                                             for k, v in proj.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Role discovery: k-means archetypes over per-game rates and sub-scores.
+
+    python wlax_roles.py fit league_rosters.json [more.json ...]   # offline fit, writes the model
+    python wlax_roles.py show                                      # our roster's assignments
+
+The model is a MiniBatchKMeans fit on standardized feature vectors pooled
+from league rosters, persisted with joblib. Only the scaler and centroids are
+needed afterwards: assigning a player is k distance computations, done for
+the whole table in one array expression. Each cluster is named from its
+centroid's most distinctive feature.
+
+Goalkeepers are never clustered; they keep the "Goalkeeper" role.
+
+The sub-score features are always the built-in profile's (the model is fit on
+them), so a player's role doesn't move when the sidebar switches profiles.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+import wlax_engine as engine
+import wlax_perf as perf
+
+MODEL_PATH = os.environ.get("WLAX_ROLES_MODEL",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".wlax_models", "roles.joblib"))
+FEATURE_VERSION = 1
+N_ROLES = 6
+MIN_GP = 2
+
+# (feature, archetype named after it when it is a centroid's strongest trait)
+FEATURES = [("gpg", "Finisher"), ("apg", "Playmaker"), ("sh_pct", "Sniper"), ("dcpg", "Draw Specialist"),
+            ("gbpg", "Ground-Ball Hunter"), ("ctpg", "Disruptor"), ("topg", "High-Volume Carrier"),
+            ("offensive", "Attacker"), ("defensive", "Stopper"), ("possession", "Possession Engine"),
+            ("efficiency", "Efficient Role Player"), ("discipline", "Steady Hand")]
+GK_ROLE = "Goalkeeper"
+DEPTH_ROLE = "Depth Player"
+DEPTH_Z = 0.25   # a centroid no more than this many SDs above average on anything
+
+
+def role_features(t):
+    """(players × FEATURES) matrix from an analyzed PlayerTable, sub-scores rescored under the default profile."""
+    gp = np.maximum(t.col("gp"), 1)
+    scores = engine.compute_scores_table(t, t.metrics, engine.compute_team_avg(t), profile=engine.DEFAULT_COMPILED)
+    cols = {"gpg": t.metrics["gpg"], "apg": t.metrics["apg"], "sh_pct": t.col("sh_pct"),
+            "dcpg": t.col("dc") / gp, "gbpg": t.col("gb") / gp, "ctpg": t.col("ct") / gp,
+            "topg": t.col("to") / gp}
+    cols.update({k: scores[k] for k in ("offensive", "defensive", "possession", "efficiency", "discipline")})
+    return np.column_stack([np.asarray(cols[f], dtype=np.float64) for f, _ in FEATURES])
+
+
+def eligible(t):
+    """Rows that take part in fitting: skaters with enough games for stable rates."""
+    return ~engine.is_pos(t, "GK") & (t.stats["gp"] >= MIN_GP)
+
+
+# ═══════════════════════════════════════════════
+# FIT / PERSIST
+# ═══════════════════════════════════════════════
+
+def name_clusters(centroids_z):
+    """Archetype per centroid from its highest z-score; repeats get their runner-up trait in brackets."""
+    labels = []
+    for c in centroids_z:
+        order = np.argsort(-c)
+        label = DEPTH_ROLE if c[order[0]] <= DEPTH_Z else FEATURES[order[0]][1]
+        if label in labels:
+            label = f"{label} ({FEATURES[order[1]][1]})"
+        labels.append(label)
+    return labels
+
+
+@perf.timed("roles_fit")
+def fit_roles(X, k=N_ROLES, seed=0, batch_size=2048):
+    """Fit the archetype model on a pooled feature matrix (rows = player-seasons)."""
+    from sklearn.cluster import MiniBatchKMeans
+    mean, std = X.mean(axis=0), X.std(axis=0)
+    std[std == 0] = 1
+    Z = (X - mean) / std
+    k = min(k, len(Z))
+    km = MiniBatchKMeans(n_clusters=k, batch_size=batch_size, n_init=3, random_state=seed).fit(Z)
+    return {"feature_version": FEATURE_VERSION, "mean": mean, "std": std, "centroids": km.cluster_centers_,
+            "labels": name_clusters(km.cluster_centers_), "n_fit": int(len(Z)), "inertia": float(km.inertia_)}
+
+
+def save_model(model, path=MODEL_PATH):
+    import joblib
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_model(path=MODEL_PATH):
+    """The persisted model, or None if it's missing or was fit on another feature set."""
+    if not os.path.exists(path):
+        return None
+    import joblib
+    model = joblib.load(path)
+    return model if model.get("feature_version") == FEATURE_VERSION else None
+
+
+# ═══════════════════════════════════════════════
+# ASSIGN
+# ═══════════════════════════════════════════════
+
+@perf.timed("roles_assign")
+def assign_roles(model, t):
+    """Role label and centroid distance for every row (k distances per player)."""
+    Z = (role_features(t) - model["mean"]) / model["std"]
+    d2 = ((Z[:, None, :] - model["centroids"][None, :, :]) ** 2).sum(axis=2)
+    code = d2.argmin(axis=1)
+    labels = np.asarray(model["labels"], dtype=object)[code]
+    labels[engine.is_pos(t, "GK")] = GK_ROLE
+    return {"code": code, "role": labels.tolist(), "distance": np.sqrt(d2[np.arange(len(code)), code])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit or inspect role archetypes.")
+    parser.add_argument("command", choices=["fit", "show"])
+    parser.add_argument("rosters", nargs="*", help="roster JSON files (load_data players shape); default: ours")
+    parser.add_argument("--k", type=int, default=N_ROLES)
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+    if args.command == "fit":
+        pools = []
+        for path in args.rosters or [None]:
+            if path is None:
+                players = engine.load_clean_data()[0]
+            else:
+                with open(path) as f:
+                    players = json.load(f)
+            _, t = engine.build_analysis(players)
+            pools.append(role_features(t)[eligible(t)])
+        model = fit_roles(np.concatenate(pools), k=args.k)
+        print(save_model(model, args.model))
+        print(model["labels"], model["n_fit"])
+    else:
+        model = load_model(args.model)
+        if model is None:
+            parser.error(f"no compatible model at {args.model}; run fit first")
+        _, t = engine.build_analysis(engine.load_clean_data()[0])
+        for name, role in zip(t.names, assign_roles(model, t)["role"]):
+            print(f"{name:24s} {role}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Player search for pickers: prefix and fuzzy matching over names, numbers, team and position.
+
+The index is built once per data version and answers one keystroke with a
+handful of bisects over a sorted token list (prefix matches) plus, when
+those run short, a count over trigram postings (typo-tolerant matches).
+Matching works on candidate row ids, never a full row mask per word, so a
+keystroke costs about as much as it matches. Pickers then show only the top-k rows instead of an option per
+player, so widget payloads stay small however large the roster is.
+
+Every word of the query has to prefix-match some token of a player (name
+words, full name, "12"/"#12", position, team). Results rank exact matches,
+then full-name prefixes, then token prefixes, then fuzzy matches; ties go to
+the caller's `rank` (e.g. impact score).
+"""
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+import wlax_perf as perf
+
+TOP_K = 8
+FUZZY_MIN = 0.34   # share of the query's trigrams a fuzzy match must contain
+DENSE_SHARE = 0.125   # candidate sets this share of the rows or larger use a row mask instead of sorting
+FEW_CANDIDATES = 128   # this few candidates are checked against their own tokens rather than a word's key span
+
+
+def normalize(text):
+    """Lowercase, accents stripped, whitespace collapsed."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return " ".join(text.lower().split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@perf.timed("search_index")
+def build_index(names, nums=None, pos=None, team=None):
+    """Index over row ids 0..n-1; `nums`/`pos` are per-row, `team` a per-row list or one name for all."""
+    n = len(names)
+    full = [normalize(x) for x in names]
+    tokens, owners, row_tokens = [], [], []
+    for i, name in enumerate(full):
+        row = set(name.split()) | {name}
+        if nums is not None:
+            row |= {str(nums[i]), f"#{nums[i]}"}
+        if pos is not None:
+            row.add(normalize(pos[i]))
+        if team is not None:
+            t = normalize(team if isinstance(team, str) else team[i])
+            row |= {t} | set(t.split())
+        tokens.extend(row)
+        owners.extend([i] * len(row))
+        row_tokens.append(tuple(row))
+    order = sorted(range(len(tokens)), key=tokens.__getitem__)
+    by_full = sorted(range(n), key=full.__getitem__)
+    postings = {}
+    for i, name in enumerate(full):
+        for g in trigrams(name):
+            postings.setdefault(g, []).append(i)
+    return {"n": n, "names": list(names), "full": full, "keys": [tokens[j] for j in order],
+            "owners": np.asarray([owners[j] for j in order], dtype=np.int64), "row_tokens": row_tokens,
+            "full_keys": [full[i] for i in by_full], "full_owners": np.asarray(by_full, dtype=np.int64),
+            "exact": {k: np.asarray(v) for k, v in _group(tokens, owners).items()},
+            "postings": {g: np.asarray(ids, dtype=np.int64) for g, ids in postings.items()}}
+
+
+def _group(tokens, owners):
+    out = {}
+    for t, i in zip(tokens, owners):
+        out.setdefault(t, []).append(i)
+    return out
+
+
+def _span(keys, word):
+    """[lo, hi) of the sorted keys starting with `word` (two bisects)."""
+    lo = bisect_left(keys, word)
+    return lo, bisect_left(keys, word + "\uffff", lo)
+
+
+def _prefix(keys, owners, word):
+    """Owners of every sorted key starting with `word`."""
+    lo, hi = _span(keys, word)
+    return owners[lo:hi]
+
+
+def _ids(owners, n):
+    """Sorted, de-duplicated row ids.
+
+    Small sets are sorted; sets already past DENSE_SHARE of the rows go
+    through a row mask, which then costs about as much as the matches.
+    """
+    if len(owners) >= n * DENSE_SHARE:
+        mask = np.zeros(n, dtype=bool)
+        mask[owners] = True
+        return np.flatnonzero(mask)
+    ids = np.sort(owners)
+    return ids[np.r_[True, ids[1:] != ids[:-1]]] if len(ids) else ids
+
+
+def _member(ids, members, n):
+    """Boolean mask: which of `ids` are among `members` (any order, repeats allowed)."""
+    if not len(members):
+        return np.zeros(len(ids), dtype=bool)
+    if len(members) >= n * DENSE_SHARE:
+        mask = np.zeros(n, dtype=bool)
+        mask[members] = True
+        return mask[ids]
+    members = _ids(members, n)
+    pos = np.minimum(np.searchsorted(members, ids), len(members) - 1)
+    return members[pos] == ids
+
+
+def search(index, query, k=TOP_K, allowed=None, rank=None):
+    """Row ids of the top-k matches for `query`; `allowed` is a boolean row mask, `rank` a higher-is-better tiebreak.
+
+    Works on candidate id arrays: the narrowest query word's owner slice,
+    narrowed by each further word (a sorted intersection, or a look at the
+    candidates' own tokens once they are few), so a keystroke costs about
+    the number of matches rather than the number of rows.
+    """
+    q = normalize(query)
+    n = index["n"]
+    words = q.split()
+    if not words:   # empty box: everyone allowed, best-ranked first
+        found = np.arange(n) if allowed is None else np.flatnonzero(allowed)
+        quality = np.zeros(len(found))
+    else:
+        spans = sorted((_span(index["keys"], w), w) for w in set(words))
+        spans.sort(key=lambda sw: sw[0][1] - sw[0][0])   # narrowest word first
+        (lo, hi), _ = spans[0]
+        found = _ids(index["owners"][lo:hi], n)
+        for (lo, hi), w in spans[1:]:
+            if len(found) <= FEW_CANDIDATES < hi - lo:
+                rows = index["row_tokens"]
+                found = found[[any(t.startswith(w) for t in rows[i]) for i in found.tolist()]]
+            else:
+                found = found[_member(found, index["owners"][lo:hi], n)]
+        if allowed is not None:
+            found = found[allowed[found]]
+        # Exact token and full-name-prefix matches always match every word, so they're already in `found`
+        exact = index["exact"].get(q, np.zeros(0, dtype=np.int64))
+        full_hit = _prefix(index["full_keys"], index["full_owners"], q)
+        quality = np.where(_member(found, exact, n), 0.0, np.where(_member(found, full_hit, n), 1.0, 2.0))
+        if len(found) < k:
+            grams = [index["postings"][g] for g in trigrams(q) if g in index["postings"]]
+            if grams:
+                posted = np.concatenate(grams)
+                if len(posted) >= n * DENSE_SHARE:
+                    hits = np.bincount(posted, minlength=n)
+                    ids = np.flatnonzero(hits)
+                    hits = hits[ids]
+                else:
+                    posted = np.sort(posted)
+                    starts = np.flatnonzero(np.r_[True, posted[1:] != posted[:-1]])
+                    ids, hits = posted[starts], np.diff(np.r_[starts, len(posted)])
+                score = hits / len(trigrams(q))
+                fuzzy = (score >= FUZZY_MIN) & ~_member(ids, found, n)
+                if allowed is not None:
+                    fuzzy &= allowed[ids]
+                found = np.concatenate([found, ids[fuzzy]])
+                quality = np.concatenate([quality, 3 + (1 - score[fuzzy])])   # better trigram overlap first
+    if len(found) > k:   # narrow to k in O(matches): everything better than the k-th, then the best-ranked ties
+        kth = np.partition(quality, k - 1)[k - 1]
+        better, tied = quality < kth, np.flatnonzero(quality == kth)
+        need = k - int(better.sum())
+        if rank is not None and len(tied) > need:
+            tied = tied[np.argpartition(-np.asarray(rank)[found[tied]], need - 1)[:need]]
+        pick = np.concatenate([np.flatnonzero(better), tied[:need]])
+        found, quality = found[pick], quality[pick]
+    tiebreak = -np.asarray(rank)[found] if rank is not None else found
+    return found[np.lexsort((tiebreak, quality))][:k].tolist()
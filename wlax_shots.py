@@ -0,0 +1,174 @@
+"""Shot-event table and spatial binning for shooter and goalkeeper heat maps.
+
+Shots are stored column-wise in one structured array (shooter and goalie as
+integer codes into name lists), loaded from a CSV with columns
+
+    shooter, goalie, game, x, y, outcome, situation
+
+Coordinates are metres from the centre of the goal line: x across the field
+(negative = the goalie's left), y out toward midfield. Outcomes: miss,
+blocked, saved, goal.
+
+Aggregation is one np.bincount per count over a flat (player, bin) index, so
+every shooter's and every goalie's grid and zone totals come out of a single
+pass over the events, however many players there are.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import wlax_perf as perf
+
+SHOTS_PATH = os.environ.get("WLAX_SHOTS_PATH", "")
+
+OUTCOMES = ["miss", "blocked", "saved", "goal"]
+SITUATIONS = ["settled", "free_position", "transition", "man_up", "man_down"]
+ON_GOAL = (OUTCOMES.index("saved"), OUTCOMES.index("goal"))
+
+SHOT_DTYPE = np.dtype([("shooter", "i4"), ("goalie", "i4"), ("game", "i2"), ("x", "f4"), ("y", "f4"),
+                       ("outcome", "u1"), ("situation", "u1")])
+
+X_EDGES = np.linspace(-15, 15, 11)   # 3 m columns
+Y_EDGES = np.linspace(0, 18, 10)     # 2 m rows; shots from behind the goal land in the first row
+ZONE_RINGS = [("crease", 3), ("8m", 8), ("12m", 12), ("outside", np.inf)]
+ZONE_SIDES = ["left", "center", "right"]
+ZONES = [f"{r} {s}" for r, _ in ZONE_RINGS for s in ZONE_SIDES]
+SIDE_ANGLE = 30   # degrees off the centre line
+
+
+# ═══════════════════════════════════════════════
+# EVENT TABLE
+# ═══════════════════════════════════════════════
+
+def shots_from_frame(df):
+    """Shot-event DataFrame → {"events", "shooters", "goalies", "digest", name → code indexes}.
+
+    Unknown outcomes/situations raise; a blank goalie (empty net, missed wide)
+    is coded -1.
+    """
+    ev = np.zeros(len(df), dtype=SHOT_DTYPE)
+    ev["shooter"], shooters = pd.factorize(df["shooter"])
+    goalie = df["goalie"].fillna("").astype(str) if "goalie" in df else pd.Series([""] * len(df))
+    codes, goalies = pd.factorize(goalie.where(goalie != ""))
+    ev["goalie"] = codes
+    ev["game"] = df["game"].to_numpy() if "game" in df else 0
+    ev["x"], ev["y"] = df["x"].to_numpy(np.float32), df["y"].to_numpy(np.float32)
+    for col, vocab in (("outcome", OUTCOMES), ("situation", SITUATIONS)):
+        values = df[col].fillna(vocab[0]) if col in df else pd.Series([vocab[0]] * len(df))
+        lookup = pd.Series(range(len(vocab)), index=vocab)
+        mapped = values.map(lookup)
+        if mapped.isna().any():
+            raise ValueError(f"unknown {col}: {sorted(set(values[mapped.isna()]))}")
+        ev[col] = mapped.to_numpy()
+    digest = hashlib.sha256(ev.tobytes() + "\0".join(list(shooters) + list(goalies)).encode()).hexdigest()[:16]
+    return {"events": ev, "shooters": list(shooters), "goalies": list(goalies), "digest": digest,
+            "shooter_index": {n: i for i, n in enumerate(shooters)},
+            "goalie_index": {n: i for i, n in enumerate(goalies)}}
+
+
+@perf.timed()
+def load_shots(path=SHOTS_PATH):
+    """Shot table from CSV, or None when no shot file is configured."""
+    if not path or not os.path.exists(path):
+        return None
+    return shots_from_frame(pd.read_csv(path))
+
+
+def synthetic_shots(n, shooters, goalies, seed=0):
+    """Random but plausible shot events, for benchmarks and demos only (not real tracking data)."""
+    rng = np.random.default_rng(seed)
+    r = np.abs(rng.normal(7, 3.5, n))
+    theta = rng.normal(0, 0.6, n)
+    x, y = r * np.sin(theta), r * np.cos(theta)
+    p_goal = np.clip(0.65 - 0.035 * r - 0.1 * np.abs(theta), 0.05, 0.8)
+    on_goal = rng.random(n) < 0.72
+    outcome = np.where(~on_goal, np.where(rng.random(n) < 0.4, "blocked", "miss"),
+                       np.where(rng.random(n) < p_goal / 0.72, "goal", "saved"))
+    situation = rng.choice(SITUATIONS, n, p=[0.68, 0.12, 0.1, 0.06, 0.04])
+    free = situation == "free_position"
+    x[free], y[free] = rng.normal(0, 1.5, free.sum()), rng.normal(8, 0.3, free.sum())
+    return pd.DataFrame({"shooter": rng.choice(shooters, n), "goalie": rng.choice(goalies, n),
+                         "game": rng.integers(0, 20, n), "x": x, "y": y,
+                         "outcome": outcome, "situation": situation})
+
+
+# ═══════════════════════════════════════════════
+# BINNING
+# ═══════════════════════════════════════════════
+
+def grid_bins(ev):
+    """Flat grid-cell index per shot (clipped into the edge cells)."""
+    nx, ny = len(X_EDGES) - 1, len(Y_EDGES) - 1
+    ix = np.clip(np.searchsorted(X_EDGES, ev["x"], side="right") - 1, 0, nx - 1)
+    iy = np.clip(np.searchsorted(Y_EDGES, ev["y"], side="right") - 1, 0, ny - 1)
+    return iy * nx + ix
+
+
+def zone_ids(ev):
+    """Zone index (ring × side) per shot, matching ZONES."""
+    x, y = ev["x"].astype(np.float64), ev["y"].astype(np.float64)
+    ring = np.searchsorted([d for _, d in ZONE_RINGS], np.hypot(x, y), side="right").clip(0, len(ZONE_RINGS) - 1)
+    angle = np.degrees(np.arctan2(x, np.maximum(y, 0)))
+    side = np.where(angle < -SIDE_ANGLE, 0, np.where(angle > SIDE_ANGLE, 2, 1))
+    return ring * len(ZONE_SIDES) + side
+
+
+def _counts(who, cell, n_who, n_cells, weights=None):
+    keep = who >= 0
+    flat = who[keep].astype(np.int64) * n_cells + cell[keep]
+    w = None if weights is None else weights[keep]
+    return np.bincount(flat, weights=w, minlength=n_who * n_cells).reshape(n_who, n_cells)
+
+
+@perf.timed()
+def aggregate_shots(shots, situation=None):
+    """Every shooter's and goalie's grid and zone counts in one pass.
+
+    Returns {"shooter": {"shots", "on_goal", "goals", "zone_*"...}, "goalie": {"faced", "saves", ...}}
+    with grids shaped (players, ny, nx) and zone counts shaped (players, len(ZONES)).
+    `situation` restricts to one of SITUATIONS.
+    """
+    ev = shots["events"]
+    if situation is not None:
+        ev = ev[ev["situation"] == SITUATIONS.index(situation)]
+    cell, zone = grid_bins(ev), zone_ids(ev)
+    goal = ev["outcome"] == OUTCOMES.index("goal")
+    on_goal = np.isin(ev["outcome"], ON_GOAL)
+    shape = (len(Y_EDGES) - 1, len(X_EDGES) - 1)
+    n_cells, n_zones = shape[0] * shape[1], len(ZONES)
+    S, G = len(shots["shooters"]), len(shots["goalies"])
+
+    out = {"shooter": {}, "goalie": {}, "grid_shape": shape}
+    for key, w in (("shots", None), ("on_goal", on_goal), ("goals", goal)):
+        out["shooter"][key] = _counts(ev["shooter"], cell, S, n_cells, w).reshape(S, *shape)
+        out["shooter"]["zone_" + key] = _counts(ev["shooter"], zone, S, n_zones, w)
+    for key, w in (("faced", on_goal), ("saves", on_goal & ~goal)):
+        out["goalie"][key] = _counts(ev["goalie"], cell, G, n_cells, w).reshape(G, *shape)
+        out["goalie"]["zone_" + key] = _counts(ev["goalie"], zone, G, n_zones, w)
+    return out
+
+
+def shooter_zones(shots, agg, name):
+    """Per-zone shots, goals, shooting % and share of the player's attempts."""
+    i = shots["shooter_index"].get(name)
+    if i is None:
+        return None
+    a = agg["shooter"]
+    df = pd.DataFrame({"zone": ZONES, "shots": a["zone_shots"][i], "on_goal": a["zone_on_goal"][i],
+                       "goals": a["zone_goals"][i]})
+    df["sh_pct"] = np.where(df["shots"] > 0, df["goals"] / df["shots"].clip(lower=1) * 100, np.nan)
+    df["share"] = df["shots"] / max(df["shots"].sum(), 1) * 100
+    return df[df["shots"] > 0].reset_index(drop=True)
+
+
+def goalie_zones(shots, agg, name):
+    """Per-zone shots on goal faced, saves and save %."""
+    i = shots["goalie_index"].get(name)
+    if i is None:
+        return None
+    a = agg["goalie"]
+    df = pd.DataFrame({"zone": ZONES, "faced": a["zone_faced"][i], "saves": a["zone_saves"][i]})
+    df["sv_pct"] = np.where(df["faced"] > 0, df["saves"] / df["faced"].clip(lower=1) * 100, np.nan)
+    return df[df["faced"] > 0].reset_index(drop=True)
@@ -0,0 +1,263 @@
+"""On-disk snapshots of the computed analysis.
+
+A snapshot is a directory of plain NumPy ``.npy`` files plus a JSON
+manifest. The PlayerTable's structured arrays (stats, metrics, scores), score
+contributions, game logs, tiers and flag bitmask are saved as-is and opened with
+``mmap_mode="r"``, so the table a worker serves from *is* the mapped file:
+several processes mapping the same snapshot share page-cache pages instead
+of each holding a private copy. The directory name is a content hash of the
+inputs and the engine source, so a stale snapshot is never read back.
+
+Every snapshot served is also appended to a version log (versions.jsonl in
+the snapshot root) with its creation time, games and scoring profile, so
+wlax_changes can diff any two versions of the analysis.
+
+Retention: each new snapshot triggers a sweep that keeps the KEEP_PER_PROFILE
+newest logged versions of every profile (what the Change Feed offers) plus
+the snapshot being served, and removes every other snapshot directory,
+including stale-format ones, along with leftover temp dirs and their log rows.
+
+Text columns use Arrow-style encodings:
+  str       UTF-8 bytes + int64 offsets (names, notes)
+  list_str  dictionary codes + int64 offsets, vocabulary stored as a str column (recs)
+"""
+import datetime as dt
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import wlax_engine as engine
+import wlax_perf as perf
+
+SNAPSHOT_VERSION = 4
+SNAPSHOT_DIR = os.environ.get("WLAX_SNAPSHOT_DIR",
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), ".wlax_snapshot"))
+VERSIONS_FILE = "versions.jsonl"
+KEEP_PER_PROFILE = int(os.environ.get("WLAX_SNAPSHOT_KEEP", 8))
+TMP_MAX_AGE_S = 3600   # an unfinished write older than this is abandoned
+
+with open(engine.__file__, "rb") as _f:
+    _ENGINE_DIGEST = hashlib.sha256(_f.read()).hexdigest()
+
+
+def content_hash(players, games, game_results, finishing=None, profile_digest=None):
+    """Hash of everything the analysis depends on: inputs, xG finishing, scoring profile, engine source and version."""
+    h = hashlib.sha256()
+    h.update(f"v{SNAPSHOT_VERSION}:{_ENGINE_DIGEST}".encode())
+    if profile_digest is not None:
+        h.update(f"profile:{profile_digest}".encode())
+    h.update(json.dumps([players, games, game_results, finishing or {}], sort_keys=True, default=float).encode())
+    return h.hexdigest()[:16]
+
+
+# ═══════════════════════════════════════════════
+# TEXT ENCODING
+# ═══════════════════════════════════════════════
+
+def _encode_str(values):
+    blob = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(blob) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in blob])
+    return {"data": np.frombuffer(b"".join(blob), dtype=np.uint8), "offsets": offsets}
+
+
+def _encode_list_str(values):
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(v) for v in values])
+    flat = [x for v in values for x in v]
+    vocab = list(dict.fromkeys(flat))
+    index = {s: i for i, s in enumerate(vocab)}
+    cols = {"codes": np.array([index[s] for s in flat], dtype=np.int32), "offsets": offsets}
+    cols.update({f"vocab.{k}": a for k, a in _encode_str(vocab).items()})
+    return cols
+
+
+def _decode_str(data, offsets):
+    raw = bytes(data)
+    offsets = offsets.tolist()
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+def _decode_list_str(cols):
+    vocab = _decode_str(cols["vocab.data"], cols["vocab.offsets"])
+    flat = [vocab[c] for c in cols["codes"].tolist()]
+    offsets = cols["offsets"].tolist()
+    return [flat[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+ARRAYS = ["stats", "logs", "n_games", "finishing", "metrics", "scores", "contrib", "tier", "flags"]
+TEXTS = {"names": "str", "notes": "str", "recs": "list_str"}
+
+
+# ═══════════════════════════════════════════════
+# WRITE / OPEN
+# ═══════════════════════════════════════════════
+
+@perf.timed("snapshot_write")
+def write_snapshot(digest, team_avg, table, games, game_results, root=SNAPSHOT_DIR):
+    """Write a snapshot atomically (temp dir + rename); a concurrent writer of the same digest wins harmlessly."""
+    final = os.path.join(root, digest)
+    if os.path.isdir(final):
+        return final
+    os.makedirs(root, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=f".{digest}-", dir=root)
+    files = {}
+    for name in ARRAYS:
+        np.save(os.path.join(tmp, f"{name}.npy"), getattr(table, name))
+        files[name] = [""]
+    for name, kind in TEXTS.items():
+        arrays = (_encode_str if kind == "str" else _encode_list_str)(getattr(table, name))
+        for suffix, arr in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.{suffix}.npy"), arr)
+        files[name] = list(arrays)
+    manifest = {"version": SNAPSHOT_VERSION, "digest": digest, "n_players": len(table),
+                "team_avg": team_avg, "vocab": table.vocab, "games": games,
+                "game_results": game_results, "files": files}
+    with open(os.path.join(tmp, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+    try:
+        os.rename(tmp, final)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return final
+
+
+@perf.timed("snapshot_open")
+def open_snapshot(digest, root=SNAPSHOT_DIR):
+    """Map a snapshot read-only; returns None if it's missing or from another version."""
+    path = os.path.join(root, digest)
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("digest") != digest:
+        return None
+    arrays = {}
+    for name, suffixes in manifest["files"].items():
+        arrays[name] = {s: np.load(os.path.join(path, f"{name}.{s}.npy" if s else f"{name}.npy"), mmap_mode="r")
+                        for s in suffixes}
+    return {"manifest": manifest, "arrays": arrays}
+
+
+@perf.timed("snapshot_to_table")
+def snapshot_table(snap):
+    """PlayerTable whose numeric columns are the mapped snapshot arrays (no copy)."""
+    manifest, arrays = snap["manifest"], snap["arrays"]
+    t = engine.PlayerTable()
+    for name in ARRAYS:
+        setattr(t, name, arrays[name][""])
+    t.names = _decode_str(arrays["names"]["data"], arrays["names"]["offsets"])
+    t.notes = _decode_str(arrays["notes"]["data"], arrays["notes"]["offsets"])
+    t.recs = _decode_list_str(arrays["recs"])
+    t.index = {name: i for i, name in enumerate(t.names)}
+    t.vocab = manifest["vocab"]
+    t.build_entries()
+    return t
+
+
+# ═══════════════════════════════════════════════
+# VERSION LOG
+# ═══════════════════════════════════════════════
+
+def list_versions(root=SNAPSHOT_DIR, profile=None):
+    """Logged versions, oldest first: [{digest, created, games, last_game, profile}], optionally for one profile."""
+    try:
+        with open(os.path.join(root, VERSIONS_FILE)) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+    seen, out = set(), []
+    for row in rows:
+        if row["digest"] not in seen and (profile is None or row["profile"] == profile):
+            seen.add(row["digest"])
+            out.append(row)
+    return out
+
+
+def record_version(digest, games, profile_name, root=SNAPSHOT_DIR):
+    """Append `digest` to the version log unless it's already there (one short O_APPEND write)."""
+    if any(v["digest"] == digest for v in list_versions(root)):
+        return False
+    row = {"digest": digest, "created": dt.datetime.now().isoformat(timespec="seconds"), "games": len(games),
+           "last_game": games[-1] if games else None, "profile": profile_name}
+    with open(os.path.join(root, VERSIONS_FILE), "a") as f:
+        f.write(json.dumps(row) + "\n")
+    return True
+
+
+@perf.timed("snapshot_gc")
+def gc_snapshots(root=SNAPSHOT_DIR, keep=KEEP_PER_PROFILE, protect=()):
+    """Delete snapshots outside the retention policy; returns the removed directory names.
+
+    Kept: the `keep` newest logged versions of each profile and every digest
+    in `protect`. The version log is rewritten (temp file + rename) to the
+    kept rows, so the Change Feed never offers a deleted version; a version
+    appended meanwhile is logged again the next time it's served.
+    """
+    try:
+        entries = os.listdir(root)
+    except OSError:
+        return []
+    versions = list_versions(root)
+    by_profile = {}
+    for v in versions:
+        by_profile.setdefault(v["profile"], []).append(v["digest"])
+    live = {d for digests in by_profile.values() for d in (digests[-keep:] if keep > 0 else [])} | set(protect)
+    kept_rows = [v for v in versions if v["digest"] in live]
+    removed = []
+    now = time.time()
+    for name in entries:
+        path = os.path.join(root, name)
+        if not os.path.isdir(path) or name in live:
+            continue
+        if name.startswith("."):   # a temp dir: only once it's clearly abandoned
+            try:
+                if now - os.path.getmtime(path) < TMP_MAX_AGE_S:
+                    continue
+            except OSError:
+                continue
+        shutil.rmtree(path, ignore_errors=True)   # mapped files stay readable to processes already holding them
+        removed.append(name)
+    tmp = os.path.join(root, f".{VERSIONS_FILE}.{os.getpid()}")
+    with open(tmp, "w") as f:
+        f.writelines(json.dumps(v) + "\n" for v in kept_rows)
+    os.replace(tmp, os.path.join(root, VERSIONS_FILE))
+    return removed
+
+
+def load_or_build(digest, players, games, game_results, root=SNAPSHOT_DIR, finishing=None, profile=None):
+    """Return (team_avg, PlayerTable) from the snapshot for `digest`, building and writing it on a miss."""
+    snap = open_snapshot(digest, root)
+    perf.cache_event("snapshot", hit=snap is not None)
+    if snap is not None:
+        team_avg, table = snap["manifest"]["team_avg"], snapshot_table(snap)
+    else:
+        team_avg, table = engine.build_analysis(players, finishing, profile)
+        try:
+            write_snapshot(digest, team_avg, table, games, game_results, root)
+        except OSError:
+            return team_avg, table  # read-only deploys still serve, they just recompute per process
+    try:
+        record_version(digest, games, (profile or engine.DEFAULT_COMPILED)["name"], root)
+        if snap is None:
+            gc_snapshots(root, protect=(digest,))
+    except OSError:
+        pass
+    return team_avg, table
+
+
+if __name__ == "__main__":
+    # Pre-warm before starting workers: python wlax_store.py
+    import wlax_shots
+    import wlax_xg
+    players, games, game_results, _, _ = engine.load_clean_data()
+    finishing, _ = wlax_xg.season_finishing(wlax_shots.load_shots())
+    digest = content_hash(players, games, game_results, finishing)
+    load_or_build(digest, players, games, game_results, finishing=finishing)
+    print(os.path.join(SNAPSHOT_DIR, digest))
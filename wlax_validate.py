@@ -0,0 +1,139 @@
+"""Schema and cross-field validation for ingested box scores.
+
+Every check runs as a column operation over the whole batch, so a scraped
+league file is validated in one pass and all violations come back together
+with their row positions. Rows with errors are quarantined before scoring;
+warnings are reported but the row is kept.
+
+Severity split: season totals drive every score, so contradictions inside
+them (pts vs g+a, sh_pct vs g/sh, goalie fields) are errors. Per-game logs
+only feed consistency, clutch and the trend charts, and the published logs
+are often partial, so log-vs-total mismatches are warnings unless
+``strict=True``.
+"""
+import numpy as np
+import pandas as pd
+
+REQUIRED_INT = ["num", "gp", "gs", "g", "a", "pts", "sh", "sog", "gb", "dc", "to", "ct",
+                "fpg", "fps", "yc", "gc"]
+REQUIRED_FLOAT = ["sh_pct", "sog_pct"]
+REQUIRED_STR = ["pos", "yr"]
+GAME_LOGS = {"game_g": "g", "game_a": "a", "game_pts": "pts", "game_sh": "sh", "game_to": "to"}
+GK_FIELDS = ["gk_min", "gk_ga", "gk_gaa", "gk_sv", "gk_sv_pct"]
+POSITIONS = {"A", "M", "D", "GK"}
+
+PCT_TOL = 0.1     # percentages are published to one decimal
+GAA_TOL = 0.011   # GAA to two decimals
+GAME_MINUTES = 60
+
+VIOLATION_COLUMNS = ["row", "name", "check", "severity", "expected", "actual"]
+
+
+def players_frame(players):
+    """Roster dict → one row per player (game logs stay as list cells)."""
+    return pd.DataFrame.from_dict(players, orient="index")
+
+
+def _log_arrays(col, n):
+    """Flatten a column of per-game lists: (lengths, row_ids, values); non-lists get length -1."""
+    cells = col.to_numpy() if col is not None else np.full(n, None, dtype=object)
+    is_list = np.fromiter((isinstance(c, (list, tuple, np.ndarray)) for c in cells), bool, n)
+    lengths = np.where(is_list, np.fromiter((len(c) if ok else 0 for c, ok in zip(cells, is_list)), np.int64, n), -1)
+    kept = cells[is_list]
+    values = (pd.to_numeric(pd.Series(np.concatenate(kept)), errors="coerce").to_numpy(float)
+              if len(kept) and lengths.clip(0).sum() else np.zeros(0))
+    row_ids = np.repeat(np.arange(n), lengths.clip(0))
+    return lengths, row_ids, values
+
+
+def validate(df, strict=False):
+    """Run all checks over a players frame; returns a violations DataFrame (one row per failed check per player)."""
+    n = len(df)
+    names = df.index.to_numpy()
+    out = []
+
+    def add(mask, check, severity, expected, actual):
+        mask = np.asarray(mask, bool)
+        if not mask.any():
+            return
+        idx = np.flatnonzero(mask)
+        exp = np.broadcast_to(np.asarray(expected, float), (n,))[idx]
+        act = np.broadcast_to(np.asarray(actual, float), (n,))[idx]
+        out.append(pd.DataFrame({"row": idx, "name": names[idx], "check": check,
+                                 "severity": severity, "expected": exp, "actual": act}))
+
+    def num(col):
+        if col not in df:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(float)
+
+    # Schema: presence, type and range
+    cols = {c: num(c) for c in REQUIRED_INT + REQUIRED_FLOAT}
+    for c in REQUIRED_INT + REQUIRED_FLOAT:
+        add(np.isnan(cols[c]), f"missing_or_non_numeric:{c}", "error", np.nan, np.nan)
+    for c in REQUIRED_INT:
+        v = cols[c]
+        add(~np.isnan(v) & ((v < 0) | (v != np.round(v))), f"not_non_negative_int:{c}", "error", np.nan, v)
+    for c in REQUIRED_STR:
+        missing = df[c].isna().to_numpy() if c in df else np.ones(n, bool)
+        add(missing, f"missing:{c}", "error", np.nan, np.nan)
+    if "pos" in df:
+        add(~df["pos"].isin(POSITIONS).to_numpy() & df["pos"].notna().to_numpy(), "unknown_position", "error", np.nan, np.nan)
+
+    g, a, pts, sh, sog, gp, gs = (cols[c] for c in ("g", "a", "pts", "sh", "sog", "gp", "gs"))
+
+    # Season totals must agree with each other
+    add(pts != g + a, "pts_eq_g_plus_a", "error", g + a, pts)
+    add(gs > gp, "gs_le_gp", "error", gp, gs)
+    add(sog > sh, "sog_le_sh", "error", sh, sog)
+    add(g > sog, "g_le_sog", "error", sog, g)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exp_sh_pct = np.where(sh > 0, g / sh * 100, 0.0)
+        exp_sog_pct = np.where(sh > 0, sog / sh * 100, 0.0)
+    add(np.abs(exp_sh_pct - cols["sh_pct"]) > PCT_TOL, "sh_pct_eq_g_over_sh", "error", exp_sh_pct, cols["sh_pct"])
+    add(np.abs(exp_sog_pct - cols["sog_pct"]) > PCT_TOL, "sog_pct_eq_sog_over_sh", "error", exp_sog_pct, cols["sog_pct"])
+
+    # Goalie fields, wherever any of them is present
+    gk = {c: num(c) for c in GK_FIELDS}
+    has_any = np.any([~np.isnan(v) for v in gk.values()], axis=0)
+    for c, v in gk.items():
+        add(has_any & np.isnan(v), f"missing_or_non_numeric:{c}", "error", np.nan, np.nan)
+    sv, ga, gmin = gk["gk_sv"], gk["gk_ga"], gk["gk_min"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exp_sv_pct = np.where(sv + ga > 0, sv / (sv + ga) * 100, 0.0)
+        exp_gaa = np.where(gmin > 0, ga / gmin * GAME_MINUTES, 0.0)
+    add(has_any & (np.abs(exp_sv_pct - gk["gk_sv_pct"]) > PCT_TOL), "gk_sv_pct_eq_sv_over_shots", "error",
+        exp_sv_pct, gk["gk_sv_pct"])
+    add(has_any & (np.abs(exp_gaa - gk["gk_gaa"]) > GAA_TOL), "gk_gaa_eq_ga_per_60", "error", exp_gaa, gk["gk_gaa"])
+    if "pos" in df:
+        add(df["pos"].eq("GK").to_numpy() & ~has_any, "gk_fields_missing", "warning", np.nan, np.nan)
+
+    # Game logs: structure is an error, disagreement with totals is a warning
+    log_severity = "error" if strict else "warning"
+    logs = {c: _log_arrays(df[c] if c in df else None, n) for c in GAME_LOGS}
+    for c, total in GAME_LOGS.items():
+        lengths, row_ids, values = logs[c]
+        add(lengths < 0, f"missing_log:{c}", "error", np.nan, np.nan)
+        add((lengths >= 0) & (lengths != gp), f"log_len_eq_gp:{c}", "error", gp, lengths)
+        bad_vals = np.bincount(row_ids, weights=np.isnan(values) | (values < 0), minlength=n) > 0
+        add(bad_vals, f"log_values_non_negative:{c}", "error", np.nan, np.nan)
+        sums = np.bincount(row_ids, weights=np.nan_to_num(values), minlength=n)
+        add((lengths >= 0) & (sums != cols[total]), f"log_sum_eq_total:{c}", log_severity, cols[total], sums)
+    # game_pts == game_g + game_a, element by element, on the rows whose three logs line up
+    (lg, rg, vg), (la, ra, va), (lp, rp, vp) = logs["game_g"], logs["game_a"], logs["game_pts"]
+    aligned = (lg >= 0) & (lg == la) & (lg == lp)
+    vg, va, vp, rg = vg[aligned[rg]], va[aligned[ra]], vp[aligned[rp]], rg[aligned[rg]]
+    bad = np.bincount(rg, weights=vp != vg + va, minlength=n) > 0
+    add(bad, "log_pts_eq_g_plus_a", log_severity, np.nan, np.nan)
+
+    if not out:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return pd.concat(out, ignore_index=True).sort_values(["row", "severity"], kind="stable").reset_index(drop=True)
+
+
+def clean_players(players, strict=False):
+    """Validate a roster dict; returns (players without quarantined rows, violations, quarantined names)."""
+    violations = validate(players_frame(players), strict=strict)
+    quarantined = sorted(set(violations.loc[violations["severity"] == "error", "name"]))
+    kept = {k: v for k, v in players.items() if k not in quarantined}
+    return kept, violations, quarantined
@@ -0,0 +1,254 @@
+"""Practice and game workload from GPS/accelerometer exports, joined to the game logs.
+
+    python wlax_workload.py ingest <exports_dir>       # new files only; appends to the sessions table
+    python wlax_workload.py show                       # per-game acute load and ACWR for our roster
+
+Exports are one CSV per athlete per session at 10 Hz or more, laid out as
+
+    <exports_dir>/<YYYY-MM-DD>[_<label>]/<Player Name>.csv
+
+with columns ``time`` (seconds), ``speed`` (m/s) and ``ax, ay, az`` (g).
+
+Each file is streamed in fixed-size blocks with pyarrow's CSV reader, so
+memory is bounded by the block size however long or fast the recording is.
+Per block, samples are downsampled into 1 s bins (sum/count per second, the
+partial last second carried into the next block) and PlayerLoad is
+accumulated from accelerometer deltas (the last sample carried across the
+block boundary). Speed-based metrics (distance, high-speed running, sprints,
+accelerations, peak speed) are taken from the 1 Hz trace, which smooths GPS
+noise; its size depends on session length only.
+
+Sessions are one row each in a Parquet table. ``game_load`` joins them to
+the game logs: for every player and game, acute load (PlayerLoad over the 7
+days before the game), chronic load (weekly average over 28 days) and their
+ratio, as (players × games) arrays aligned with PlayerTable.logs.
+"""
+import argparse
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+import wlax_perf as perf
+
+SESSIONS_PATH = os.environ.get("WLAX_WORKLOAD_PATH",
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                            ".wlax_workload", "sessions.parquet"))
+GAME_DATES_PATH = os.environ.get("WLAX_GAME_DATES", "")   # CSV: game (label as in games), date
+BLOCK_BYTES = 4 << 20
+HSR_SPEED = 4.7       # m/s, high-speed running threshold
+SPRINT_SPEED = 6.0    # m/s
+ACCEL_THRESHOLD = 2.5 # m/s² between consecutive 1 Hz samples
+ACUTE_DAYS, CHRONIC_DAYS = 7, 28
+
+SESSION_COLUMNS = ["player", "session", "date", "source", "size", "mtime", "samples", "duration_min",
+                   "distance_m", "hsr_m", "sprints", "accels", "decels", "peak_speed", "player_load"]
+
+
+# ═══════════════════════════════════════════════
+# STREAMING REDUCTION
+# ═══════════════════════════════════════════════
+
+def _read_blocks(path, block_bytes=BLOCK_BYTES):
+    types = {c: pa.float64() if c == "time" else pa.float32() for c in ("time", "speed", "ax", "ay", "az")}
+    return pacsv.open_csv(path, read_options=pacsv.ReadOptions(block_size=block_bytes),
+                          convert_options=pacsv.ConvertOptions(column_types=types,
+                                                               include_columns=list(types)))
+
+
+@perf.timed("workload_session")
+def session_metrics(path, block_bytes=BLOCK_BYTES):
+    """Stream one export file into its session metrics (see module docstring)."""
+    bins_sum, bins_n = [], []
+    carry_sec, carry_sum, carry_n = None, 0.0, 0
+    last_acc = None
+    first_t = last_t = None
+    samples, player_load = 0, 0.0
+    for batch in _read_blocks(path, block_bytes):
+        if batch.num_rows == 0:
+            continue
+        t = batch.column("time").to_numpy(zero_copy_only=False)
+        speed = batch.column("speed").to_numpy(zero_copy_only=False).astype(np.float64)
+        acc = np.column_stack([batch.column(c).to_numpy(zero_copy_only=False) for c in ("ax", "ay", "az")])
+        if first_t is None:
+            first_t = t[0]
+        last_t = t[-1]
+        samples += len(t)
+
+        prev = acc[:1] if last_acc is None else last_acc
+        d = np.diff(np.concatenate([prev, acc]), axis=0)
+        player_load += float(np.sqrt((d.astype(np.float64) ** 2).sum(axis=1)).sum()) / 100
+        last_acc = acc[-1:]
+
+        sec = np.floor(t - first_t).astype(np.int64)
+        lo = sec[0]
+        s_sum = np.bincount(sec - lo, weights=speed)
+        s_n = np.bincount(sec - lo)
+        if carry_sec is not None:
+            if carry_sec == lo:
+                s_sum[0] += carry_sum
+                s_n[0] += carry_n
+            else:
+                bins_sum.append(np.array([carry_sum]))
+                bins_n.append(np.array([carry_n]))
+                if lo > carry_sec + 1:   # seconds with no samples at all
+                    bins_sum.append(np.zeros(lo - carry_sec - 1))
+                    bins_n.append(np.zeros(lo - carry_sec - 1, dtype=np.int64))
+        bins_sum.append(s_sum[:-1])
+        bins_n.append(s_n[:-1])
+        carry_sec, carry_sum, carry_n = sec[-1], float(s_sum[-1]), int(s_n[-1])
+    if first_t is None:
+        return None
+    bins_sum.append(np.array([carry_sum]))
+    bins_n.append(np.array([carry_n]))
+    total, n = np.concatenate(bins_sum), np.concatenate(bins_n)
+    v = np.divide(total, n, out=np.zeros_like(total), where=n > 0)     # 1 Hz speed trace
+    observed = n > 0
+    dist = np.where(observed, v, 0.0)      # metres per 1 s bin; seconds lost to dropouts add nothing
+    fast = v >= SPRINT_SPEED
+    dv = np.diff(v)[observed[1:] & observed[:-1]]
+    return {"samples": samples, "duration_min": float(last_t - first_t) / 60, "distance_m": float(dist.sum()),
+            "hsr_m": float(dist[v >= HSR_SPEED].sum()),
+            "sprints": int(fast[0] + np.count_nonzero(fast[1:] & ~fast[:-1])),
+            "accels": int(np.count_nonzero(dv >= ACCEL_THRESHOLD)),
+            "decels": int(np.count_nonzero(dv <= -ACCEL_THRESHOLD)),
+            "peak_speed": float(v.max()), "player_load": player_load}
+
+
+def exports(root):
+    """[(player, session, date, path)] for every export under `root` (see layout above)."""
+    out = []
+    for session in sorted(os.listdir(root)):
+        sdir = os.path.join(root, session)
+        if not os.path.isdir(sdir):
+            continue
+        try:
+            day = dt.date.fromisoformat(session[:10])
+        except ValueError:
+            continue
+        for f in sorted(os.listdir(sdir)):
+            if f.endswith(".csv"):
+                out.append((f[:-4], session, day, os.path.join(sdir, f)))
+    return out
+
+
+# ═══════════════════════════════════════════════
+# SESSIONS TABLE
+# ═══════════════════════════════════════════════
+
+def load_sessions(path=SESSIONS_PATH):
+    """The sessions table as a DataFrame (empty with the right columns when nothing is ingested yet)."""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=SESSION_COLUMNS)
+    return pq.read_table(path).to_pandas()
+
+
+@perf.timed("workload_ingest")
+def ingest(root, path=SESSIONS_PATH):
+    """Reduce every export not already in the table (same path, size and mtime) and rewrite it atomically."""
+    table = load_sessions(path)
+    seen = set(zip(table["source"], table["size"], table["mtime"]))
+    rows = []
+    for player, session, day, src in exports(root):
+        st = os.stat(src)
+        if (src, st.st_size, st.st_mtime) in seen:
+            continue
+        m = session_metrics(src)
+        if m is not None:
+            rows.append({"player": player, "session": session, "date": day, "source": src,
+                         "size": st.st_size, "mtime": st.st_mtime, **m})
+    if not rows:
+        return table, 0
+    new = pd.DataFrame(rows, columns=SESSION_COLUMNS)
+    # A re-exported file replaces its old row.
+    table = pd.concat([table[~table["source"].isin(new["source"])], new], ignore_index=True)
+    table["date"] = pd.to_datetime(table["date"]).dt.date
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    pq.write_table(pa.Table.from_pandas(table[SESSION_COLUMNS], preserve_index=False), tmp)
+    os.replace(tmp, path)
+    return table, len(rows)
+
+
+# ═══════════════════════════════════════════════
+# JOIN TO GAME LOGS
+# ═══════════════════════════════════════════════
+
+def load_game_dates(games, path=GAME_DATES_PATH):
+    """Date per entry of `games` (None where unknown) from the game-dates CSV."""
+    if not path or not os.path.exists(path):
+        return [None] * len(games)
+    dates = pd.read_csv(path, dtype={"game": str})
+    lookup = dict(zip(dates["game"].str.strip(), pd.to_datetime(dates["date"]).dt.date))
+    return [lookup.get(g.strip()) for g in games]
+
+
+@perf.timed()
+def game_load(sessions, names, game_dates, metric="player_load"):
+    """(players × games) acute load, chronic weekly load and ACWR before each game; NaN without data."""
+    P, G = len(names), len(game_dates)
+    acute, chronic = np.full((P, G), np.nan), np.full((P, G), np.nan)
+    if len(sessions) and any(game_dates):
+        index = {n: i for i, n in enumerate(names)}
+        rows = sessions["player"].map(index)
+        s = sessions[rows.notna()]
+        row = rows[rows.notna()].to_numpy(np.int64)
+        day = pd.to_datetime(s["date"]).to_numpy("datetime64[D]")
+        load = s[metric].to_numpy(np.float64)
+        for k, gd in enumerate(game_dates):
+            if gd is None:
+                continue
+            before = (np.datetime64(gd, "D") - day).astype(np.int64)   # days before the game
+            for out, days, scale in ((acute, ACUTE_DAYS, 1), (chronic, CHRONIC_DAYS, ACUTE_DAYS / CHRONIC_DAYS)):
+                w = (before >= 1) & (before <= days)
+                total = np.bincount(row[w], weights=load[w], minlength=P) * scale
+                has = np.bincount(row, weights=(before >= 1).astype(np.float64), minlength=P) > 0
+                out[:, k] = np.where(has, total, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where(chronic > 0, acute / chronic, np.nan)
+    return {"acute": acute, "chronic": chronic, "acwr": acwr}
+
+
+def write_synthetic_exports(root, players, days, hz=10, minutes=90, seed=0):
+    """Random practice exports in the expected layout, for benchmarks and demos only."""
+    rng = np.random.default_rng(seed)
+    start = dt.date(2026, 1, 20)
+    n = int(minutes * 60 * hz)
+    for d in range(days):
+        sdir = os.path.join(root, (start + dt.timedelta(days=d)).isoformat() + "_practice")
+        os.makedirs(sdir, exist_ok=True)
+        for name in players:
+            t = np.arange(n) / hz
+            speed = np.clip(np.abs(np.cumsum(rng.normal(0, 0.08, n))) % 7.5 + rng.normal(0, 0.2, n), 0, None)
+            acc = rng.normal(0, 0.4, (n, 3)) + [0, 0, 1]
+            pd.DataFrame({"time": t.round(2), "speed": speed.round(2), "ax": acc[:, 0].round(3),
+                          "ay": acc[:, 1].round(3), "az": acc[:, 2].round(3)}).to_csv(
+                os.path.join(sdir, f"{name}.csv"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest wearable exports or show load before each game.")
+    parser.add_argument("command", choices=["ingest", "show"])
+    parser.add_argument("root", nargs="?", help="exports directory (ingest)")
+    parser.add_argument("--sessions", default=SESSIONS_PATH)
+    args = parser.parse_args()
+    if args.command == "ingest":
+        if not args.root or not os.path.isdir(args.root):
+            parser.error("ingest needs an exports directory")
+        table, added = ingest(args.root, args.sessions)
+        print(f"{args.sessions}: +{added} sessions, {len(table)} total")
+    else:
+        import wlax_engine as engine
+        players, games = engine.load_clean_data()[:2]
+        names = sorted(players)
+        loads = game_load(load_sessions(args.sessions), names, load_game_dates(games))
+        df = pd.DataFrame(loads["acute"], index=names, columns=games)
+        print(df.round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Expected-goals model over the shot-event table.
+
+    python wlax_xg.py train shots.csv     # fit offline, write the model file
+    python wlax_xg.py score shots.csv     # per-shooter xG roll-up
+
+A logistic regression on distance, angle and game situation, trained offline
+and persisted with joblib next to the snapshots. Scoring is one
+predict_proba over the whole feature matrix, and the per-player roll-up is a
+bincount, so nothing in the render path touches individual shots.
+
+The roll-up's ``finishing`` is a shot-quality-neutral SH%: league SH% plus
+goals above expected per shot, shrunk toward zero by PRIOR_SHOTS phantom shots
+at exactly expected so a 2-for-2 day doesn't read as elite finishing. It
+replaces the published sh_pct in the efficiency sub-score for players with
+shot data (see engine.compute_scores_table); xG, GAx and xG/shot are shown on
+cards but don't feed the scores.
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import wlax_perf as perf
+import wlax_shots as shotmap
+
+MODEL_PATH = os.environ.get("WLAX_XG_MODEL",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".wlax_models", "xg.joblib"))
+FEATURE_VERSION = 1
+PRIOR_SHOTS = 10.0   # finishing's GAx/shot is shrunk as if every shooter had this many more shots at zero GAx
+FEATURES = ["dist", "log_dist", "abs_angle", "angle_sq"] + [f"sit_{s}" for s in shotmap.SITUATIONS[1:]]
+
+
+def shot_features(ev):
+    """(shots × FEATURES) design matrix, built column-wise."""
+    x, y = ev["x"].astype(np.float64), np.maximum(ev["y"].astype(np.float64), 0)
+    dist = np.hypot(x, y)
+    angle = np.arctan2(np.abs(x), y)
+    sit = ev["situation"][:, None] == np.arange(1, len(shotmap.SITUATIONS))[None, :]
+    return np.column_stack([dist, np.log1p(dist), angle, angle ** 2, sit.astype(np.float64)])
+
+
+# ═══════════════════════════════════════════════
+# TRAIN / PERSIST
+# ═══════════════════════════════════════════════
+
+@perf.timed("xg_train")
+def train(shots, C=1.0, holdout=0.2, seed=0):
+    """Fit on all shots; log loss / Brier are reported on a random holdout fit first."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import brier_score_loss, log_loss
+    X = shot_features(shots["events"])
+    y = shots["events"]["outcome"] == shotmap.OUTCOMES.index("goal")
+    test = np.random.default_rng(seed).random(len(y)) < holdout
+    check = LogisticRegression(C=C, max_iter=500).fit(X[~test], y[~test])
+    p = check.predict_proba(X[test])[:, 1]
+    clf = LogisticRegression(C=C, max_iter=500).fit(X, y)
+    return {"clf": clf, "feature_version": FEATURE_VERSION, "features": FEATURES, "n_train": int(len(y)),
+            "base_rate": float(y.mean()), "holdout_log_loss": float(log_loss(y[test], p, labels=[False, True])),
+            "holdout_brier": float(brier_score_loss(y[test], p)), "trained_on": shots["digest"]}
+
+
+def save_model(model, path=MODEL_PATH):
+    import joblib
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_model(path=MODEL_PATH):
+    """The persisted model, or None if it's missing or was trained on another feature set."""
+    if not os.path.exists(path):
+        return None
+    import joblib
+    model = joblib.load(path)
+    if model.get("feature_version") != FEATURE_VERSION:
+        return None
+    with open(path, "rb") as f:
+        model["digest"] = hashlib.sha256(f.read()).hexdigest()[:16]
+    return model
+
+
+# ═══════════════════════════════════════════════
+# BATCH SCORING
+# ═══════════════════════════════════════════════
+
+@perf.timed("xg_score")
+def score_shots(model, shots):
+    """xG for every shot in one batched predict."""
+    return model["clf"].predict_proba(shot_features(shots["events"]))[:, 1]
+
+
+def rollup(shots, xg):
+    """Per-shooter shots, goals, xG, goals above expected, xG/shot and finishing (adjusted SH%, shrunk)."""
+    ev = shots["events"]
+    n = len(shots["shooters"])
+    goal = (ev["outcome"] == shotmap.OUTCOMES.index("goal")).astype(np.float64)
+    n_shots = np.bincount(ev["shooter"], minlength=n).astype(np.float64)
+    goals = np.bincount(ev["shooter"], weights=goal, minlength=n)
+    xg_sum = np.bincount(ev["shooter"], weights=xg, minlength=n)
+    league_pct = goal.sum() / max(len(goal), 1) * 100
+    per_shot = np.maximum(n_shots, 1)
+    return pd.DataFrame({"shots": n_shots.astype(int), "goals": goals.astype(int), "xg": xg_sum,
+                         "gax": goals - xg_sum, "xg_per_shot": xg_sum / per_shot,
+                         "finishing": np.maximum(league_pct + (goals - xg_sum) / (n_shots + PRIOR_SHOTS) * 100, 0)},
+                        index=pd.Index(shots["shooters"], name="name"))
+
+
+def season_finishing(shots, model=None):
+    """(name → finishing, rollup) for the engine, or (None, None) without shots or a trained model."""
+    model = model if model is not None else load_model()
+    if shots is None or model is None:
+        return None, None
+    roll = rollup(shots, score_shots(model, shots))
+    return roll["finishing"].round(3).to_dict(), roll
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or apply the expected-goals model.")
+    parser.add_argument("command", choices=["train", "score"])
+    parser.add_argument("shots", help="shot-event CSV")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--C", type=float, default=1.0)
+    args = parser.parse_args()
+    shots = shotmap.load_shots(args.shots)
+    if shots is None:
+        parser.error(f"no shot file at {args.shots}")
+    if args.command == "train":
+        model = train(shots, C=args.C)
+        print(save_model(model, args.model))
+        print({k: v for k, v in model.items() if k != "clf"})
+    else:
+        model = load_model(args.model)
+        if model is None:
+            parser.error(f"no compatible model at {args.model}; run train first")
+        print(rollup(shots, score_shots(model, shots)).sort_values("gax", ascending=False).round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()